@@ -0,0 +1,73 @@
+"""Jobs/sec of bulk submission and job control versus per-job calls, with simulated
+round-trip latency so that spreading requests over connections is visible.
+
+Usage: python -m benchmarks.bench_bulk [--jobs N] [--latency SECONDS]
+"""
+
+import argparse
+import time
+
+from python_pbs import PBS, JobSpec
+from python_pbs.util import PBSSimulator, use_backend
+
+
+def timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {count / elapsed:12.0f} jobs/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2_000)
+    parser.add_argument("--latency", type=float, default=0.0005)
+    args = parser.parse_args()
+
+    sim = PBSSimulator()
+    with use_backend(sim):
+        sim.latency = args.latency
+        pbs = PBS()
+        specs = [JobSpec(executable="/bin/true", args=[str(i)]) for i in range(200)]
+        timed(
+            "submit_command (loop)",
+            200,
+            lambda: [pbs.submit_command("/bin/true", str(i)) for i in range(200)],
+        )
+        timed("submit_many (1 conn)", 200, lambda: pbs.submit_many(specs))
+        with PBS(pool_size=16) as pooled:
+            timed(
+                "submit_many (pool of 16)",
+                200,
+                lambda: pooled.submit_many(specs, workers=16),
+            )
+            timed(
+                "submit_many status (pool of 16)",
+                200,
+                lambda: pooled.submit_many(specs, status=True, workers=16),
+            )
+        pbs.jobs.bulk_delete([j.data.id for j in pbs.jobs.all])
+
+        sim.generate_jobs(args.jobs)
+        jobs = pbs.jobs.all
+        timed("JobObject.hold (loop)", args.jobs, lambda: [j.hold() for j in jobs])
+
+        ids = [j.data.id for j in jobs]
+        timed("bulk_release (1 conn)", args.jobs, lambda: pbs.jobs.bulk_release(ids))
+        for size in (4, 16):
+            with PBS(pool_size=size) as pooled:
+                timed(
+                    f"bulk_hold (pool of {size})",
+                    args.jobs,
+                    lambda: pooled.jobs.bulk_hold(ids, workers=size),
+                )
+                timed(
+                    f"bulk_release (pool of {size})",
+                    args.jobs,
+                    lambda: pooled.jobs.bulk_release(ids, workers=size),
+                )
+        timed("bulk_delete (1 conn)", args.jobs, lambda: pbs.jobs.bulk_delete(ids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Resident memory over many stat calls, to check that polling reaches a steady state.
+
+Stat and select calls go through the typed wrapper, against the simulator or, with
+``--native``, against the ``pbs_ifl`` extension and the default server. RSS is
+sampled after a warm-up and at every report; the run fails if it grows by more
+than ``--limit`` MiB.
+
+Usage: python -m benchmarks.bench_leak [--calls N] [--jobs N] [--native] [--limit MiB]
+"""
+
+import argparse
+import gc
+import os
+import resource
+import sys
+import time
+
+from python_pbs.util import (
+    Attribute,
+    AttributeList,
+    PBSSimulator,
+    connect,
+    disconnect,
+    select_jobs,
+    stat_job,
+    stat_node,
+    stat_server,
+    use_backend,
+)
+from python_pbs.util.backend import get_backend
+
+PROJECTION = AttributeList(
+    [
+        Attribute(name="job_state"),
+        Attribute(name="Resource_List", resource="ncpus"),
+    ]
+)
+CRITERIA = [Attribute(name="job_state", value="Q")]
+
+
+def rss() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current RSS, which still shows unbounded growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run(connection: int, calls: int, report: int, limit: float) -> bool:
+    requests = [
+        lambda: stat_job(connection),
+        lambda: stat_job(connection, attributes=PROJECTION),
+        lambda: stat_node(connection),
+        lambda: stat_server(connection),
+        lambda: select_jobs(connection, CRITERIA),
+    ]
+    warmup = min(calls // 10, 10_000)
+    for i in range(warmup):
+        requests[i % len(requests)]()
+    gc.collect()
+    baseline = rss()
+    print(f"{'calls':>10} {'RSS MiB':>10} {'growth MiB':>11} {'calls/s':>10}")
+
+    growth = 0.0
+    start = time.perf_counter()
+    for i in range(1, calls + 1):
+        requests[i % len(requests)]()
+        if i % report == 0 or i == calls:
+            current = rss()
+            growth = (current - baseline) / (1 << 20)
+            rate = i / (time.perf_counter() - start)
+            print(f"{i:>10} {current / (1 << 20):>10.1f} {growth:>11.2f} {rate:>10.0f}")
+    return growth <= limit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--report", type=int, default=100_000)
+    parser.add_argument("--limit", type=float, default=8.0)
+    parser.add_argument("--native", action="store_true")
+    args = parser.parse_args()
+
+    if args.native:
+        get_backend()
+        connection = connect()
+        try:
+            ok = run(connection, args.calls, args.report, args.limit)
+        finally:
+            disconnect(connection)
+    else:
+        sim = PBSSimulator()
+        for i in range(4):
+            sim.add_node(f"node{i:04d}", ncpus=8)
+        sim.generate_jobs(args.jobs, owners=["alice", "bob"])
+        sim.advance()
+        with use_backend(sim):
+            connection = connect()
+            ok = run(connection, args.calls, args.report, args.limit)
+
+    if not ok:
+        print(f"RSS grew by more than {args.limit} MiB after warm-up")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
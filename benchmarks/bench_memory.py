@@ -0,0 +1,88 @@
+"""Bytes per job held by a stat snapshot, with and without shared strings.
+
+Records are copied string by string before parsing so every key and value is a
+separate object, as the native extension returns them.
+
+Usage: python -m benchmarks.bench_memory [--jobs N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from python_pbs.pbs.models import Job, LazyJob, LiteJob, ResourceCodec
+from python_pbs.pbs.models.parsing import ParsePlan
+from python_pbs.util import PBSSimulator, connect, stat_job, use_backend
+
+
+def fresh(data: dict) -> dict:
+    return {
+        k.encode().decode(): v.encode().decode() if type(v) is str else v
+        for k, v in data.items()
+    }
+
+
+def measure(label: str, count: int, build) -> float:
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    per_job = current / count
+    print(f"{label:<32} {per_job:10.0f} bytes/job")
+    return per_job
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50_000)
+    args = parser.parse_args()
+
+    sim = PBSSimulator()
+    for i in range(64):
+        sim.add_node(f"node{i:04d}", ncpus=32)
+    sim.generate_jobs(args.jobs, owners=[f"user{i}" for i in range(50)])
+    sim.advance()
+    with use_backend(sim):
+        snapshot = stat_job(connect())
+
+    plan = LazyJob.plan
+    baseline = ParsePlan(
+        Job,
+        groups=plan.groups.values(),
+        fill=plan.fill,
+        codec=ResourceCodec(cache_size=0),
+    )
+    count = len(snapshot)
+
+    def parsed(with_plan: ParsePlan):
+        def build():
+            records = [fresh(d) for d in snapshot]
+            return [with_plan.parse(r) for r in records]
+
+        return build
+
+    before = measure("Job models (no sharing)", count, parsed(baseline))
+    after = measure("Job models (shared)", count, parsed(plan))
+    print(f"{'':<32} {before / after:10.1f}x")
+    lite = measure(
+        "LiteJob records",
+        count,
+        lambda: [LiteJob.from_pbs(fresh(d)) for d in snapshot],
+    )
+    print(f"{'':<32} {before / lite:10.1f}x")
+    before = measure(
+        "raw dicts (no sharing)", count, lambda: [fresh(d) for d in snapshot]
+    )
+    after = measure(
+        "raw dicts (compacted)",
+        count,
+        lambda: [plan.compact(fresh(d)) for d in snapshot],
+    )
+    print(f"{'':<32} {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
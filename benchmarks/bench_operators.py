@@ -0,0 +1,83 @@
+"""Throughput of the PBS operators against the in-memory simulator.
+
+Usage: python -m benchmarks.bench_operators [--jobs N] [--nodes N]
+"""
+
+import argparse
+import time
+
+from python_pbs import PBS, JobAttribute, StatCache
+from python_pbs.util import PBSSimulator, use_backend
+
+
+def timed(label: str, count: int, fn) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {elapsed:8.3f}s  {count / elapsed:12.0f} records/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50_000)
+    parser.add_argument("--nodes", type=int, default=64)
+    args = parser.parse_args()
+
+    sim = PBSSimulator()
+    for i in range(args.nodes):
+        sim.add_node(f"node{i:04d}", ncpus=32)
+    start = time.perf_counter()
+    sim.generate_jobs(args.jobs, owners=[f"user{i}" for i in range(50)])
+    sim.advance()
+    print(f"Loaded {args.jobs} jobs in {time.perf_counter() - start:.3f}s")
+
+    with use_backend(sim):
+        pbs = PBS()
+        timed("jobs.all", args.jobs, lambda: pbs.jobs.all)
+        timed(
+            "jobs.stat(fields=[3 fields])",
+            args.jobs,
+            lambda: pbs.jobs.stat(fields=["job_state", "job_owner", "queue"]),
+        )
+        timed(
+            "jobs.select(euser)",
+            args.jobs // 50,
+            lambda: pbs.jobs.select(
+                criteria=[JobAttribute(name="euser", value="user7")]
+            ),
+        )
+        timed(
+            "jobs.iter_select(first job)",
+            1,
+            lambda: next(pbs.jobs.iter_select(chunk_size=500)),
+        )
+        timed(
+            "jobs.iter_select(chunk=500)",
+            args.jobs,
+            lambda: sum(1 for _ in pbs.jobs.iter_select(chunk_size=500)),
+        )
+        timed(
+            "jobs.to_table(4 fields)",
+            args.jobs,
+            lambda: pbs.jobs.to_table(
+                ["job_state", "job_owner", "queue", "resource_list.ncpus"]
+            ),
+        )
+        table = pbs.jobs.to_table(["job_owner", "resource_list.ncpus"])
+        timed(
+            "table.group_by(owner).sum",
+            args.jobs,
+            lambda: table.group_by("job_owner").sum("resource_list.ncpus"),
+        )
+        timed("nodes.all", args.nodes, lambda: pbs.nodes.all)
+        timed("queues.all", 1, lambda: pbs.queues.all)
+        timed("status", 1, lambda: pbs.status)
+
+        cached = PBS(cache=StatCache(ttl=60))
+        cached.jobs.all, cached.status
+        timed("jobs.all (cached)", args.jobs, lambda: cached.jobs.all)
+        timed("status (cached)", 1, lambda: cached.status)
+
+
+if __name__ == "__main__":
+    main()
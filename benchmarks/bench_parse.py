@@ -0,0 +1,85 @@
+"""Records/sec of ``from_pbs`` parsing versus the previous per-prefix implementation,
+and of lazy job records that only read a few fields.
+
+Usage: python -m benchmarks.bench_parse [--jobs N]
+"""
+
+import argparse
+import time
+
+from python_pbs.pbs.models import Job, LazyJob, LiteJob, LiteNode, Node
+from python_pbs.util import PBSSimulator, connect, stat_job, stat_node, use_backend
+
+
+def legacy_from_pbs(model, groups: list[str], data: dict):
+    """The pre-compiled-plan implementation, kept here as the baseline"""
+    data = dict(data)
+    for key in groups:
+        keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
+        data[key] = {}
+        for k in keys:
+            try:
+                data[key][k] = int(data[key + "." + k])
+            except:
+                data[key][k] = data[key + "." + k]
+    return model(**{k.lower(): v for k, v in data.items()})
+
+
+JOB_GROUPS = [
+    "resource_list",
+    "resources_released",
+    "resource_release_list",
+    "resources_used",
+]
+NODE_GROUPS = ["resources_assigned", "resources_available"]
+
+
+def read_lazy(data: dict) -> None:
+    job = LazyJob(data)
+    job.id, job.job_state, job.job_owner
+
+
+def measure(label: str, records: list[dict], fn) -> float:
+    start = time.perf_counter()
+    for record in records:
+        fn(record)
+    rate = len(records) / (time.perf_counter() - start)
+    print(f"{label:<24} {rate:12.0f} records/s")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50_000)
+    args = parser.parse_args()
+
+    sim = PBSSimulator()
+    for i in range(256):
+        sim.add_node(f"node{i:04d}", ncpus=32)
+    sim.generate_jobs(args.jobs, owners=[f"user{i}" for i in range(50)])
+    sim.advance()
+    with use_backend(sim):
+        con = connect()
+        jobs = stat_job(con, historical=True)
+        nodes = stat_node(con) * 50
+
+    legacy = measure(
+        "Job (legacy)", jobs, lambda d: legacy_from_pbs(Job, JOB_GROUPS, d)
+    )
+    compiled = measure("Job.from_pbs", jobs, Job.from_pbs)
+    print(f"{'':<24} {compiled / legacy:11.1f}x")
+    lazy = measure("LazyJob (3 fields)", jobs, read_lazy)
+    print(f"{'':<24} {lazy / legacy:11.1f}x")
+    lite = measure("LiteJob.from_pbs", jobs, LiteJob.from_pbs)
+    print(f"{'':<24} {lite / legacy:11.1f}x")
+    legacy = measure(
+        "Node (legacy)", nodes, lambda d: legacy_from_pbs(Node, NODE_GROUPS, d)
+    )
+    compiled = measure("Node.from_pbs", nodes, Node.from_pbs)
+    print(f"{'':<24} {compiled / legacy:11.1f}x")
+    lite = measure("LiteNode.from_pbs", nodes, LiteNode.from_pbs)
+    print(f"{'':<24} {lite / legacy:11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 from pytest import fixture
 from python_pbs.util.typed_wrapper import *
+from python_pbs.util import PBSSimulator, use_backend
+from python_pbs import PBS
 from dotenv import load_dotenv
 import os
 
@@ -14,3 +16,21 @@ def con():
 @fixture
 def options():
     return os.environ
+
+
+@fixture
+def simulator():
+    sim = PBSSimulator()
+    sim.add_node("node1", ncpus=8)
+    with use_backend(sim):
+        yield sim
+
+
+@fixture
+def sim_con(simulator: PBSSimulator):
+    return connect(simulator.server_name)
+
+
+@fixture
+def pbs(simulator: PBSSimulator):
+    return PBS()
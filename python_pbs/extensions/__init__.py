@@ -1 +1,8 @@
-from .pbs.pbs_ifl import *
\ No newline at end of file
+try:
+    from .pbs.pbs_ifl import *
+
+    NATIVE_IFL = True
+except ImportError:
+    from .ifl_fallback import *
+
+    NATIVE_IFL = False
@@ -0,0 +1,79 @@
+"""Pure-Python stand-ins for the constants and structures exported by the SWIG
+``pbs_ifl`` module.
+
+These are used when the native extension has not been built (for example when
+running against :class:`python_pbs.util.simulator.PBSSimulator`). Values mirror
+``pbs_ifl.h`` from OpenPBS.
+"""
+
+MGR_CMD_NONE = -1
+MGR_CMD_CREATE = 0
+MGR_CMD_DELETE = 1
+MGR_CMD_SET = 2
+MGR_CMD_UNSET = 3
+MGR_CMD_LIST = 4
+MGR_CMD_PRINT = 5
+MGR_CMD_ACTIVE = 6
+MGR_CMD_IMPORT = 7
+MGR_CMD_EXPORT = 8
+MGR_CMD_LAST = 9
+
+MGR_OBJ_NONE = -1
+MGR_OBJ_SERVER = 0
+MGR_OBJ_QUEUE = 1
+MGR_OBJ_JOB = 2
+MGR_OBJ_NODE = 3
+MGR_OBJ_RESV = 4
+MGR_OBJ_RSC = 5
+MGR_OBJ_SCHED = 6
+MGR_OBJ_HOST = 7
+MGR_OBJ_HOOK = 8
+MGR_OBJ_PBS_HOOK = 9
+MGR_OBJ_JOBARRAY_PARENT = 10
+MGR_OBJ_SUBJOB = 11
+MGR_OBJ_LAST = 12
+
+SET = 0
+UNSET = 1
+INCR = 2
+DECR = 3
+EQ = 4
+NE = 5
+GE = 6
+GT = 7
+LE = 8
+LT = 9
+DFLT = 10
+INTERNAL = 11
+
+MSG_OUT = 1
+MSG_ERR = 2
+
+SHUT_IMMEDIATE = 0
+SHUT_DELAY = 1
+SHUT_QUICK = 2
+
+
+class attrl:
+    __slots__ = ("name", "resource", "value", "op", "next")
+
+    def __init__(self) -> None:
+        self.name = None
+        self.resource = None
+        self.value = None
+        self.op = SET
+        self.next = None
+
+
+class attropl(attrl):
+    __slots__ = ()
+
+
+class batch_status:
+    __slots__ = ("name", "attribs", "text", "next")
+
+    def __init__(self) -> None:
+        self.name = None
+        self.attribs = None
+        self.text = None
+        self.next = None
@@ -1,85 +1,253 @@
 %module pbs_ifl
+/*
+ * Job ID lists (pbs_selectjob) are a single allocation owned by the caller.
+ * A NULL result, returned on error or when nothing matched, becomes None.
+ */
 %typemap(out) char ** {
-  int len,i;
-  len = 0;
-  while ($1[len]) len++;
-  $result = PyList_New(len);
-  for (i = 0; i < len; i++) {
-    PyList_SetItem($result,i,PyString_FromString($1[i]));
+  Py_ssize_t len, i;
+  PyObject *id;
+  if ($1 == NULL) {
+    $result = Py_None;
+    Py_INCREF($result);
+  } else {
+    for (len = 0; $1[len]; len++);
+    $result = PyList_New(len);
+    for (i = 0; $result != NULL && i < len; i++) {
+      id = PyUnicode_FromString($1[i]);
+      if (id == NULL)
+        Py_CLEAR($result);
+      else
+        PyList_SET_ITEM($result, i, id);
+    }
+    free($1);
+    if ($result == NULL)
+      SWIG_fail;
   }
 }
 %typemap(in) char ** {
-  if (PyList_Check($input)) {
-    int size = PyList_Size($input);
-    int i = 0;
-    $1 = (char **) malloc((size+1)*sizeof(char *));
-    for (i = 0; i < size; i++) {
-      PyObject *o = PyList_GetItem($input,i);
-      if (PyString_Check(o))
-        $1[i] = PyString_AsString(PyList_GetItem($input,i));
-      else {
-        PyErr_SetString(PyExc_TypeError,"list must contain strings");
-        free($1);
-        return NULL;
-      }
+  Py_ssize_t size, i;
+  PyObject *o;
+  if (!PyList_Check($input)) {
+    PyErr_SetString(PyExc_TypeError, "not a list");
+    SWIG_fail;
+  }
+  size = PyList_GET_SIZE($input);
+  $1 = (char **) malloc((size + 1) * sizeof(char *));
+  if ($1 == NULL) {
+    PyErr_NoMemory();
+    SWIG_fail;
+  }
+  for (i = 0; i < size; i++) {
+    o = PyList_GET_ITEM($input, i);
+    $1[i] = PyUnicode_Check(o) ? (char *) PyUnicode_AsUTF8(o) : NULL;
+    if ($1[i] == NULL) {
+      if (!PyErr_Occurred())
+        PyErr_SetString(PyExc_TypeError, "list must contain strings");
+      SWIG_fail;
     }
-    $1[i] = 0;
-  } else {
-    PyErr_SetString(PyExc_TypeError,"not a list");
-    return NULL;
   }
+  $1[i] = 0;
 }
+%typemap(freearg) char ** {
+  free($1);
+}
+/*
+ * Stat results are converted to a list of dictionaries and released with
+ * pbs_statfree, so no native memory outlives the call.
+ */
 %typemap(out) struct batch_status * {
-    struct batch_status *head_bs, *bs;
+  $result = pbs_py_status_list($1);
+  pbs_statfree($1);
+  if ($result == NULL)
+    SWIG_fail;
+}
+/* Structure members return the plain pointer, which the structure still owns */
+%typemap(out) struct batch_status *next = SWIGTYPE *;
+%{
+#include "pbs_ifl.h"
+
+/*
+ * Attribute chains built from a Python list of (name, resource, value[, op])
+ * tuples. Every string is copied, so the chain does not depend on the Python
+ * objects, and the whole chain is released by the freearg typemap once the
+ * call returns.
+ */
+static char *pbs_py_strdup(PyObject *o, int *ok) {
+    const char *s;
+    char *copy;
+    if (o == Py_None)
+        return NULL;
+    s = PyUnicode_AsUTF8(o);
+    if (s == NULL) {
+        *ok = 0;
+        return NULL;
+    }
+    copy = strdup(s);
+    if (copy == NULL) {
+        PyErr_NoMemory();
+        *ok = 0;
+    }
+    return copy;
+}
+
+#define PBS_PY_ATTRIBUTE_CHAIN(kind) \
+static void pbs_py_free_##kind(struct kind *head) { \
+    struct kind *next; \
+    while (head) { \
+        next = head->next; \
+        free(head->name); \
+        free(head->resource); \
+        free(head->value); \
+        free(head); \
+        head = next; \
+    } \
+} \
+static int pbs_py_##kind##_from_list(PyObject *input, struct kind **out) { \
+    Py_ssize_t i, n, size = PyList_GET_SIZE(input); \
+    struct kind *head = NULL, **tail = &head, *node; \
+    PyObject *item, *op; \
+    int ok; \
+    for (i = 0; i < size; i++) { \
+        item = PyList_GET_ITEM(input, i); \
+        n = PyTuple_Check(item) ? PyTuple_GET_SIZE(item) : 0; \
+        if (n < 3 || n > 4) { \
+            PyErr_SetString(PyExc_TypeError, \
+                "attributes must be (name, resource, value[, op]) tuples"); \
+            goto fail; \
+        } \
+        node = calloc(1, sizeof(struct kind)); \
+        if (node == NULL) { \
+            PyErr_NoMemory(); \
+            goto fail; \
+        } \
+        *tail = node; \
+        tail = &node->next; \
+        ok = 1; \
+        node->name = pbs_py_strdup(PyTuple_GET_ITEM(item, 0), &ok); \
+        node->resource = pbs_py_strdup(PyTuple_GET_ITEM(item, 1), &ok); \
+        node->value = pbs_py_strdup(PyTuple_GET_ITEM(item, 2), &ok); \
+        node->op = SET; \
+        op = n == 4 ? PyTuple_GET_ITEM(item, 3) : Py_None; \
+        if (ok && op != Py_None) { \
+            node->op = (enum batch_op) PyLong_AsLong(op); \
+            ok = !PyErr_Occurred(); \
+        } \
+        if (ok && node->name == NULL) { \
+            PyErr_SetString(PyExc_TypeError, "attribute name must be a string"); \
+            ok = 0; \
+        } \
+        if (!ok) \
+            goto fail; \
+    } \
+    *out = head; \
+    return 0; \
+fail: \
+    pbs_py_free_##kind(head); \
+    return -1; \
+}
+
+PBS_PY_ATTRIBUTE_CHAIN(attrl)
+PBS_PY_ATTRIBUTE_CHAIN(attropl)
+
+/*
+ * One dictionary per object, keyed by "id", "name" and "name.resource".
+ * Repeated attributes are joined with commas, latest value first.
+ */
+static PyObject *pbs_py_status_list(struct batch_status *head) {
+    struct batch_status *bs;
     struct attrl *attribs;
-    char *resource;
-    char *str;
-    int i, j;
-    int len;
-    char buf[4096];
-    static char *id = "id";
-    head_bs = $1;
-    bs = $1;
-    for (len=0; bs != NULL; len++)
-        bs = bs->next;
-    $result = PyList_New(len);
-    bs = head_bs;
-    for (i=0; i < len; i++) {
-        PyObject *dict;
-        PyObject *a, *v, *tmpv;
+    PyObject *result, *dict, *key, *value, *previous;
+    Py_ssize_t len = 0, i = 0;
+    int failed;
+    for (bs = head; bs != NULL; bs = bs->next)
+        len++;
+    result = PyList_New(len);
+    if (result == NULL)
+        return NULL;
+    for (bs = head; bs != NULL; bs = bs->next, i++) {
         dict = PyDict_New();
-        PyList_SetItem($result, i, dict);
-        a = PyString_FromString(id);
-        v = PyString_FromString(bs->name);
-        PyDict_SetItem(dict, a, v);
-        attribs = bs->attribs;
-        while (attribs) {
-            resource = attribs->resource;
-            if (resource != NULL) {
-                str = malloc(strlen(attribs->name) + strlen(resource) + 2);
-                sprintf(str, "%s.%s", attribs->name, attribs->resource);
-                a = PyString_FromString(str);
-            }
-            else {
-                a = PyString_FromString(attribs->name);
-            }
-            tmpv = PyDict_GetItem(dict, a);
-            if (tmpv != NULL) {
-                char *s = PyString_AsString(tmpv);
-                str = malloc(strlen(attribs->value) + strlen(s) + 4);
-                sprintf(str, "%s,%s", attribs->value, s);
-                v = PyString_FromString(str);
-            }
-            else {
-                v = PyString_FromString(attribs->value);
-            }
-            PyDict_SetItem(dict, a, v);
-            attribs = attribs->next;
+        if (dict == NULL)
+            goto fail;
+        PyList_SET_ITEM(result, i, dict);
+        value = PyUnicode_FromString(bs->name ? bs->name : "");
+        if (value == NULL)
+            goto fail;
+        failed = PyDict_SetItemString(dict, "id", value) < 0;
+        Py_DECREF(value);
+        if (failed)
+            goto fail;
+        for (attribs = bs->attribs; attribs != NULL; attribs = attribs->next) {
+            if (attribs->resource != NULL)
+                key = PyUnicode_FromFormat("%s.%s", attribs->name, attribs->resource);
+            else
+                key = PyUnicode_FromString(attribs->name);
+            if (key == NULL)
+                goto fail;
+            previous = PyDict_GetItemWithError(dict, key);
+            if (previous != NULL)
+                value = PyUnicode_FromFormat("%s,%U",
+                    attribs->value ? attribs->value : "", previous);
+            else if (!PyErr_Occurred())
+                value = PyUnicode_FromString(attribs->value ? attribs->value : "");
+            else
+                value = NULL;
+            failed = value == NULL || PyDict_SetItem(dict, key, value) < 0;
+            Py_DECREF(key);
+            Py_XDECREF(value);
+            if (failed)
+                goto fail;
         }
-        bs = bs->next;
     }
+    return result;
+fail:
+    Py_DECREF(result);
+    return NULL;
 }
-%{
-#include "pbs_ifl.h"
 %}
+
+/*
+ * IFL calls accept None, a list of attribute tuples or an attrl/attropl proxy.
+ * Only chains built from a list are owned, and freed, by the wrapper.
+ */
+%define PBS_ATTRIBUTE_TYPEMAPS(kind)
+%typemap(in) struct kind * (int owned = 0) {
+    if ($input == Py_None) {
+        $1 = NULL;
+    } else if (PyList_Check($input)) {
+        if (pbs_py_##kind##_from_list($input, &$1) < 0)
+            SWIG_fail;
+        owned = 1;
+    } else {
+        int res = SWIG_ConvertPtr($input, (void **) &$1, $1_descriptor, 0);
+        if (!SWIG_IsOK(res))
+            SWIG_exception_fail(SWIG_ArgError(res),
+                "expected a list of attribute tuples or a " #kind);
+    }
+}
+%typemap(freearg) struct kind * {
+    if (owned$argnum)
+        pbs_py_free_##kind($1);
+}
+%enddef
+
+PBS_ATTRIBUTE_TYPEMAPS(attrl)
+PBS_ATTRIBUTE_TYPEMAPS(attropl)
+
+/* Structure members keep the plain pointer typemaps */
+%typemap(in) struct attrl *next = SWIGTYPE *;
+%typemap(in) struct attrl *attribs = SWIGTYPE *;
+%typemap(in) struct attropl *next = SWIGTYPE *;
+%typemap(freearg) struct attrl *next, struct attrl *attribs, struct attropl *next "";
+
+/* pbs_errno is a per-thread macro in libpbs, so it is read through a function */
+%inline %{
+int get_pbs_errno(void) {
+    return pbs_errno;
+}
+%}
+
+%pythoncode %{
+ATTRL_SEQUENCES = True
+%}
+
 %include "pbs_ifl.h"
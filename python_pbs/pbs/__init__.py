@@ -1,4 +1,10 @@
 from .server import PBS
+from .aio import AsyncPBS
+from .cache import StatCache
+from .quota import QuotaIndex, queue_available
+from .taskfarm import TaskFarm, TaskStatus, submit_task_farm
+from .logs import AsyncLogTailer, JobOutputFile, LogBatch, LogTailer
+from .table import CategoricalColumn, GroupBy, JobTable, NumericColumn
 from .exceptions import PBSException
 from .operators import *
 from .models import *
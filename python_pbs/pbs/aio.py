@@ -0,0 +1,345 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Literal, Optional, TypeVar, Union
+
+from ..util import alter_job, default_server, delete_job, hold_job, release_job
+from .cache import StatCache
+from .exceptions import PBSException
+from .models import *
+from .operators import JobAttribute, JobWaiter, WaitCondition, WaitResult
+from .server import PBS
+
+T = TypeVar("T")
+
+
+class AsyncJobOperator:
+    def __init__(self, client: "AsyncPBS") -> None:
+        """Awaitable counterpart of :class:`JobOperator`, returning job models
+
+        :param client: Owning client
+        :type client: AsyncPBS
+        """
+        self.client = client
+
+    async def stat(
+        self,
+        ids: list[str] = None,
+        historical: bool = False,
+        subjobs: bool = False,
+        fields: list[str] = None,
+    ) -> list[Job]:
+        return await self.client.run(
+            lambda pbs: [
+                j.data
+                for j in pbs.jobs.stat(
+                    ids=ids, historical=historical, subjobs=subjobs, fields=fields
+                )
+            ]
+        )
+
+    async def get(
+        self,
+        id: str,
+        historical: bool = False,
+        subjob: bool = False,
+        fields: list[str] = None,
+    ) -> Union[Job, None]:
+        def get(pbs: PBS) -> Union[Job, None]:
+            result = pbs.jobs.get(
+                id, historical=historical, subjob=subjob, fields=fields
+            )
+            return result.data if result else None
+
+        return await self.client.run(get)
+
+    async def select(
+        self,
+        criteria: list[JobAttribute] = None,
+        include_historical: bool = False,
+        include_subjobs: bool = False,
+        fields: list[str] = None,
+    ) -> list[Job]:
+        return await self.client.run(
+            lambda pbs: [
+                j.data
+                for j in pbs.jobs.select(
+                    criteria=criteria,
+                    include_historical=include_historical,
+                    include_subjobs=include_subjobs,
+                    fields=fields,
+                )
+            ]
+        )
+
+    async def wait_for(
+        self,
+        ids: list[str],
+        timeout: Optional[float] = None,
+        return_when: WaitCondition = WaitCondition.ALL,
+        fields: list[str] = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> WaitResult:
+        """Waits until the given jobs finish, see :meth:`JobOperator.wait_for`
+
+        :return: Finished jobs with their exit status, and the IDs still pending
+        :rtype: WaitResult
+        """
+        loop = asyncio.get_running_loop()
+        waiter = JobWaiter(ids, return_when, fields, interval, max_interval)
+        deadline = None if timeout is None else loop.time() + timeout
+        while not waiter.update(
+            *await self.client.run(lambda pbs: pbs.jobs._wait_stat(waiter))
+        ):
+            delay = waiter.interval
+            if deadline is not None:
+                delay = min(delay, deadline - loop.time())
+                if delay <= 0:
+                    break
+            await asyncio.sleep(delay)
+        return waiter.result
+
+    async def _checked(self, context: str, id: str, call: Callable[[PBS], int]) -> None:
+        result = await self.client.run(call)
+        if result != 0:
+            raise PBSException(result, context=context)
+        self.client._invalidate("job", id)
+
+    async def alter(self, id: str, attributes: list[JobAttribute]) -> None:
+        await self._checked(
+            f"Attempting to alter job {id}",
+            id,
+            lambda pbs: alter_job(pbs.connection, id, attributes),
+        )
+
+    async def delete(self, id: str) -> None:
+        await self._checked(
+            f"Failed to delete job {id}",
+            id,
+            lambda pbs: delete_job(pbs.connection, id),
+        )
+
+    async def hold(self, id: str, type: Literal["u", "o", "s"] = "u") -> None:
+        await self._checked(
+            f"Failed to hold job {id}",
+            id,
+            lambda pbs: hold_job(pbs.connection, id, hold_type=type),
+        )
+
+    async def release(self, id: str, type: Literal["u", "o", "s"] = "u") -> None:
+        await self._checked(
+            f"Failed to release job {id}",
+            id,
+            lambda pbs: release_job(pbs.connection, id, hold_type=type),
+        )
+
+
+class AsyncObjectOperator:
+    def __init__(
+        self,
+        client: "AsyncPBS",
+        operator: Literal["hooks", "nodes", "queues", "schedulers"],
+    ) -> None:
+        """Awaitable counterpart of the object managers, returning models
+
+        :param client: Owning client
+        :type client: AsyncPBS
+        :param operator: Name of the :class:`PBS` operator property to mirror
+        :type operator: Literal["hooks", "nodes", "queues", "schedulers"]
+        """
+        self.client = client
+        self.operator = operator
+
+    async def stat(
+        self,
+        ids: list[str] = None,
+        fields: list[str] = None,
+        record_type: RecordType = "model",
+    ) -> list:
+        return await self.client.run(
+            lambda pbs: [
+                o.data
+                for o in getattr(pbs, self.operator).stat(
+                    ids=ids, fields=fields, record_type=record_type
+                )
+            ]
+        )
+
+    async def get(self, id: str, fields: list[str] = None) -> Any:
+        def get(pbs: PBS) -> Any:
+            result = getattr(pbs, self.operator).get(id, fields=fields)
+            return result.data if result else None
+
+        return await self.client.run(get)
+
+
+class AsyncPBS:
+    def __init__(
+        self,
+        server: Union[str, None] = None,
+        max_workers: int = 4,
+        max_concurrency: Optional[int] = None,
+        cache: Optional[StatCache] = None,
+    ) -> None:
+        """asyncio client for the PBS API
+
+        Blocking IFL calls are dispatched to a dedicated thread pool. Each worker
+        thread opens its own connection on first use, so no handle is ever shared
+        between threads. At most ``max_concurrency`` calls are submitted at once;
+        further coroutines wait on a semaphore instead of queueing in the executor.
+        Results are returned as models rather than operator objects, since the
+        object methods are blocking.
+
+        :param server: Server name or None for default, defaults to None
+        :type server: Union[str, None], optional
+        :param max_workers: Worker threads, and so connections, defaults to 4
+        :type max_workers: int, optional
+        :param max_concurrency: Calls in flight at once, defaults to max_workers
+        :type max_concurrency: Optional[int], optional
+        :param cache: Stat cache shared by every worker, defaults to None
+        :type cache: Optional[StatCache], optional
+        """
+        self.server_name = server if server else default_server()
+        self.max_concurrency = max_concurrency if max_concurrency else max_workers
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="python-pbs"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._local = threading.local()
+        self._clients: list[PBS] = []
+        self._lock = threading.Lock()
+
+    def _client(self) -> PBS:
+        try:
+            return self._local.client
+        except AttributeError:
+            client = PBS(self.server_name, cache=self.cache)
+            self._local.client = client
+            with self._lock:
+                self._clients.append(client)
+            return client
+
+    def _invalidate(self, object_type: str, id: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(object_type, id)
+        with self._lock:
+            for client in self._clients:
+                client.resolver.forget(object_type, id)
+
+    def _call(self, function: Callable[[PBS], T]) -> T:
+        return function(self._client())
+
+    async def run(self, function: Callable[[PBS], T]) -> T:
+        """Runs a blocking function on a worker thread with that thread's :class:`PBS` client
+
+        :param function: Function taking the worker's client
+        :type function: Callable[[PBS], T]
+        :return: Function result
+        :rtype: T
+        """
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, functools.partial(self._call, function)
+            )
+
+    @property
+    def jobs(self) -> AsyncJobOperator:
+        return AsyncJobOperator(self)
+
+    @property
+    def nodes(self) -> AsyncObjectOperator:
+        return AsyncObjectOperator(self, "nodes")
+
+    @property
+    def queues(self) -> AsyncObjectOperator:
+        return AsyncObjectOperator(self, "queues")
+
+    @property
+    def hooks(self) -> AsyncObjectOperator:
+        return AsyncObjectOperator(self, "hooks")
+
+    @property
+    def schedulers(self) -> AsyncObjectOperator:
+        return AsyncObjectOperator(self, "schedulers")
+
+    async def status(self) -> Server:
+        """Gets the server status
+
+        :return: Server model
+        :rtype: Server
+        """
+        return await self.run(lambda pbs: pbs.status)
+
+    async def submit_script(
+        self,
+        script: str,
+        queue: str = None,
+        name: str = None,
+        attributes: JobSubmission = None,
+        output_directory: str = None,
+        alt_user: str = None,
+    ) -> Job:
+        """Submits a script job, see :meth:`PBS.submit_script`
+
+        :return: Submitted job
+        :rtype: Job
+        """
+        attributes = dict(attributes) if attributes else {}
+        return await self.run(
+            lambda pbs: pbs.submit_script(
+                script,
+                queue=queue,
+                name=name,
+                attributes=attributes,
+                output_directory=output_directory,
+                alt_user=alt_user,
+            ).data
+        )
+
+    async def submit_command(
+        self,
+        executable: str,
+        *args,
+        queue: str = None,
+        name: str = None,
+        attributes: JobSubmission = None,
+        output_directory: str = None,
+        alt_user: str = None,
+    ) -> Job:
+        """Submits a command job, see :meth:`PBS.submit_command`
+
+        :return: Submitted job
+        :rtype: Job
+        """
+        attributes = dict(attributes) if attributes else {}
+        return await self.run(
+            lambda pbs: pbs.submit_command(
+                executable,
+                *args,
+                queue=queue,
+                name=name,
+                attributes=attributes,
+                output_directory=output_directory,
+                alt_user=alt_user,
+            ).data
+        )
+
+    def _shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+
+    async def close(self) -> None:
+        """Waits for pending calls, then closes every worker connection"""
+        await asyncio.get_running_loop().run_in_executor(None, self._shutdown)
+
+    async def __aenter__(self) -> "AsyncPBS":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from pydantic import BaseModel
+
+from .models import LazyRecord, LiteRecord
+
+_MISSING = object()
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, BaseModel):
+        return value.model_copy(deep=True)
+    if isinstance(value, (LazyRecord, LiteRecord)):
+        return value.copy()
+    return value
+
+
+class StatCache:
+    dependents = {"job": ("queue", "server")}
+
+    def __init__(self, ttl: float = 1.0, max_size: int = 256) -> None:
+        """Time-limited LRU cache of parsed stat results, shared by the operators
+
+        Entries are keyed by object type, requested IDs and projected fields (plus
+        any other stat options), and expire ``ttl`` seconds after they were stored.
+        Writes made through the operators and objects invalidate the entries that
+        could contain the touched object, and job writes also invalidate queue and
+        server entries since their job counts change.
+
+        Records are copied on the way in and on every hit, so callers never share
+        an instance and changing a returned record does not change the cache.
+
+        :param ttl: Seconds an entry stays valid, defaults to 1.0
+        :type ttl: float, optional
+        :param max_size: Maximum number of entries before the least recently used is evicted, defaults to 256
+        :type max_size: int, optional
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        object_type: str,
+        ids: Optional[list[str]],
+        fields: Optional[list[str]],
+        *options: Hashable,
+    ) -> tuple:
+        """Builds the cache key of a stat request
+
+        :param object_type: Object type being queried
+        :type object_type: str
+        :param ids: Requested IDs, or None for every object
+        :type ids: Optional[list[str]]
+        :param fields: Projected fields, or None for every attribute
+        :type fields: Optional[list[str]]
+        :return: Cache key
+        :rtype: tuple
+        """
+        return (
+            object_type,
+            frozenset(ids) if ids else None,
+            tuple(sorted(fields)) if fields else None,
+            options,
+        )
+
+    def get(self, key: tuple) -> Any:
+        """Gets a live entry, counting the hit or miss
+
+        :param key: Cache key
+        :type key: tuple
+        :return: Copy of the cached value, or None if absent or expired
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+        return _copy(value)
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Stores a copy of an entry, evicting the least recently used ones past ``max_size``
+
+        :param key: Cache key
+        :type key: tuple
+        :param value: Value to store
+        :type value: Any
+        """
+        value = _copy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _covers(self, object_type: str, cached: Optional[frozenset], id: str) -> bool:
+        if cached is None or id in cached:
+            return True
+        if object_type == "job":
+            sequence = id.split(".", 1)[0]
+            return any(i.split(".", 1)[0] == sequence for i in cached)
+        return False
+
+    def invalidate(self, object_type: str, id: Optional[str] = None) -> None:
+        """Drops every entry that could contain the given object
+
+        :param object_type: Object type that was written
+        :type object_type: str
+        :param id: Object ID, or None to drop every entry of the type, defaults to None
+        :type id: Optional[str], optional
+        """
+        dependents = self.dependents.get(object_type, ())
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] in dependents or (
+                    key[0] == object_type
+                    and (id is None or self._covers(object_type, key[1], id))
+                ):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        """Drops every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
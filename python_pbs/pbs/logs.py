@@ -0,0 +1,690 @@
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import selectors
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import Executor
+from enum import Enum
+from typing import (
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Iterable,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+DEFAULT_SPOOL_PATH = "/var/spool/pbs/spool"
+
+# Event bits from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+
+_EVENT = struct.Struct("iIII")
+
+
+class JobOutputFile(Enum):
+    OUTPUT = "OU"
+    ERROR = "ER"
+
+
+class LogBatch(NamedTuple):
+    job_id: str
+    stream: JobOutputFile
+    lines: list[str]
+    # The last line had no newline when its file went away
+    partial: bool = False
+
+    def text(self) -> Generator[str, None, None]:
+        """Yields the lines with the newlines they had in the file
+
+        :yield: Lines, every one but an unterminated last line ending in a newline
+        :rtype: Generator[str, None, None]
+        """
+        for i, line in enumerate(self.lines):
+            if self.partial and i == len(self.lines) - 1:
+                yield line
+            else:
+                yield line + "\n"
+
+
+class _Inotify:
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._add(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm(self.fd, wd)
+
+    def read(self) -> list[tuple[int, int, str]]:
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Stream:
+    __slots__ = ("job_id", "stream", "path", "file", "inode", "partial", "follow")
+
+    def __init__(
+        self, job_id: str, stream: JobOutputFile, path: str, follow: bool
+    ) -> None:
+        self.job_id = job_id
+        self.stream = stream
+        self.path = path
+        self.file = None
+        self.inode = None
+        self.partial = b""
+        self.follow = follow
+
+
+class LogTailer:
+    def __init__(
+        self,
+        spool_path: str = DEFAULT_SPOOL_PATH,
+        chunk_size: int = 1 << 16,
+        batch_size: int = 1 << 20,
+        poll_interval: float = 0.5,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        """Follows the spool output files of many jobs from a single thread
+
+        On Linux, files are watched through inotify with one watch per spool
+        directory, so idle files cost nothing and a write, rotation or deletion is
+        noticed as soon as it happens. Elsewhere, or when inotify is unavailable,
+        the followed files are checked every ``poll_interval`` seconds with one
+        ``stat`` per file. In both cases new data is read in ``chunk_size`` blocks,
+        at most ``batch_size`` bytes per file per call so a fast writer cannot
+        flood the reader, and split into lines. A trailing partial line is held
+        back until it is completed or the file goes away.
+
+        A file that is truncated is read again from the start. A file that is
+        deleted or renamed is drained and, by default, stops being followed, which
+        is what happens to a job's spool files when it ends. Followed files that do
+        not exist yet are picked up when they are created.
+
+        The tailer is not thread-safe; use it from the thread that reads from it.
+
+        :param spool_path: Directory holding the ``<job id>.OU``/``.ER`` files, defaults to "/var/spool/pbs/spool"
+        :type spool_path: str, optional
+        :param chunk_size: Bytes read per call, defaults to 65536
+        :type chunk_size: int, optional
+        :param batch_size: Bytes read from one file per call before moving on, defaults to 1048576
+        :type batch_size: int, optional
+        :param poll_interval: Seconds between checks when polling, defaults to 0.5
+        :type poll_interval: float, optional
+        :param use_inotify: Force (True) or disable (False) inotify, or None to use it when available, defaults to None
+        :type use_inotify: Optional[bool], optional
+        :raises OSError: If inotify is forced but unavailable
+        """
+        self.spool_path = spool_path
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._streams: dict[str, _Stream] = {}
+        self._watches: dict[str, int] = {}
+        self._directories: dict[int, str] = {}
+        self._dirty: set[str] = set()
+        self._checked = 0.0
+        self._inotify: Optional[_Inotify] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        if use_inotify is not False:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError, TypeError):
+                if use_inotify:
+                    raise
+        if self._inotify is not None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._inotify.fd, selectors.EVENT_READ)
+
+    @property
+    def inotify(self) -> bool:
+        return self._inotify is not None
+
+    @property
+    def pending(self) -> bool:
+        """Whether some followed file has data or changes that have not been read yet"""
+        return bool(self._dirty)
+
+    def fileno(self) -> Optional[int]:
+        """Gets the inotify descriptor, readable whenever :meth:`poll` has work to do
+
+        :return: File descriptor, or None when polling
+        :rtype: Optional[int]
+        """
+        return self._inotify.fd if self._inotify else None
+
+    def path(self, job_id: str, stream: JobOutputFile) -> str:
+        """Gets the spool file of a job's stream
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param stream: Output stream
+        :type stream: JobOutputFile
+        :return: File path
+        :rtype: str
+        """
+        return os.path.join(self.spool_path, f"{job_id}.{stream.value}")
+
+    def follow(
+        self,
+        job_id: str,
+        streams: Iterable[JobOutputFile] = (JobOutputFile.OUTPUT, JobOutputFile.ERROR),
+        from_start: bool = True,
+        follow_rotation: bool = False,
+    ) -> None:
+        """Starts following a job's output files
+
+        :param job_id: Job ID, as used in the spool file names
+        :type job_id: str
+        :param streams: Streams to follow, defaults to both
+        :type streams: Iterable[JobOutputFile], optional
+        :param from_start: Read existing content instead of only new writes, defaults to True
+        :type from_start: bool, optional
+        :param follow_rotation: Keep following a name after its file is deleted or renamed, defaults to False
+        :type follow_rotation: bool, optional
+        """
+        for stream in streams:
+            path = self.path(job_id, stream)
+            if path in self._streams:
+                continue
+            state = _Stream(job_id, stream, path, follow_rotation)
+            self._streams[path] = state
+            self._watch(os.path.dirname(path))
+            if self._open(state) and not from_start:
+                state.file.seek(0, os.SEEK_END)
+            self._dirty.add(path)
+
+    def unfollow(self, job_id: str) -> None:
+        """Stops following a job's output files, discarding any partial line
+
+        :param job_id: Job ID
+        :type job_id: str
+        """
+        for stream in JobOutputFile:
+            state = self._streams.pop(self.path(job_id, stream), None)
+            if state:
+                self._close(state)
+                self._dirty.discard(state.path)
+        self._unwatch_unused()
+
+    @property
+    def following(self) -> list[tuple[str, JobOutputFile]]:
+        return [(s.job_id, s.stream) for s in self._streams.values()]
+
+    def _watch(self, directory: str) -> None:
+        if self._inotify is None or directory in self._watches:
+            return
+        wd = self._inotify.add_watch(directory or ".", WATCH_MASK)
+        self._watches[directory] = wd
+        self._directories[wd] = directory
+
+    def _unwatch_unused(self) -> None:
+        used = {os.path.dirname(path) for path in self._streams}
+        for directory in [d for d in self._watches if d not in used]:
+            wd = self._watches.pop(directory)
+            self._directories.pop(wd, None)
+            self._inotify.rm_watch(wd)
+
+    def _open(self, state: _Stream) -> bool:
+        try:
+            state.file = open(state.path, "rb", buffering=0)
+        except FileNotFoundError:
+            return False
+        state.inode = os.fstat(state.file.fileno()).st_ino
+        state.partial = b""
+        return True
+
+    def _same(self, state: _Stream) -> bool:
+        try:
+            return os.stat(state.path).st_ino == state.inode
+        except FileNotFoundError:
+            return False
+
+    def _close(self, state: _Stream) -> None:
+        if state.file is not None:
+            state.file.close()
+            state.file = None
+            state.inode = None
+
+    def _read(self, state: _Stream, final: bool = False) -> tuple[list[str], bool]:
+        if state.file is None:
+            return [], False
+        if state.file.tell() > os.fstat(state.file.fileno()).st_size:
+            state.file.seek(0)
+            state.partial = b""
+        chunks = [state.partial] if state.partial else []
+        size = 0
+        while final or size < self.batch_size:
+            chunk = state.file.read(self.chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            size += len(chunk)
+        else:
+            self._dirty.add(state.path)
+        data = b"".join(chunks)
+        lines = data.split(b"\n")
+        state.partial = lines.pop()
+        partial = final and bool(state.partial)
+        if partial:
+            lines.append(state.partial)
+            state.partial = b""
+        return [line.decode("utf-8", errors="replace") for line in lines], partial
+
+    def _gone(self, state: _Stream, batches: list[LogBatch]) -> None:
+        lines, partial = self._read(state, final=True)
+        if lines:
+            batches.append(LogBatch(state.job_id, state.stream, lines, partial))
+        self._close(state)
+        if not state.follow:
+            del self._streams[state.path]
+
+    def _events(self, batches: list[LogBatch]) -> None:
+        for wd, mask, name in self._inotify.read():
+            if mask & IN_Q_OVERFLOW:
+                self._dirty.update(self._streams)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_IGNORED):
+                for state in [
+                    s
+                    for s in self._streams.values()
+                    if os.path.dirname(s.path) == directory
+                ]:
+                    self._gone(state, batches)
+                self._watches.pop(directory, None)
+                self._directories.pop(wd, None)
+                continue
+            path = os.path.join(directory, name)
+            state = self._streams.get(path)
+            if state is None:
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._gone(state, batches)
+            elif mask & (IN_CREATE | IN_MOVED_TO):
+                if state.file is not None and not self._same(state):
+                    self._gone(state, batches)
+                    if path not in self._streams:
+                        continue
+                if state.file is None:
+                    self._open(state)
+                self._dirty.add(path)
+            else:
+                self._dirty.add(path)
+
+    def _check(self, batches: list[LogBatch]) -> None:
+        for state in list(self._streams.values()):
+            if state.file is not None and not self._same(state):
+                self._gone(state, batches)
+                if state.path not in self._streams:
+                    continue
+            if state.file is None and not self._open(state):
+                continue
+            self._dirty.add(state.path)
+
+    def poll(self, timeout: Optional[float] = None) -> list[LogBatch]:
+        """Waits for new output and returns it, grouped per stream
+
+        Returns as soon as at least one followed file has new lines, when a file
+        goes away, or when ``timeout`` expires, in which case the result may be empty.
+
+        :param timeout: Maximum seconds to wait, or None to wait until something happens, defaults to None
+        :type timeout: Optional[float], optional
+        :return: Line batches, in the order they were read
+        :rtype: list[LogBatch]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        batches: list[LogBatch] = []
+        while True:
+            if self._inotify is not None:
+                self._events(batches)
+            elif time.monotonic() - self._checked >= self.poll_interval:
+                self._checked = time.monotonic()
+                self._check(batches)
+            dirty, self._dirty = self._dirty, set()
+            for path in dirty:
+                state = self._streams.get(path)
+                lines = self._read(state)[0] if state else []
+                if lines:
+                    batches.append(LogBatch(state.job_id, state.stream, lines))
+            if batches or not self._streams:
+                return batches
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return batches
+            if self._selector is not None:
+                self._selector.select(remaining)
+            else:
+                wait = self._checked + self.poll_interval - time.monotonic()
+                time.sleep(max(0, wait if remaining is None else min(wait, remaining)))
+
+    def tail(self, timeout: Optional[float] = None) -> Generator[LogBatch, None, None]:
+        """Yields ``(job_id, stream, lines)`` batches until no file is followed any more
+
+        :param timeout: Stop after this many seconds without output, or None to never stop early, defaults to None
+        :type timeout: Optional[float], optional
+        :yield: Line batches
+        :rtype: Generator[LogBatch, None, None]
+        """
+        while self._streams:
+            batches = self.poll(timeout)
+            if not batches and timeout is not None:
+                return
+            yield from batches
+
+    def __iter__(self) -> Generator[LogBatch, None, None]:
+        return self.tail()
+
+    def close(self) -> None:
+        """Closes every followed file and the inotify descriptor"""
+        for state in self._streams.values():
+            self._close(state)
+        self._streams.clear()
+        self._dirty.clear()
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches.clear()
+        self._directories.clear()
+
+    def __enter__(self) -> "LogTailer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def follow_job(
+    job_id: str,
+    stream: JobOutputFile = JobOutputFile.OUTPUT,
+    spool_path: str = DEFAULT_SPOOL_PATH,
+    timeout: Optional[float] = None,
+    newlines: bool = False,
+) -> Generator[Union[str, None], None, None]:
+    """Yields the lines of one job's output file as they are written, ending when it is removed
+
+    :param job_id: Job ID
+    :type job_id: str
+    :param stream: Output stream, defaults to JobOutputFile.OUTPUT
+    :type stream: JobOutputFile, optional
+    :param spool_path: Spool directory, defaults to "/var/spool/pbs/spool"
+    :type spool_path: str, optional
+    :param timeout: Yield None after this many idle seconds, or None to block, defaults to None
+    :type timeout: Optional[float], optional
+    :param newlines: Keep the newline of every line that had one, see :meth:`LogBatch.text`, defaults to False
+    :type newlines: bool, optional
+    :raises FileNotFoundError: If the file does not exist
+    :yield: Lines, stripped of their newline unless ``newlines``, or None when idle
+    :rtype: Generator[Union[str, None], None, None]
+    """
+    with LogTailer(spool_path) as tailer:
+        path = tailer.path(job_id, stream)
+        if not os.path.exists(path):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        tailer.follow(job_id, [stream])
+        while tailer.following:
+            batches = tailer.poll(timeout)
+            if not batches and tailer.following:
+                yield None
+            for batch in batches:
+                yield from batch.text() if newlines else batch.lines
+
+
+class AsyncLogTailer:
+    def __init__(
+        self,
+        spool_path: str = DEFAULT_SPOOL_PATH,
+        max_batches: int = 64,
+        chunk_size: int = 1 << 16,
+        batch_size: int = 1 << 20,
+        poll_interval: float = 0.5,
+        use_inotify: Optional[bool] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """asyncio counterpart of :class:`LogTailer`, delivering batches through an async iterator
+
+        File access runs on ``executor`` (the loop's default executor if None), never
+        on the event loop. With inotify, the loop watches the inotify descriptor and
+        nothing runs until a followed file changes; when polling, one check of every
+        followed file runs each ``poll_interval``. Batches wait in a buffer of at
+        most ``max_batches``; while it is full no more data is read, so a slow
+        consumer leaves the output in the files rather than in memory.
+
+        Iteration ends once every followed file has gone away. Must be created
+        and used from within the event loop.
+
+        :param spool_path: Spool directory, defaults to "/var/spool/pbs/spool"
+        :type spool_path: str, optional
+        :param max_batches: Batches buffered before reading pauses, defaults to 64
+        :type max_batches: int, optional
+        :param chunk_size: Bytes read per call, defaults to 65536
+        :type chunk_size: int, optional
+        :param batch_size: Bytes read from one file per batch, defaults to 1048576
+        :type batch_size: int, optional
+        :param poll_interval: Seconds between checks when polling, defaults to 0.5
+        :type poll_interval: float, optional
+        :param use_inotify: Force (True) or disable (False) inotify, or None to use it when available, defaults to None
+        :type use_inotify: Optional[bool], optional
+        :param executor: Executor running the file access, defaults to None
+        :type executor: Optional[Executor], optional
+        """
+        self.tailer = LogTailer(
+            spool_path,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        self.executor = executor
+        self._queue: asyncio.Queue = asyncio.Queue(max_batches)
+        self._lock = threading.Lock()
+        self._pump: Optional[asyncio.Task] = None
+        self._done = False
+        self._error: Optional[Exception] = None
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        def locked() -> T:
+            with self._lock:
+                return function(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, locked)
+
+    async def follow(
+        self,
+        job_id: str,
+        streams: Iterable[JobOutputFile] = (JobOutputFile.OUTPUT, JobOutputFile.ERROR),
+        from_start: bool = True,
+        follow_rotation: bool = False,
+    ) -> None:
+        """Starts following a job's output files, see :meth:`LogTailer.follow`"""
+        if self._done:
+            raise RuntimeError("Log tailer has finished")
+        await self._run(
+            self.tailer.follow, job_id, tuple(streams), from_start, follow_rotation
+        )
+        if self._pump is None:
+            self._pump = asyncio.create_task(self._read())
+
+    async def unfollow(self, job_id: str) -> None:
+        """Stops following a job's output files, see :meth:`LogTailer.unfollow`"""
+        await self._run(self.tailer.unfollow, job_id)
+
+    async def _changed(self) -> None:
+        fd = self.tailer.fileno()
+        if fd is None:
+            await asyncio.sleep(self.tailer.poll_interval)
+            return
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+
+        def readable() -> None:
+            loop.remove_reader(fd)
+            if not ready.done():
+                ready.set_result(None)
+
+        loop.add_reader(fd, readable)
+        try:
+            await ready
+        finally:
+            loop.remove_reader(fd)
+
+    async def _read(self) -> None:
+        try:
+            while self.tailer.following:
+                batches = await self._run(self.tailer.poll, 0)
+                for batch in batches:
+                    await self._queue.put(batch)
+                if self.tailer.following and not self.tailer.pending:
+                    await self._changed()
+        except Exception as error:
+            # Raised by __anext__ once the batches read before it are consumed
+            self._error = error
+        finally:
+            self._done = True
+
+    def __aiter__(self) -> "AsyncLogTailer":
+        return self
+
+    async def __anext__(self) -> LogBatch:
+        if self._pump is None:
+            raise StopAsyncIteration
+        while self._queue.empty():
+            if self._pump.done():
+                if self._error is not None:
+                    raise self._error
+                raise StopAsyncIteration
+            # The pump may finish without queueing anything, so wait on both
+            getter = asyncio.ensure_future(self._queue.get())
+            try:
+                await asyncio.wait(
+                    (getter, self._pump), return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                if not getter.done():
+                    getter.cancel()
+            if getter.done() and not getter.cancelled():
+                return getter.result()
+        return self._queue.get_nowait()
+
+    async def close(self) -> None:
+        """Stops reading and closes every followed file"""
+        if self._pump is not None:
+            self._pump.cancel()
+            try:
+                await self._pump
+            except asyncio.CancelledError:
+                pass
+        await self._run(self.tailer.close)
+
+    async def __aenter__(self) -> "AsyncLogTailer":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+async def follow_job_async(
+    job_id: str,
+    stream: JobOutputFile = JobOutputFile.OUTPUT,
+    spool_path: str = DEFAULT_SPOOL_PATH,
+    timeout: Optional[float] = None,
+    newlines: bool = False,
+) -> AsyncGenerator[Union[str, None], None]:
+    """Async counterpart of :func:`follow_job`
+
+    :param job_id: Job ID
+    :type job_id: str
+    :param stream: Output stream, defaults to JobOutputFile.OUTPUT
+    :type stream: JobOutputFile, optional
+    :param spool_path: Spool directory, defaults to "/var/spool/pbs/spool"
+    :type spool_path: str, optional
+    :param timeout: Yield None after this many idle seconds, or None to wait, defaults to None
+    :type timeout: Optional[float], optional
+    :param newlines: Keep the newline of every line that had one, defaults to False
+    :type newlines: bool, optional
+    :raises FileNotFoundError: If the file does not exist
+    :yield: Lines, stripped of their newline unless ``newlines``, or None when idle
+    :rtype: AsyncGenerator[Union[str, None], None]
+    """
+    async with AsyncLogTailer(spool_path, max_batches=4) as tailer:
+        path = tailer.tailer.path(job_id, stream)
+        if not await asyncio.get_running_loop().run_in_executor(
+            None, os.path.exists, path
+        ):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+        await tailer.follow(job_id, [stream])
+        batches = aiter(tailer)
+        while True:
+            try:
+                batch = await asyncio.wait_for(anext(batches), timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            except StopAsyncIteration:
+                return
+            for line in batch.text() if newlines else batch.lines:
+                yield line
@@ -1,16 +1,32 @@
 from .server import Server, ServerLicenseCount
 from .scheduler import Scheduler
 from .job import (
+    ArrayProgress,
+    ArrayStateCount,
     Job,
     JobAccrueType,
     JobJoinPath,
     JobKeepFiles,
     JobSandbox,
     JobState,
+    JobSpec,
     JobSubmission,
+    LazyJob,
+    LiteJob,
+    SubmitResult,
 )
 from .common import QueueType, StateCount
-from .queue import Queue
-from .node import Node, NodeSharing, NodeState
+from .queue import LiteQueue, Queue
+from .node import LiteNode, Node, NodeSharing, NodeState
 from .reservation import Reservation, ReservationState
 from .hook import Hook
+from .parsing import LazyRecord, LiteRecord, RecordType, lite_record
+from .ranges import RangeSet
+from .resources import (
+    RESOURCE_CODEC,
+    ResourceCodec,
+    format_duration,
+    format_size,
+    parse_duration,
+    parse_size,
+)
@@ -1,5 +1,6 @@
 from typing import Literal, Optional
 from pydantic import BaseModel
+from .parsing import ParsePlan
 
 
 class Hook(BaseModel):
@@ -16,4 +17,7 @@ class Hook(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict) -> "Hook":
-        return Hook(**{k.lower(): v for k, v in data.items()})
+        return _HOOK_PLAN.parse(data)
+
+
+_HOOK_PLAN = ParsePlan(Hook)
@@ -0,0 +1,41 @@
+from typing import Any
+
+
+class StringPool:
+    """Bounded table of shared strings for values that repeat across stat records
+
+    Calling the pool with a string returns the first equal string it was given, so
+    every record holding that value points at a single object. Once ``max_size``
+    distinct strings are held, new strings are returned unchanged rather than
+    added, which keeps an unexpectedly high-cardinality field from growing the
+    pool without bound.
+
+    :param max_size: Maximum number of distinct strings held, defaults to 65536
+    :type max_size: int, optional
+    """
+
+    __slots__ = ("strings", "max_size")
+
+    def __init__(self, max_size: int = 65536) -> None:
+        self.strings: dict[str, str] = {}
+        self.max_size = max_size
+
+    def __call__(self, value: Any) -> Any:
+        if type(value) is not str:
+            return value
+        strings = self.strings
+        try:
+            return strings[value]
+        except KeyError:
+            if len(strings) < self.max_size:
+                strings[value] = value
+            return value
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def clear(self) -> None:
+        self.strings.clear()
+
+
+STRING_POOL = StringPool()
@@ -1,8 +1,10 @@
-from typing import Literal, Optional
+from typing import Any, Literal, Optional, Union
 from typing_extensions import TypedDict
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, model_validator
 from enum import Enum
 from .common import QueueType
+from .parsing import LazyRecord, ParsePlan, lite_record
+from .ranges import RangeSet
 
 
 class JobAccrueType(Enum):
@@ -57,6 +59,68 @@ class JobEstimatedValues(BaseModel):
         return JobEstimatedValues(**{})
 
 
+class ArrayStateCount(BaseModel):
+    queued: Optional[int] = 0
+    running: Optional[int] = 0
+    exiting: Optional[int] = 0
+    expired: Optional[int] = 0
+
+    @classmethod
+    def from_string(cls, data: str) -> "ArrayStateCount":
+        values = {
+            p.split(":")[0].lower(): int(p.split(":")[1])
+            for p in data.split(" ")
+            if ":" in p
+        }
+        return ArrayStateCount(**values)
+
+    @property
+    def total(self) -> int:
+        return self.queued + self.running + self.exiting + self.expired
+
+
+class ArrayProgress(BaseModel):
+    submitted: RangeSet
+    queued: RangeSet
+    counts: ArrayStateCount
+    active: Optional[RangeSet] = None
+
+    @property
+    def started(self) -> RangeSet:
+        return self.submitted - self.queued
+
+    @property
+    def finished(self) -> Optional[RangeSet]:
+        """Indices of the subjobs that have finished
+
+        The array's own record only lists the indices still queued, so the indices
+        still running or exiting are only known if ``active`` was filled from a
+        stat of the subjobs. Without it this is None while any subjob is active.
+
+        :return: Finished indices, or None if they cannot be told apart
+        :rtype: Optional[RangeSet]
+        """
+        if self.active is not None:
+            return self.started - self.active
+        if self.counts.running or self.counts.exiting:
+            return None
+        return self.started
+
+    @property
+    def fraction_done(self) -> float:
+        return self.counts.expired / len(self.submitted) if self.submitted else 0.0
+
+    @classmethod
+    def from_job(cls, job: "Job") -> "ArrayProgress":
+        if job.array_indices_submitted is None:
+            raise ValueError(f"Job {job.id} is not an array job")
+        return ArrayProgress(
+            submitted=job.array_indices_submitted,
+            queued=job.array_indices_remaining or RangeSet(),
+            counts=job.array_state_count or ArrayStateCount(),
+        )
+
+
 class Job(BaseModel):
     id: Optional[str] = None
     account_name: Optional[str] = None
@@ -67,9 +131,9 @@ class Job(BaseModel):
     array: Optional[bool] = False
     array_id: Optional[str] = None
     array_index: Optional[int] = None
-    array_indices_remaining: Optional[str] = None
-    array_indices_submitted: Optional[str] = None
-    array_state_count: Optional[str] = None
+    array_indices_remaining: Optional[RangeSet] = None
+    array_indices_submitted: Optional[RangeSet] = None
+    array_state_count: Optional[ArrayStateCount] = None
     block: Optional[bool] = False
     checkpoint: Optional[str] = "u"
     comment: Optional[str] = None
@@ -141,20 +205,53 @@ class Job(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict) -> "Job":
-        for key in [
-            "resource_list",
-            "resources_released",
-            "resource_release_list",
-            "resources_used",
-        ]:
-            keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
-            data[key] = {}
-            for k in keys:
-                try:
-                    data[key][k] = int(data[key + "." + k])
-                except:
-                    data[key][k] = data[key + "." + k]
-        return Job(**{k.lower(): v for k, v in data.items()})
+        return _JOB_PLAN.parse(data)
+
+
+_JOB_PLAN = ParsePlan(
+    Job,
+    groups=[
+        "resource_list",
+        "resources_released",
+        "resource_release_list",
+        "resources_used",
+    ],
+    intern=[
+        "account_name",
+        "array_id",
+        "checkpoint",
+        "egroup",
+        "euser",
+        "group_list",
+        "hold_types",
+        "job_name",
+        "job_owner",
+        "mail_points",
+        "project",
+        "queue",
+        "resource_list",
+        "server",
+        "shell_path_list",
+        "user_list",
+    ],
+)
+
+
+class LazyJob(LazyRecord):
+    """Stand-in for :class:`Job` that keeps the raw stat dictionary and parses fields on first access"""
+
+    plan = _JOB_PLAN
+
+    def materialize(self) -> Job:
+        """Parses every field and returns the full job model
+
+        :return: Job model
+        :rtype: Job
+        """
+        return super().materialize()
+
+
+LiteJob = lite_record("LiteJob", _JOB_PLAN)
 
 
 class JobSubmission(TypedDict):
@@ -167,7 +264,7 @@ class JobSubmission(TypedDict):
     array_id: Optional[str]
     array_index: Optional[int]
     array_indices_remaining: Optional[str]
-    array_indices_submitted: Optional[str]
+    array_indices_submitted: Optional[Union[str, RangeSet]]
     array_state_count: Optional[str]
     block: Optional[bool]
     checkpoint: Optional[str]
@@ -237,3 +334,34 @@ class JobSubmission(TypedDict):
     umask: Optional[int]
     user_list: Optional[str]
     variable_list: Optional[str]
+
+
+class JobSpec(BaseModel):
+    script: Optional[str] = None
+    executable: Optional[str] = None
+    args: list[str] = []
+    queue: Optional[str] = None
+    name: Optional[str] = None
+    attributes: dict[str, Any] = {}
+    output_directory: Optional[str] = None
+    alt_user: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_command(self) -> "JobSpec":
+        if self.script and self.executable:
+            raise ValueError("A job spec takes either a script or an executable")
+        return self
+
+
+class SubmitResult(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    spec: JobSpec
+    id: Optional[str] = None
+    job: Union[Job, LazyJob, LiteJob, None] = None
+    code: int = 0
+    error: Optional[str] = None
+
+    @property
+    def successful(self) -> bool:
+        return self.code == 0
@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Any, Literal, Optional
 from pydantic import BaseModel
+from .parsing import ParsePlan, lite_record
 
 
 class NodeSharing(Enum):
@@ -63,16 +64,9 @@ class Node(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict[str, str]) -> "Node":
-        for key in [
-            "resources_assigned",
-            "resources_available",
-        ]:
-            keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
-            data[key] = {}
-            for k in keys:
-                try:
-                    data[key][k] = int(data[key + "." + k])
-                except:
-                    data[key][k] = data[key + "." + k]
+        return _NODE_PLAN.parse(data)
 
-        return Node(**{k.lower(): v for k, v in data.items()})
+
+_NODE_PLAN = ParsePlan(Node, groups=["resources_assigned", "resources_available"])
+
+LiteNode = lite_record("LiteNode", _NODE_PLAN)
@@ -0,0 +1,585 @@
+import sys
+from collections import namedtuple
+from copy import deepcopy
+from enum import Enum
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Literal,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+from .interning import STRING_POOL, StringPool
+from .resources import RESOURCE_CODEC, ResourceCodec
+
+_BOOLEANS = {
+    "true": True,
+    "t": True,
+    "yes": True,
+    "y": True,
+    "on": True,
+    "1": True,
+    "false": False,
+    "f": False,
+    "no": False,
+    "n": False,
+    "off": False,
+    "0": False,
+}
+
+RecordType = Literal["model", "lazy", "lite"]
+
+_GROUP = object()
+_MUTABLE = (dict, list, set, BaseModel)
+_object_setattr = object.__setattr__
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _to_int(value: Any) -> int:
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        result = float(value)
+        if result.is_integer():
+            return int(result)
+        raise
+
+
+def _to_bool(value: Any) -> bool:
+    if type(value) is bool:
+        return value
+    return _BOOLEANS[str(value).lower()]
+
+
+def _to_str(value: Any) -> str:
+    if type(value) is str:
+        return value
+    raise TypeError(value)
+
+
+def _enum_coercer(enum: type[Enum]) -> Callable[[Any], Enum]:
+    members = {m.value: m for m in enum}
+    members.update({str(m.value): m for m in enum})
+
+    def coerce(value: Any) -> Enum:
+        if isinstance(value, enum):
+            return value
+        return members[value]
+
+    return coerce
+
+
+def _union_coercer(coercers: list[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    def coerce(value: Any) -> Any:
+        for coercer in coercers:
+            try:
+                return coercer(value)
+            except (KeyError, TypeError, ValueError):
+                continue
+        raise ValueError(value)
+
+    return coerce
+
+
+def _literal_coercer(allowed: tuple) -> Callable[[Any], Any]:
+    values = {value: value for value in allowed}
+
+    def coerce(value: Any) -> Any:
+        try:
+            return values[value]
+        except (KeyError, TypeError):
+            raise ValueError(value)
+
+    return coerce
+
+
+def _string_coercer(cls: type) -> Callable[[Any], Any]:
+    def coerce(value: Any) -> Any:
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls.from_string(value)
+        raise TypeError(value)
+
+    return coerce
+
+
+def _pooled_coercer(
+    coerce: Callable[[Any], Any], pool: StringPool
+) -> Callable[[Any], Any]:
+    def pooled(value: Any) -> Any:
+        return pool(coerce(value))
+
+    return pooled
+
+
+def field_coercer(annotation: Any) -> Callable[[Any], Any]:
+    """Builds a converter from a raw IFL string to the given field annotation
+
+    Converters raise KeyError, TypeError or ValueError on input they cannot handle.
+
+    :param annotation: Field annotation
+    :type annotation: Any
+    :return: Converter function
+    :rtype: Callable[[Any], Any]
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return field_coercer(args[0])
+        return _union_coercer([field_coercer(a) for a in args])
+    if origin is Literal:
+        return _literal_coercer(get_args(annotation))
+    if annotation is bool:
+        return _to_bool
+    if annotation is int:
+        return _to_int
+    if annotation is float:
+        return float
+    if annotation is str:
+        return _to_str
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return _enum_coercer(annotation)
+    if isinstance(annotation, type) and hasattr(annotation, "from_string"):
+        return _string_coercer(annotation)
+    return _identity
+
+
+def resource_value(value: str) -> Union[int, str]:
+    """Converts a single resource value, keeping non-integers as strings
+
+    :param value: Raw value
+    :type value: str
+    :return: Converted value
+    :rtype: Union[int, str]
+    """
+    if value.isdigit() or (value[:1] == "-" and value[1:].isdigit()):
+        return int(value)
+    return value
+
+
+class ParsePlan:
+    """Precompiled single-pass conversion from a ``batch_status`` dictionary to a model
+
+    Keys are matched to fields case-insensitively, dotted ``<group>.<resource>`` keys
+    are collected into the model's resource dictionaries, and values are coerced by
+    converters derived once from the field annotations. The model is then built
+    directly from a precomputed template of defaults, the way ``model_construct``
+    does, without resolving each default or validating a second time. If any value
+    cannot be coerced, parsing falls back to regular pydantic validation so errors
+    are reported as before.
+
+    :param model: Model class to build
+    :type model: type[BaseModel]
+    :param groups: Fields holding dotted resource keys, defaults to ()
+    :type groups: Iterable[str], optional
+    :param fill: Factories for fields that should be filled when absent, defaults to None
+    :type fill: dict[str, Callable[[], Any]], optional
+    :param codec: Converter for resource values, defaults to RESOURCE_CODEC
+    :type codec: ResourceCodec, optional
+    :param intern: Low-cardinality fields and resource groups whose string values are shared through ``pool``, defaults to ()
+    :type intern: Iterable[str], optional
+    :param pool: Pool of shared strings, defaults to STRING_POOL
+    :type pool: StringPool, optional
+    """
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        groups: Iterable[str] = (),
+        fill: dict[str, Callable[[], Any]] = None,
+        codec: ResourceCodec = RESOURCE_CODEC,
+        intern: Iterable[str] = (),
+        pool: StringPool = STRING_POOL,
+    ) -> None:
+        self.model = model
+        self.codec = codec
+        self.pool = pool
+        self.interned = frozenset(intern)
+        self.groups = {g.lower(): g for g in groups}
+        self.fill = fill if fill else {}
+        self.fields = {name.lower(): name for name in model.model_fields}
+        self.coercers = {
+            name: field_coercer(info.annotation)
+            for name, info in model.model_fields.items()
+        }
+        for name in self.interned & self.coercers.keys() - self.groups.values():
+            self.coercers[name] = _pooled_coercer(self.coercers[name], pool)
+        self.canonical: dict[str, tuple[str, bool]] = {}
+        self.keys: dict[str, Any] = {}
+        self.aliases: dict[str, list[str]] = {name: [name] for name in self.coercers}
+
+        self.template: dict[str, Any] = {}
+        self.factories: dict[str, Callable[[], Any]] = {}
+        self.required: set[str] = set()
+        for name, info in model.model_fields.items():
+            if info.is_required():
+                self.required.add(name)
+                self.template[name] = None
+            elif info.default_factory is not None:
+                self.factories[name] = info.default_factory
+                self.template[name] = None
+            elif isinstance(info.default, _MUTABLE):
+                self.factories[name] = lambda default=info.default: deepcopy(default)
+                self.template[name] = None
+            else:
+                self.template[name] = info.default
+
+    def resolve(self, key: str) -> Any:
+        """Resolves a raw key to its field or resource group, caching the result
+
+        :param key: Raw stat key
+        :type key: str
+        :return: ``(field, converter)``, a resource group marker tuple, or None if unknown
+        :rtype: Any
+        """
+        try:
+            return self.keys[key]
+        except KeyError:
+            pass
+        lowered = key.lower()
+        field = self.fields.get(lowered)
+        if field is not None and field not in self.groups.values():
+            resolved = (field, self.coercers[field])
+            if key not in self.aliases[field]:
+                self.aliases[field].append(key)
+        elif "." in lowered:
+            prefix, resource = key.split(".", 1)
+            group = self.groups.get(prefix.lower())
+            resolved = (_GROUP, group, resource) if group else None
+        else:
+            resolved = None
+        self.keys[key] = resolved
+        return resolved
+
+    def compact(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Rebuilds a stat dictionary so it shares strings with every other record
+
+        Attribute names are replaced by one interned copy each, and the values of
+        interned fields and resource groups by their pooled copy. Used for raw
+        dictionaries that are kept around, such as those behind lazy records.
+
+        :param data: Raw stat dictionary
+        :type data: dict[str, Any]
+        :return: Equal dictionary holding shared strings
+        :rtype: dict[str, Any]
+        """
+        canonical = self.canonical
+        pool = self.pool
+        result = {}
+        for key, value in data.items():
+            try:
+                key, shared = canonical[key]
+            except KeyError:
+                resolved = self.resolve(key)
+                shared = resolved is not None and (
+                    resolved[1 if resolved[0] is _GROUP else 0] in self.interned
+                )
+                key, shared = canonical[key] = (sys.intern(key), shared)
+            result[key] = pool(value) if shared else value
+        return result
+
+    def convert_resource(self, value: Any, resource: Optional[str] = None) -> Any:
+        """Converts a value belonging to a resource group, see :class:`ResourceCodec`
+
+        :param value: Raw value
+        :type value: Any
+        :param resource: Resource name, defaults to None
+        :type resource: Optional[str], optional
+        :return: Converted value
+        :rtype: Any
+        """
+        return self.codec.decode(resource, value) if type(value) is str else value
+
+    def default(self, field: str) -> Any:
+        """Gets the value a field takes when it is absent from the stat dictionary
+
+        :param field: Field name
+        :type field: str
+        :return: Default value
+        :rtype: Any
+        """
+        if field in self.fill:
+            return self.fill[field]()
+        if field in self.factories:
+            return self.factories[field]()
+        return self.template[field]
+
+    def values(self, data: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        """Groups and coerces a stat dictionary in a single pass
+
+        :param data: Raw stat dictionary
+        :type data: dict[str, Any]
+        :return: Model field values, and whether every value was coerced successfully
+        :rtype: tuple[dict[str, Any], bool]
+        """
+        keys = self.keys
+        values: dict[str, Any] = {}
+        groups: dict[str, dict[str, Any]] = {g: {} for g in self.groups.values()}
+        valid = True
+        for key, value in data.items():
+            try:
+                resolved = keys[key]
+            except KeyError:
+                resolved = self.resolve(key)
+            if resolved is None:
+                continue
+            if resolved[0] is _GROUP:
+                groups[resolved[1]][resolved[2]] = self.convert_resource(
+                    value, resolved[2]
+                )
+                continue
+            field, coerce = resolved
+            if valid:
+                try:
+                    values[field] = coerce(value)
+                    continue
+                except (KeyError, TypeError, ValueError):
+                    valid = False
+            values[field] = value
+        values.update(groups)
+        for field, factory in self.fill.items():
+            if field not in values:
+                values[field] = factory()
+        return values, valid
+
+    def parse(self, data: dict[str, Any]) -> BaseModel:
+        """Builds a model from a stat dictionary
+
+        :param data: Raw stat dictionary
+        :type data: dict[str, Any]
+        :return: Model instance
+        :rtype: BaseModel
+        """
+        values, valid = self.values(data)
+        if not valid or not self.required.issubset(values):
+            return self.model.model_validate(values)
+        return self.construct(values)
+
+    def construct(self, values: dict[str, Any]) -> BaseModel:
+        """Builds a model from already-coerced field values without validation
+
+        :param values: Field values
+        :type values: dict[str, Any]
+        :return: Model instance
+        :rtype: BaseModel
+        """
+        fields = self.template.copy()
+        fields.update(values)
+        for name, factory in self.factories.items():
+            if name not in values:
+                fields[name] = factory()
+        instance = self.model.__new__(self.model)
+        _object_setattr(instance, "__dict__", fields)
+        _object_setattr(instance, "__pydantic_fields_set__", set(values))
+        _object_setattr(instance, "__pydantic_extra__", None)
+        _object_setattr(instance, "__pydantic_private__", None)
+        return instance
+
+
+class LazyRecord:
+    """Read-only view over a raw ``batch_status`` dictionary that converts fields on first access
+
+    Converted values are cached on the instance, so each field is parsed at most
+    once. The dictionary is compacted on the way in, see :meth:`ParsePlan.compact`.
+    Subclasses set :attr:`plan` to the :class:`ParsePlan` of the model they stand
+    in for.
+
+    :param data: Raw stat dictionary
+    :type data: dict[str, Any]
+    """
+
+    plan: ParsePlan
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        _object_setattr(self, "raw", self.plan.compact(data))
+
+    def __getattr__(self, name: str) -> Any:
+        plan = self.plan
+        if name not in plan.template:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        if name in plan.groups.values():
+            value = self._group(name)
+        else:
+            value = self._field(name)
+        _object_setattr(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__!r} object is read-only")
+
+    def _group(self, name: str) -> dict[str, Any]:
+        plan = self.plan
+        values = {}
+        for key, value in self.raw.items():
+            if "." in key:
+                resolved = plan.resolve(key)
+                if resolved and resolved[0] is _GROUP and resolved[1] == name:
+                    values[resolved[2]] = plan.convert_resource(value, resolved[2])
+        return values
+
+    def _field(self, name: str) -> Any:
+        plan = self.plan
+        raw = self.raw
+        for key in plan.aliases[name]:
+            if key in raw:
+                break
+        else:
+            lowered = name.lower()
+            for key in raw:
+                if key.lower() == lowered:
+                    plan.resolve(key)
+                    break
+            else:
+                return plan.default(name)
+
+        try:
+            return plan.coercers[name](raw[key])
+        except (KeyError, TypeError, ValueError):
+            return getattr(self.materialize(), name)
+
+    def materialize(self) -> BaseModel:
+        """Converts every field and returns the full model
+
+        :return: Fully parsed model
+        :rtype: BaseModel
+        """
+        return self.plan.parse(self.raw)
+
+    def copy(self) -> "LazyRecord":
+        """Gets a new view over the same raw dictionary, with nothing converted yet
+
+        :return: Record
+        :rtype: LazyRecord
+        """
+        record = object.__new__(type(self))
+        _object_setattr(record, "raw", self.raw)
+        return record
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.raw.get('id')!r})"
+
+
+class LiteRecord(tuple):
+    """Immutable, slotted record with the fields of a model, built without validation
+
+    Lite records are named tuples: construction fills one tuple from the values
+    coerced by the model's :class:`ParsePlan`, and absent fields and empty
+    resource groups share a single default per class instead of copying it per
+    record. Shared dictionary defaults are read-only mappings. Use
+    :meth:`to_model` to get the full model back, and :func:`lite_record` to build
+    the class for a model.
+    """
+
+    __slots__ = ()
+    plan: ParsePlan
+    defaults: tuple
+    template: dict[str, Any]
+
+    @classmethod
+    def from_pbs(cls, data: dict[str, Any]) -> "LiteRecord":
+        """Builds a record from a stat dictionary
+
+        Values that cannot be coerced are validated through the full model, so
+        errors are the same as for ``from_pbs`` on the model.
+
+        :param data: Raw stat dictionary
+        :type data: dict[str, Any]
+        :return: Record
+        :rtype: LiteRecord
+        """
+        values, valid = cls.plan.values(data)
+        if not valid or not cls.plan.required.issubset(values):
+            return cls.from_model(cls.plan.model.model_validate(values))
+        for group in cls.plan.groups.values():
+            if not values[group]:
+                del values[group]
+        fields = cls.template.copy()
+        fields.update(values)
+        return tuple.__new__(cls, fields.values())
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "LiteRecord":
+        """Builds a record holding the field values of a model
+
+        :param model: Model instance
+        :type model: BaseModel
+        :return: Record
+        :rtype: LiteRecord
+        """
+        fields = model.__dict__
+        return tuple.__new__(cls, [fields[name] for name in cls._fields])
+
+    def to_model(self) -> BaseModel:
+        """Converts the record to the full model, copying shared defaults
+
+        :return: Model instance
+        :rtype: BaseModel
+        """
+        return self.plan.construct(
+            {
+                name: value
+                for name, value, default in zip(self._fields, self, self.defaults)
+                if value is not default
+            }
+        )
+
+    def copy(self) -> "LiteRecord":
+        """Gets a record with its own copy of every mutable value but the shared defaults
+
+        :return: Record
+        :rtype: LiteRecord
+        """
+        return tuple.__new__(
+            type(self),
+            [
+                deepcopy(value) if value is not default else value
+                for value, default in zip(self, self.defaults)
+            ],
+        )
+
+
+def lite_record(name: str, plan: ParsePlan) -> type[LiteRecord]:
+    """Builds the :class:`LiteRecord` class of a model
+
+    :param name: Class name
+    :type name: str
+    :param plan: Parse plan of the model
+    :type plan: ParsePlan
+    :return: Record class
+    :rtype: type[LiteRecord]
+    """
+    fields = list(plan.template)
+    defaults = []
+    for field in fields:
+        default = plan.default(field)
+        if isinstance(default, dict):
+            default = MappingProxyType(default)
+        defaults.append(default)
+    base = namedtuple(f"_{name}", fields, defaults=defaults)
+    return type(
+        name,
+        (base, LiteRecord),
+        {
+            "__slots__": (),
+            "__doc__": f"Lite record of :class:`{plan.model.__name__}`",
+            "plan": plan,
+            "defaults": tuple(defaults),
+            "template": dict(zip(fields, defaults)),
+        },
+    )
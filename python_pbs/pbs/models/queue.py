@@ -1,6 +1,7 @@
 from typing import Any, Literal, Optional
 from pydantic import BaseModel
 from .common import QueueType, StateCount
+from .parsing import ParsePlan, lite_record
 
 
 class Queue(BaseModel):
@@ -57,28 +58,22 @@ class Queue(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict[str, str]) -> "Queue":
-        for key in [
-            "resources_assigned",
-            "resources_available",
-            "resources_default",
-            "resources_max",
-            "default_chunk",
-            "resources_min",
-            "max_user_res",
-            "max_user_res_soft"
-        ]:
-            keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
-            data[key] = {}
-            for k in keys:
-                try:
-                    data[key][k] = int(data[key + "." + k])
-                except:
-                    data[key][k] = data[key + "." + k]
+        return _QUEUE_PLAN.parse(data)
 
-        data["state_count"] = (
-            StateCount.from_string(data["state_count"])
-            if "state_count" in data.keys()
-            else StateCount()
-        )
 
-        return Queue(**data)
+_QUEUE_PLAN = ParsePlan(
+    Queue,
+    groups=[
+        "resources_assigned",
+        "resources_available",
+        "resources_default",
+        "resources_max",
+        "default_chunk",
+        "resources_min",
+        "max_user_res",
+        "max_user_res_soft",
+    ],
+    fill={"state_count": StateCount},
+)
+
+LiteQueue = lite_record("LiteQueue", _QUEUE_PLAN)
@@ -0,0 +1,178 @@
+import re
+from bisect import bisect_right
+from typing import Any, Iterable, Iterator, Union
+
+from pydantic_core import core_schema
+
+_RANGE = re.compile(r"^(\d+)(?:-(\d+)(?::(\d+))?)?$")
+_RUN = re.compile(r"1+")
+
+
+class RangeSet:
+    """Immutable set of non-negative indices in PBS range syntax, such as ``1-1000:2,2001-3000``
+
+    Indices are held as sorted, non-overlapping ``(first, last, step)`` runs, so an
+    array of any width costs one tuple per range. Membership is a binary search
+    over the runs, and set operations go through an integer bitmask. Parsing
+    accepts ``-`` and the empty string as the empty set, as PBS reports them for
+    arrays with nothing left.
+
+    :param runs: ``(first, last, step)`` runs, defaults to ()
+    :type runs: Iterable[tuple[int, int, int]], optional
+    :raises ValueError: If a run is malformed
+    """
+
+    __slots__ = ("runs", "_firsts")
+
+    def __init__(self, runs: Iterable[tuple[int, int, int]] = ()) -> None:
+        runs = sorted(runs)
+        for first, last, step in runs:
+            if first < 0 or last < first or step < 1:
+                raise ValueError(f"Invalid range {first}-{last}:{step}")
+        if any(a[1] >= b[0] for a, b in zip(runs, runs[1:])):
+            runs = RangeSet._runs(RangeSet._mask(runs))
+        self.runs: tuple[tuple[int, int, int], ...] = tuple(
+            (first, first + (last - first) // step * step, step)
+            for first, last, step in runs
+        )
+        self._firsts = [run[0] for run in self.runs]
+
+    @classmethod
+    def from_string(cls, data: str) -> "RangeSet":
+        """Parses PBS range syntax
+
+        :param data: Comma-separated ``first[-last[:step]]`` ranges
+        :type data: str
+        :raises ValueError: If the string is not valid range syntax
+        :return: Parsed set
+        :rtype: RangeSet
+        """
+        data = data.strip()
+        if data in ("", "-"):
+            return cls()
+        runs = []
+        for part in data.split(","):
+            match = _RANGE.match(part.strip())
+            if match is None:
+                raise ValueError(f"Invalid index range {part!r}")
+            first, last, step = match.groups()
+            runs.append((int(first), int(last or first), int(step) if step else 1))
+        return cls(runs)
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int]) -> "RangeSet":
+        """Builds a set from individual indices
+
+        :param indices: Indices
+        :type indices: Iterable[int]
+        :return: Set of the indices, as contiguous runs
+        :rtype: RangeSet
+        """
+        bits = bytearray()
+        for index in indices:
+            if index < 0:
+                raise ValueError(f"Invalid index {index}")
+            if index >> 3 >= len(bits):
+                bits.extend(bytes((index >> 3) + 1 - len(bits)))
+            bits[index >> 3] |= 1 << (index & 7)
+        return cls.from_mask(int.from_bytes(bits, "little"))
+
+    @classmethod
+    def from_mask(cls, mask: int) -> "RangeSet":
+        """Builds a set from a bitmask where bit ``i`` marks index ``i``
+
+        :param mask: Bitmask
+        :type mask: int
+        :return: Set of the marked indices, as contiguous runs
+        :rtype: RangeSet
+        """
+        return cls(cls._runs(mask))
+
+    @staticmethod
+    def _runs(mask: int) -> list[tuple[int, int, int]]:
+        bits = bin(mask)[:1:-1]
+        return [(m.start(), m.end() - 1, 1) for m in _RUN.finditer(bits)]
+
+    @staticmethod
+    def _mask(runs: Iterable[tuple[int, int, int]]) -> int:
+        mask = 0
+        for first, last, step in runs:
+            if step == 1:
+                mask |= ((1 << (last - first + 1)) - 1) << first
+                continue
+            bits = bytearray((last >> 3) + 1)
+            for index in range(first, last + 1, step):
+                bits[index >> 3] |= 1 << (index & 7)
+            mask |= int.from_bytes(bits, "little")
+        return mask
+
+    @property
+    def mask(self) -> int:
+        """Bitmask where bit ``i`` is set if index ``i`` is in the set"""
+        return self._mask(self.runs)
+
+    def __contains__(self, index: Any) -> bool:
+        if type(index) is not int:
+            return False
+        position = bisect_right(self._firsts, index) - 1
+        if position < 0:
+            return False
+        first, last, step = self.runs[position]
+        return index <= last and (index - first) % step == 0
+
+    def __len__(self) -> int:
+        return sum((last - first) // step + 1 for first, last, step in self.runs)
+
+    def __bool__(self) -> bool:
+        return bool(self.runs)
+
+    def __iter__(self) -> Iterator[int]:
+        for first, last, step in self.runs:
+            yield from range(first, last + 1, step)
+
+    def __or__(self, other: "RangeSet") -> "RangeSet":
+        return RangeSet.from_mask(self.mask | other.mask)
+
+    def __and__(self, other: "RangeSet") -> "RangeSet":
+        return RangeSet.from_mask(self.mask & other.mask)
+
+    def __sub__(self, other: "RangeSet") -> "RangeSet":
+        return RangeSet.from_mask(self.mask & ~other.mask)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, RangeSet):
+            return NotImplemented
+        return self.runs == other.runs or self.mask == other.mask
+
+    def __hash__(self) -> int:
+        return hash(self.mask)
+
+    def __str__(self) -> str:
+        return ",".join(
+            (
+                str(first)
+                if first == last
+                else f"{first}-{last}" if step == 1 else f"{first}-{last}:{step}"
+            )
+            for first, last, step in self.runs
+        )
+
+    def __repr__(self) -> str:
+        return f"RangeSet({str(self)!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: Any
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(str),
+        )
+
+    @classmethod
+    def _validate(cls, value: Union["RangeSet", str]) -> "RangeSet":
+        if isinstance(value, RangeSet):
+            return value
+        if isinstance(value, str):
+            return cls.from_string(value)
+        raise ValueError(f"Cannot build a RangeSet from {value!r}")
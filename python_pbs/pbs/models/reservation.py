@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Optional
 from pydantic import BaseModel
+from .parsing import ParsePlan
 
 
 class ReservationState(Enum):
@@ -46,15 +47,7 @@ class Reservation(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict[str, str]) -> "Reservation":
-        for key in [
-            "resource_list",
-        ]:
-            keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
-            data[key] = {}
-            for k in keys:
-                try:
-                    data[key][k] = int(data[key + "." + k])
-                except:
-                    data[key][k] = data[key + "." + k]
+        return _RESERVATION_PLAN.parse(data)
 
-        return Reservation(**{k.lower(): v for k, v in data.items()})
+
+_RESERVATION_PLAN = ParsePlan(Reservation, groups=["resource_list"])
@@ -0,0 +1,268 @@
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Iterable, Optional, Union
+
+# Resource value types as reported by pbs_statrsc
+TYPE_LONG = 1
+TYPE_STRING = 3
+TYPE_STRING_ARRAY = 4
+TYPE_SIZE = 5
+TYPE_LONG_LONG = 9
+TYPE_SHORT = 10
+TYPE_BOOLEAN = 11
+TYPE_FLOAT = 14
+
+# Types of the resources every PBS server defines
+BUILTIN_RESOURCE_TYPES = {
+    "arch": TYPE_STRING,
+    "cput": TYPE_LONG,
+    "file": TYPE_SIZE,
+    "host": TYPE_STRING,
+    "mem": TYPE_SIZE,
+    "mpiprocs": TYPE_LONG,
+    "ncpus": TYPE_LONG,
+    "ngpus": TYPE_LONG,
+    "nodect": TYPE_LONG,
+    "nodes": TYPE_STRING,
+    "ompthreads": TYPE_LONG,
+    "pcput": TYPE_LONG,
+    "place": TYPE_STRING,
+    "pmem": TYPE_SIZE,
+    "pvmem": TYPE_SIZE,
+    "select": TYPE_STRING,
+    "soft_walltime": TYPE_LONG,
+    "software": TYPE_STRING,
+    "start_time": TYPE_LONG,
+    "vmem": TYPE_SIZE,
+    "vnode": TYPE_STRING,
+    "walltime": TYPE_LONG,
+}
+
+_INTEGER_TYPES = frozenset({TYPE_LONG, TYPE_LONG_LONG, TYPE_SHORT})
+_SIZE = re.compile(r"^(\d+)([kmgtp]?)([bw]?)$", re.IGNORECASE)
+_SIZE_SHIFT = {"": 0, "k": 10, "m": 20, "g": 30, "t": 40, "p": 50}
+_SIZE_UNITS = ["b", "kb", "mb", "gb", "tb", "pb"]
+_WORD_SIZE = 8
+_BOOLEANS = {"true": True, "t": True, "y": True, "1": True}
+_BOOLEANS.update({"false": False, "f": False, "n": False, "0": False})
+
+
+def parse_size(value: str) -> int:
+    """Converts a PBS size such as ``16gb`` or ``512mw`` to bytes
+
+    Units are powers of 1024 and a ``w`` suffix counts 8-byte words. A bare
+    number is a count of bytes.
+
+    :param value: Size string
+    :type value: str
+    :raises ValueError: If the value is not a size
+    :return: Bytes
+    :rtype: int
+    """
+    match = _SIZE.match(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid size {value!r}")
+    number, unit, kind = match.groups()
+    size = int(number) << _SIZE_SHIFT[unit.lower()]
+    return size * _WORD_SIZE if kind.lower() == "w" else size
+
+
+def format_size(size: int) -> str:
+    """Formats bytes as the largest exact PBS size unit, such as ``16gb``
+
+    :param size: Bytes
+    :type size: int
+    :return: Size string
+    :rtype: str
+    """
+    unit = 0
+    while unit < len(_SIZE_UNITS) - 1 and size and size % 1024 == 0:
+        size //= 1024
+        unit += 1
+    return f"{size}{_SIZE_UNITS[unit]}"
+
+
+def parse_duration(value: str) -> Union[int, float]:
+    """Converts a PBS duration such as ``24:00:00``, ``90:00`` or ``3600`` to seconds
+
+    :param value: Duration string, ``[[hours:]minutes:]seconds[.fraction]``
+    :type value: str
+    :raises ValueError: If the value is not a duration
+    :return: Seconds, as a float only if there is a fractional part
+    :rtype: Union[int, float]
+    """
+    parts = value.strip().split(":")
+    if len(parts) > 3 or not all(parts):
+        raise ValueError(f"Invalid duration {value!r}")
+    seconds = float(parts[-1]) if "." in parts[-1] else int(parts[-1])
+    multiplier = 60
+    for part in reversed(parts[:-1]):
+        seconds += int(part) * multiplier
+        multiplier *= 60
+    return seconds
+
+
+def format_duration(seconds: Union[int, float]) -> str:
+    """Formats seconds as a PBS duration such as ``24:00:00`` or ``00:00:01.5``
+
+    :param seconds: Seconds
+    :type seconds: Union[int, float]
+    :return: Duration string, ``hours:minutes:seconds[.fraction]``
+    :rtype: str
+    """
+    minutes, whole = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    duration = f"{hours:02d}:{minutes:02d}:{whole:02d}"
+    if type(seconds) is float and seconds != int(seconds):
+        duration += "." + f"{seconds:.6f}".rstrip("0").split(".")[1]
+    return duration
+
+
+def _untyped(value: str) -> Union[int, str]:
+    if value.isdigit() or (value[:1] == "-" and value[1:].isdigit()):
+        return int(value)
+    return value
+
+
+def _decode(type: Optional[int], value: str) -> Any:
+    if type in _INTEGER_TYPES:
+        return parse_duration(value) if ":" in value else int(value)
+    if type == TYPE_SIZE:
+        return parse_size(value)
+    if type == TYPE_FLOAT:
+        return float(value)
+    if type == TYPE_BOOLEAN:
+        return _BOOLEANS[value.lower()]
+    if type is None:
+        return _untyped(value)
+    return value
+
+
+class ResourceCodec:
+    """Typed conversion of resource values, shared by every model's resource dictionaries
+
+    Sizes become bytes, durations (integer resources written as ``HH:MM:SS``)
+    become seconds, floats and booleans are converted, and strings are kept.
+    Resources of unknown type fall back to converting integers only. Types
+    start from :data:`BUILTIN_RESOURCE_TYPES` and can be refreshed from the
+    server with :meth:`load`, which picks up site-defined resources.
+
+    Decoded values are memoised per ``(type, value)`` in a bounded cache that
+    evicts the oldest entries first, so the handful of distinct values in a large
+    snapshot (``16gb``, ``24:00:00``) are each parsed once. Values that fail to
+    parse are kept as strings.
+
+    :param types: Resource types by name, defaults to BUILTIN_RESOURCE_TYPES
+    :type types: dict[str, int], optional
+    :param cache_size: Maximum number of memoised values, defaults to 4096
+    :type cache_size: int, optional
+    """
+
+    def __init__(
+        self, types: Optional[dict[str, int]] = None, cache_size: int = 4096
+    ) -> None:
+        self.types: dict[str, int] = dict(
+            BUILTIN_RESOURCE_TYPES if types is None else types
+        )
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[Optional[int], str], Any] = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, connection: Any) -> int:
+        """Reads resource types from the server with ``pbs_statrsc``
+
+        :param connection: Connection ID or pool
+        :type connection: Any
+        :return: Number of resources read
+        :rtype: int
+        """
+        from python_pbs.util import stat_resource
+
+        return self.update(
+            (data["id"], data["type"])
+            for data in stat_resource(connection)
+            if data.get("id") and data.get("type")
+        )
+
+    def update(self, types: Iterable[tuple[str, Union[int, str]]]) -> int:
+        """Sets the types of some resources
+
+        :param types: ``(name, type)`` pairs
+        :type types: Iterable[tuple[str, Union[int, str]]]
+        :return: Number of types set
+        :rtype: int
+        """
+        count = 0
+        for name, type in types:
+            try:
+                self.types[name.lower()] = int(type)
+            except ValueError:
+                continue
+            count += 1
+        return count
+
+    def decode(self, resource: Optional[str], value: Any) -> Any:
+        """Converts a raw resource value according to the resource's type
+
+        :param resource: Resource name, or None if unknown
+        :type resource: Optional[str]
+        :param value: Raw value
+        :type value: Any
+        :return: Converted value
+        :rtype: Any
+        """
+        if type(value) is not str:
+            return value
+        kind = None
+        if resource:
+            kind = self.types.get(resource) or self.types.get(resource.lower())
+        key = (kind, value)
+        cache = self._cache
+        try:
+            result = cache[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return result
+        self.misses += 1
+        try:
+            result = _decode(key[0], value)
+        except (KeyError, ValueError):
+            result = value
+        with self._lock:
+            cache[key] = result
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return result
+
+    def encode(self, resource: str, value: Any) -> str:
+        """Formats a converted value back into the string PBS expects
+
+        :param resource: Resource name
+        :type resource: str
+        :param value: Converted value
+        :type value: Any
+        :return: Raw value
+        :rtype: str
+        """
+        if type(value) is str:
+            return value
+        kind = self.types.get(resource.lower())
+        if kind == TYPE_SIZE and type(value) is int:
+            return format_size(value)
+        if kind in _INTEGER_TYPES and type(value) is float:
+            # Integer resources only take fractions as durations
+            return format_duration(value)
+        return str(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+        self.hits = self.misses = 0
+
+
+RESOURCE_CODEC = ResourceCodec()
@@ -1,5 +1,6 @@
 from typing import Literal, Optional
 from pydantic import BaseModel
+from .parsing import ParsePlan
 
 
 class Scheduler(BaseModel):
@@ -28,4 +29,7 @@ class Scheduler(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict) -> "Scheduler":
-        return Scheduler(**{k.lower(): v for k, v in data.items()})
+        return _SCHEDULER_PLAN.parse(data)
+
+
+_SCHEDULER_PLAN = ParsePlan(Scheduler)
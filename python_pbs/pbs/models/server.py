@@ -1,6 +1,7 @@
 from typing import Any, Literal, Optional
 from pydantic import BaseModel
 from .common import StateCount
+from .parsing import ParsePlan
 
 
 class ServerLicenseCount(BaseModel):
@@ -117,30 +118,17 @@ class Server(BaseModel):
 
     @classmethod
     def from_pbs(cls, data: dict[str, str]) -> "Server":
-        for key in [
-            "resources_assigned",
-            "resources_available",
-            "resources_default",
-            "resources_max",
-            "default_chunk",
-        ]:
-            keys = [k.split(".")[1] for k in data.keys() if k.startswith(key + ".")]
-            data[key] = {}
-            for k in keys:
-                try:
-                    data[key][k] = int(data[key + "." + k])
-                except:
-                    data[key][k] = data[key + "." + k]
+        return _SERVER_PLAN.parse(data)
 
-        data["license_count"] = (
-            ServerLicenseCount.from_string(data["license_count"])
-            if "license_count" in data.keys()
-            else ServerLicenseCount()
-        )
-        data["state_count"] = (
-            StateCount.from_string(data["state_count"])
-            if "state_count" in data.keys()
-            else StateCount()
-        )
 
-        return Server(**data)
+_SERVER_PLAN = ParsePlan(
+    Server,
+    groups=[
+        "resources_assigned",
+        "resources_available",
+        "resources_default",
+        "resources_max",
+        "default_chunk",
+    ],
+    fill={"license_count": ServerLicenseCount, "state_count": StateCount},
+)
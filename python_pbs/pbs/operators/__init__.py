@@ -4,3 +4,22 @@ from .node import NodeObject, NodeOperator
 from .queue import QueueObject, QueueOperator
 from .scheduler import SchedulerObject, SchedulerOperator
 from .job import JobObject, JobOperator, JobAttribute
+from .ids import IdResolver, job_id_key
+from .watch import (
+    JobEvent,
+    JobFinished,
+    JobResourcesUpdated,
+    JobStateChanged,
+    JobSubmitted,
+    JobWaiter,
+    JobWatcher,
+    WaitCondition,
+    WaitResult,
+)
+from .query import (
+    F,
+    Expression,
+    Field,
+    JobQuery,
+    QueryPlan,
+)
@@ -1,4 +1,5 @@
-from typing import Any, Literal, TypeVar, Union
+import copy
+from typing import Any, Generator, Literal, Optional, TypeVar, Union
 
 from pydantic import BaseModel
 from python_pbs.util import (
@@ -8,12 +9,16 @@ from python_pbs.util import (
     stat_scheduler,
     stat_server,
     Attribute,
+    AttributeList,
     BatchOperation,
     execute_manager_command,
     ManagerCommand,
     ManagerObject,
 )
 
+from ..cache import StatCache
+from ..models import LiteRecord, RecordType
+from .ids import IdResolver
 from ..exceptions import *
 
 stat_map = {
@@ -24,6 +29,15 @@ stat_map = {
     "server": stat_server,
 }
 
+minimal_attribute = {
+    "hook": "enabled",
+    "job": "job_state",
+    "node": "state",
+    "queue": "queue_type",
+    "scheduler": "state",
+    "server": "server_state",
+}
+
 object_map = {
     "hook": ManagerObject.HOOK,
     "node": ManagerObject.NODE,
@@ -33,6 +47,53 @@ object_map = {
 }
 
 
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def chunked(items: list, size: int) -> Generator[list, Any, None]:
+    """Splits a list into consecutive slices of at most ``size`` items
+
+    :param items: Items to split
+    :type items: list
+    :param size: Maximum slice length
+    :type size: int
+    :raises ValueError: If size is not positive
+    :yield: Slices of items
+    :rtype: Generator[list, Any, None]
+    """
+    if size < 1:
+        raise ValueError(f"Chunk size must be positive, got {size}")
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def field_attributes(fields: Optional[list[str]], object_type: str) -> AttributeList:
+    """Translates model field names into the attribute list sent with a stat request
+
+    Dotted names select a single resource (``resource_list.ncpus``), bare resource
+    group names select the whole group. ``id`` is always returned by the server, so
+    it is not sent.
+
+    :param fields: Model field names, or None for every attribute
+    :type fields: Optional[list[str]]
+    :param object_type: Object type being queried
+    :type object_type: str
+    :return: Attribute list, empty to request every attribute
+    :rtype: AttributeList
+    """
+    if not fields:
+        return AttributeList()
+    attributes = []
+    for field in fields:
+        if field == "id":
+            continue
+        name, _, resource = field.partition(".")
+        attributes.append(Attribute(name=name, resource=resource if resource else None))
+    if not attributes:
+        attributes.append(Attribute(name=minimal_attribute[object_type]))
+    return AttributeList(attributes)
+
+
 class BaseAttributeModel(BaseModel):
     def to_attributes(self) -> list[Attribute]:
         return [Attribute(name=k, value=str(v)) for k, v in self.model_dump().items()]
@@ -47,9 +108,16 @@ class BaseObject:
     object_model: M
     attribute_model: A
 
-    def __init__(self, connection_id: int, data: M) -> None:
+    def __init__(
+        self, connection_id: int, data: M, cache: Optional[StatCache] = None
+    ) -> None:
         self.connection = connection_id
         self.data = data
+        self.cache = cache
+
+    def _invalidate(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.object_type, self.data.id)
 
     def stat(self, attributes: A = None) -> Union[M, None]:
         result = stat_map[self.object_type](
@@ -80,6 +148,7 @@ class AlterableObject(BaseObject):
             [Attribute(name=property, value=str(value), operation=operation)],
         )
         if result == 0:
+            self._invalidate()
             self.reload()
         else:
             raise PBSException(
@@ -94,35 +163,112 @@ class BaseObjectManager:
     object_type: Literal["hook", "node", "queue", "scheduler", "server"]
     object_model: M
     object_factory: O
+    lite_model: Optional[type[LiteRecord]] = None
 
-    def __init__(self, connection: int):
+    def __init__(
+        self,
+        connection: int,
+        cache: Optional[StatCache] = None,
+        resolver: Optional[IdResolver] = None,
+    ):
         self.connection = connection
+        self.cache = cache
+        self.resolver = resolver if resolver is not None else IdResolver()
+        self.fields: Optional[list[str]] = None
 
-    def stat(self, ids: list[str] = None) -> list[O]:
-        result = stat_map[self.object_type](
-            self.connection, id=",".join(ids) if ids else None
+    def with_fields(self, fields: Optional[list[str]]) -> "BaseObjectManager":
+        """Returns a copy of this operator that only requests the given fields by default
+
+        :param fields: Model field names, or None for every attribute
+        :type fields: Optional[list[str]]
+        :return: Projected operator
+        :rtype: BaseObjectManager
+        """
+        operator = copy.copy(self)
+        operator.fields = fields
+        return operator
+
+    def _make_record(self, data: dict, record_type: RecordType = "model") -> Any:
+        if record_type == "model":
+            return self.object_model.from_pbs(data)
+        if record_type == "lite" and self.lite_model is not None:
+            return self.lite_model.from_pbs(data)
+        raise ValueError(
+            f"Record type {record_type!r} is not available for {self.object_type}s"
         )
-        return [
-            self.object_factory(self.connection, self.object_model.from_pbs(i))
-            for i in result
-        ]
+
+    def stat(
+        self,
+        ids: list[str] = None,
+        fields: list[str] = None,
+        record_type: RecordType = "model",
+    ) -> list[O]:
+        fields = fields if fields else self.fields
+        if self.cache is not None:
+            key = StatCache.key(self.object_type, ids, fields, record_type)
+            records = self.cache.get(key)
+        else:
+            records = None
+        if records is None:
+            result = stat_map[self.object_type](
+                self.connection,
+                id=",".join(ids) if ids else None,
+                attributes=field_attributes(fields, self.object_type),
+            )
+            records = [self._make_record(i, record_type) for i in result]
+            if self.cache is not None:
+                self.cache.put(key, records)
+        return [self.object_factory(self.connection, r, self.cache) for r in records]
+
+    def iter_stat(
+        self,
+        ids: list[str] = None,
+        fields: list[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        record_type: RecordType = "model",
+    ) -> Generator[O, Any, None]:
+        """Stats objects in chunks of IDs, yielding each object as its chunk arrives
+
+        Without ``ids``, the object names are listed first with a minimal projection.
+        Only one chunk of raw results is held at a time.
+
+        :param ids: Object IDs, or None for every object
+        :type ids: list[str], optional
+        :param fields: Model field names to request, defaults to None
+        :type fields: list[str], optional
+        :param chunk_size: Maximum IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :param record_type: Record type to yield, "model" or "lite", defaults to "model"
+        :type record_type: RecordType, optional
+        :yield: Objects
+        :rtype: Generator[O, Any, None]
+        """
+        if ids is None:
+            ids = [
+                i["id"]
+                for i in stat_map[self.object_type](
+                    self.connection,
+                    attributes=field_attributes(["id"], self.object_type),
+                )
+            ]
+        for chunk in chunked(ids, chunk_size):
+            yield from self.stat(ids=chunk, fields=fields, record_type=record_type)
 
     @property
     def all(self) -> list[O]:
         return self.stat()
 
-    def get(self, id: str) -> Union[O, None]:
-        result = self.stat(ids=[id])
+    def get(self, id: str, fields: list[str] = None) -> Union[O, None]:
+        if self.resolver.is_missing(self.object_type, id):
+            return None
+        result = self.stat(
+            ids=[self.resolver.target(self.object_type, id)], fields=fields
+        )
         if len(result) > 0:
+            self.resolver.found(self.object_type, id, result[0].data.id)
             return result[0]
-        else:
-            fallback = {i["id"]: i for i in stat_map[self.object_type](self.connection)}
-            if id in fallback.keys():
-                return self.object_factory(
-                    self.connection, self.object_model.from_pbs(fallback[id])
-                )
-            else:
-                return None
+        self.resolver.missing(self.object_type, id)
+        return None
 
     def __getitem__(self, key) -> O:
         result = self.get(key)
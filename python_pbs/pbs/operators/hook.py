@@ -23,8 +23,8 @@ class HookOperator(BaseObjectManager):
     def all(self) -> list[HookObject]:
         return super().all
 
-    def get(self, id: str) -> HookObject | None:
-        return super().get(id)
+    def get(self, id: str, fields: list[str] = None) -> HookObject | None:
+        return super().get(id, fields=fields)
 
     def __getitem__(self, key) -> HookObject:
         return super().__getitem__(key)
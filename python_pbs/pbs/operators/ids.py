@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+_JOB_ID = re.compile(r"^(\d+)(\[\d*\])?(?:\.(.+))?$")
+
+
+def job_id_key(id: str) -> str:
+    """Reduces a job ID to its server-independent form
+
+    ``123``, ``123.server`` and ``123.server.domain`` all become ``123``; array
+    parents and subjobs keep their index (``123[]``, ``123[4]``). Anything that is
+    not a job ID, such as a subjob range, is only stripped of whitespace.
+
+    :param id: Job ID as given by the caller or returned by the server
+    :type id: str
+    :return: Normalised ID
+    :rtype: str
+    """
+    id = id.strip()
+    match = _JOB_ID.match(id)
+    if match is None:
+        return id
+    return match.group(1) + (match.group(2) or "")
+
+
+def job_id_server(id: str) -> Optional[str]:
+    """Gets the server suffix of a job ID
+
+    :param id: Job ID
+    :type id: str
+    :return: Server part, or None for short IDs
+    :rtype: Optional[str]
+    """
+    match = _JOB_ID.match(id.strip())
+    return match.group(3) if match else None
+
+
+class IdResolver:
+    def __init__(self, negative_ttl: float = 5.0, max_size: int = 4096) -> None:
+        """Remembers how IDs resolved on the server, so lookups cost one targeted request
+
+        IDs that were found are mapped from their normalised form to the canonical
+        ID the server returned, and IDs confirmed missing are remembered for
+        ``negative_ttl`` seconds so repeated lookups of them make no request at all.
+        Both maps are bounded to ``max_size`` entries, oldest first out.
+
+        :param negative_ttl: Seconds a confirmed miss is remembered, defaults to 5.0
+        :type negative_ttl: float, optional
+        :param max_size: Maximum entries in each map, defaults to 4096
+        :type max_size: int, optional
+        """
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.negative_hits = 0
+        self._resolved: OrderedDict[tuple, str] = OrderedDict()
+        self._missing: OrderedDict[tuple, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bound(self, entries: OrderedDict) -> None:
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+    def key(self, object_type: str, id: str) -> str:
+        """Normalises an ID for the given object type
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID as given
+        :type id: str
+        :return: Normalised ID
+        :rtype: str
+        """
+        return job_id_key(id) if object_type == "job" else id.strip()
+
+    def target(self, object_type: str, id: str) -> str:
+        """Gets the ID to send to the server, canonical if it resolved before
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID as given
+        :type id: str
+        :return: ID to request
+        :rtype: str
+        """
+        with self._lock:
+            return self._resolved.get(
+                (object_type, self.key(object_type, id)), id.strip()
+            )
+
+    def found(self, object_type: str, id: str, canonical: str) -> None:
+        """Records the canonical ID an ID resolved to
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID as given
+        :type id: str
+        :param canonical: ID returned by the server
+        :type canonical: str
+        """
+        key = (object_type, self.key(object_type, id))
+        with self._lock:
+            self._resolved[key] = canonical
+            self._resolved.move_to_end(key)
+            self._bound(self._resolved)
+
+    def is_missing(self, object_type: str, id: str, *options: Hashable) -> bool:
+        """Checks whether an ID was confirmed missing less than ``negative_ttl`` ago
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID as given
+        :type id: str
+        :return: True if the lookup can be skipped
+        :rtype: bool
+        """
+        key = (object_type, self.key(object_type, id), options)
+        with self._lock:
+            expiry = self._missing.get(key)
+            if expiry is None:
+                return False
+            if expiry > time.monotonic():
+                self.negative_hits += 1
+                return True
+            del self._missing[key]
+            return False
+
+    def missing(self, object_type: str, id: str, *options: Hashable) -> None:
+        """Records that an ID was not found with the given lookup options
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID as given
+        :type id: str
+        """
+        key = (object_type, self.key(object_type, id), options)
+        with self._lock:
+            self._missing[key] = time.monotonic() + self.negative_ttl
+            self._missing.move_to_end(key)
+            self._bound(self._missing)
+
+    def forget(self, object_type: str, id: Optional[str] = None) -> None:
+        """Drops confirmed misses, for instance after objects were created
+
+        :param object_type: Object type
+        :type object_type: str
+        :param id: ID to forget, or None for every ID of the type, defaults to None
+        :type id: Optional[str], optional
+        """
+        normalised = self.key(object_type, id) if id is not None else None
+        with self._lock:
+            for key in list(self._missing):
+                if key[0] == object_type and normalised in (None, key[1]):
+                    del self._missing[key]
@@ -1,13 +1,40 @@
 import asyncio
-from enum import Enum
-import os
+from concurrent.futures import ThreadPoolExecutor
+import copy
 import time
-from typing import Any, AsyncGenerator, Generator, Literal, Union
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Generator,
+    Literal,
+    Optional,
+    Union,
+)
 from python_pbs.pbs.exceptions import PBSException
-from ..models import Job
+from ..cache import StatCache
+from ..logs import DEFAULT_SPOOL_PATH, JobOutputFile, follow_job, follow_job_async
+from ..models import ArrayProgress, Job, LazyJob, LiteJob, RangeSet, RecordType
+from ..table import JobTable
+from .base import DEFAULT_CHUNK_SIZE, chunked, field_attributes
+from .ids import IdResolver, job_id_key
+from .query import Expression, JobQuery
+from .watch import (
+    JobEvent,
+    JobWaiter,
+    JobWatcher,
+    WaitCondition,
+    WaitResult,
+    stat_history,
+)
 from python_pbs.util import (
+    Connection,
+    ConnectionPool,
+    get_errno,
+    signal_job,
     stat_job,
     Attribute,
+    AttributeList,
     select_jobs,
     delete_job,
     rerun_job,
@@ -16,6 +43,7 @@ from python_pbs.util import (
     release_job,
     swap_jobs,
 )
+from python_pbs.util.pool import CONNECTION_ERRORS
 
 
 class JobAttribute(Attribute):
@@ -101,9 +129,18 @@ class JobAttribute(Attribute):
     ]
 
 
-class JobOutputFile(Enum):
-    OUTPUT = "OU"
-    ERROR = "ER"
+ARRAY_ATTRIBUTES = AttributeList(
+    [
+        Attribute(name="array_indices_submitted"),
+        Attribute(name="array_indices_remaining"),
+        Attribute(name="array_state_count"),
+    ]
+)
+ARRAY_SUBJOB_ATTRIBUTES = AttributeList(
+    [*ARRAY_ATTRIBUTES, Attribute(name="job_state"), Attribute(name="array_index")]
+)
+# Subjob states that are neither still queued nor finished
+ACTIVE_SUBJOB_STATES = frozenset({"R", "E", "H", "S", "U", "W"})
 
 
 class JobObject:
@@ -111,9 +148,19 @@ class JobObject:
     object_model = Job
     attribute_model = JobAttribute
 
-    def __init__(self, connection_id: int, data: Job) -> None:
+    def __init__(
+        self,
+        connection_id: int,
+        data: Union[Job, LazyJob],
+        cache: Optional[StatCache] = None,
+    ) -> None:
         self.connection = connection_id
         self.data = data
+        self.cache = cache
+
+    def _invalidate(self, id: Optional[str] = None) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.object_type, id if id else self.data.id)
 
     def stat(
         self,
@@ -124,7 +171,7 @@ class JobObject:
         result = stat_job(
             self.connection,
             id=self.data.id,
-            attributes=JobAttribute.make_attrl(attributes) if attributes else None,
+            attributes=attributes if attributes else [],
             historical=historical,
             subjobs=subjobs,
         )
@@ -138,49 +185,74 @@ class JobObject:
         if result:
             self.data = result
 
+    def array_progress(
+        self, refresh: bool = False, indices: bool = False
+    ) -> ArrayProgress:
+        """Gets the progress of an array job
+
+        :param refresh: Stat the array instead of using the loaded data, defaults to False
+        :type refresh: bool, optional
+        :param indices: Also stat the subjobs, in the same call, so the finished indices
+            are known while others are still running, defaults to False
+        :type indices: bool, optional
+        :return: Array progress
+        :rtype: ArrayProgress
+        """
+        if not refresh and not indices:
+            return ArrayProgress.from_job(self.data)
+        result = stat_job(
+            self.connection,
+            id=self.data.id,
+            attributes=ARRAY_SUBJOB_ATTRIBUTES if indices else ARRAY_ATTRIBUTES,
+            historical=True,
+            subjobs=indices,
+        )
+        parent = [data for data in result if data.get("array_index") is None]
+        if not parent:
+            return ArrayProgress.from_job(self.data)
+        progress = ArrayProgress.from_job(Job.from_pbs(parent[0]))
+        if indices:
+            progress.active = RangeSet.from_indices(
+                int(data["array_index"])
+                for data in result
+                if data.get("array_index") is not None
+                and data.get("job_state") in ACTIVE_SUBJOB_STATES
+            )
+        return progress
+
     def logs(
         self,
-        spool_path="/var/spool/pbs/spool",
+        spool_path=DEFAULT_SPOOL_PATH,
         file: JobOutputFile = JobOutputFile.OUTPUT,
         yield_waiting: bool = False,
     ) -> Generator[str, Any, Any]:
-        with open(os.path.join(spool_path, f"{self.data.id}.{file.value}"), "r") as f:
-            while True:
-                if not os.path.exists(
-                    os.path.join(spool_path, f"{self.data.id}.{file.value}")
-                ):
-                    break
-                line = f.readline()
-                if not line:
-                    if yield_waiting:
-                        yield None
-                    time.sleep(0.1)
-                    continue
-                yield line
+        yield from follow_job(
+            self.data.id,
+            file,
+            spool_path,
+            timeout=0.1 if yield_waiting else None,
+            newlines=True,
+        )
 
     async def logs_async(
         self,
-        spool_path="/var/spool/pbs/spool",
+        spool_path=DEFAULT_SPOOL_PATH,
         file: JobOutputFile = JobOutputFile.OUTPUT,
         yield_waiting: bool = False,
     ) -> AsyncGenerator[str, Any]:
-        with open(os.path.join(spool_path, f"{self.data.id}.{file.value}"), "r") as f:
-            while True:
-                if not os.path.exists(
-                    os.path.join(spool_path, f"{self.data.id}.{file.value}")
-                ):
-                    break
-                line = f.readline()
-                if not line:
-                    if yield_waiting:
-                        yield None
-                    await asyncio.sleep(0.1)
-                    continue
-                yield line
+        async for line in follow_job_async(
+            self.data.id,
+            file,
+            spool_path,
+            timeout=0.1 if yield_waiting else None,
+            newlines=True,
+        ):
+            yield line
 
     def delete(self) -> None:
         result = delete_job(self.connection, self.data.id)
         if result == 0:
+            self._invalidate()
             return None
 
         raise PBSException(result, context=f"Failed to delete job {self.data.id}")
@@ -189,18 +261,16 @@ class JobObject:
         result = rerun_job(self.connection, self.data.id)
 
         if result == 0:
+            self._invalidate()
             self.reload()
             return None
 
         raise PBSException(result, context=f"Failed to rerun job {self.data.id}")
 
     def set(self, attributes: list[JobAttribute]):
-        result = alter_job(
-            self.connection,
-            self.data.id,
-            JobAttribute.make_attrl(attributes, with_op=True),
-        )
+        result = alter_job(self.connection, self.data.id, attributes)
         if result == 0:
+            self._invalidate()
             self.reload()
         else:
             raise PBSException(
@@ -211,6 +281,7 @@ class JobObject:
         result = hold_job(self.connection, self.data.id, hold_type=type)
 
         if result == 0:
+            self._invalidate()
             self.reload()
             return None
 
@@ -220,6 +291,7 @@ class JobObject:
         result = release_job(self.connection, self.data.id, hold_type=type)
 
         if result == 0:
+            self._invalidate()
             self.reload()
             return None
 
@@ -233,6 +305,8 @@ class JobObject:
 
         result = swap_jobs(self.connection, self.data.id, jid)
         if result == 0:
+            self._invalidate()
+            self._invalidate(jid)
             self.reload()
             return None
 
@@ -246,22 +320,72 @@ class JobOperator:
     object_model = Job
     object_factory = JobObject
 
-    def __init__(self, connection: int):
+    def __init__(
+        self,
+        connection: int,
+        cache: Optional[StatCache] = None,
+        resolver: Optional[IdResolver] = None,
+    ):
         self.connection = connection
+        self.cache = cache
+        self.resolver = resolver if resolver is not None else IdResolver()
+        self.fields: Optional[list[str]] = None
+
+    def with_fields(self, fields: Optional[list[str]]) -> "JobOperator":
+        """Returns a copy of this operator that only requests the given fields by default
+
+        :param fields: Job field names, or None for every attribute
+        :type fields: Optional[list[str]]
+        :return: Projected operator
+        :rtype: JobOperator
+        """
+        operator = copy.copy(self)
+        operator.fields = fields
+        return operator
+
+    def _attributes(self, fields: Optional[list[str]]) -> list[Attribute]:
+        return field_attributes(fields if fields else self.fields, self.object_type)
+
+    def _make_record(self, data: dict, record_type: RecordType = "model") -> Any:
+        if record_type == "lazy":
+            return LazyJob(data)
+        if record_type == "lite":
+            return LiteJob.from_pbs(data)
+        return self.object_model.from_pbs(data)
+
+    def _make_object(self, data: dict, record_type: RecordType = "model") -> JobObject:
+        return self.object_factory(
+            self.connection, self._make_record(data, record_type), self.cache
+        )
 
     def stat(
-        self, ids: list[str] = None, historical: bool = False, subjobs: bool = False
+        self,
+        ids: list[str] = None,
+        historical: bool = False,
+        subjobs: bool = False,
+        record_type: RecordType = "model",
+        fields: list[str] = None,
     ) -> list[JobObject]:
-        result = stat_job(
-            self.connection,
-            id=",".join(ids) if ids else None,
-            historical=historical,
-            subjobs=subjobs,
-        )
-        return [
-            self.object_factory(self.connection, self.object_model.from_pbs(i))
-            for i in result
-        ]
+        fields = fields if fields else self.fields
+        if self.cache is not None:
+            key = StatCache.key(
+                self.object_type, ids, fields, historical, subjobs, record_type
+            )
+            records = self.cache.get(key)
+        else:
+            records = None
+        if records is None:
+            result = stat_job(
+                self.connection,
+                id=",".join(ids) if ids else None,
+                attributes=self._attributes(fields),
+                historical=historical,
+                subjobs=subjobs,
+            )
+            records = [self._make_record(i, record_type) for i in result]
+            if self.cache is not None:
+                self.cache.put(key, records)
+        return [self.object_factory(self.connection, r, self.cache) for r in records]
 
     @property
     def all(self) -> list[JobObject]:
@@ -272,24 +396,30 @@ class JobOperator:
         return self.stat(historical=True, subjobs=True)
 
     def get(
-        self, id: str, historical: bool = False, subjob: bool = False
+        self,
+        id: str,
+        historical: bool = False,
+        subjob: bool = False,
+        record_type: RecordType = "model",
+        fields: list[str] = None,
     ) -> Union[JobObject, None]:
-        result = self.stat(ids=[id], historical=historical, subjobs=subjob)
-        if len(result) > 0:
-            return result[0]
-        else:
-            fallback = {
-                i["id"]: i
-                for i in stat_job(
-                    self.connection, historical=historical, subjobs=subjob
-                )
-            }
-            if id in fallback.keys():
-                return self.object_factory(
-                    self.connection, self.object_model.from_pbs(fallback[id])
-                )
-            else:
-                return None
+        options = (historical, subjob)
+        if self.resolver.is_missing(self.object_type, id, *options):
+            return None
+        result = self.stat(
+            ids=[self.resolver.target(self.object_type, id)],
+            historical=historical,
+            subjobs=subjob,
+            record_type=record_type,
+            fields=fields,
+        )
+        if len(result) == 0:
+            self.resolver.missing(self.object_type, id, *options)
+            return None
+        key = job_id_key(id)
+        job = next((j for j in result if job_id_key(j.data.id) == key), result[0])
+        self.resolver.found(self.object_type, id, job.data.id)
+        return job
 
     def __getitem__(self, key) -> Job:
         result = self.get(key, historical=True, subjob=True)
@@ -298,20 +428,411 @@ class JobOperator:
 
         return result
 
+    def iter_stat(
+        self,
+        ids: list[str],
+        historical: bool = False,
+        subjobs: bool = False,
+        record_type: RecordType = "model",
+        fields: list[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Generator[JobObject, Any, None]:
+        """Stats the given jobs in chunks, yielding each job as its chunk arrives
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param historical: Include finished jobs, defaults to False
+        :type historical: bool, optional
+        :param subjobs: Include array subjobs, defaults to False
+        :type subjobs: bool, optional
+        :param record_type: Record type to yield, defaults to "model"
+        :type record_type: RecordType, optional
+        :param fields: Job field names to request, defaults to None
+        :type fields: list[str], optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :yield: Jobs
+        :rtype: Generator[JobObject, Any, None]
+        """
+        for chunk in chunked(ids, chunk_size):
+            yield from self.stat(
+                ids=chunk,
+                historical=historical,
+                subjobs=subjobs,
+                record_type=record_type,
+                fields=fields,
+            )
+
+    def iter_select(
+        self,
+        criteria: list[JobAttribute] = None,
+        include_historical: bool = False,
+        include_subjobs: bool = False,
+        record_type: RecordType = "model",
+        fields: list[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Generator[JobObject, Any, None]:
+        """Selects jobs and stats them in chunks, yielding each job as its chunk arrives
+
+        Only the selected IDs and one chunk of results are held at a time, so memory
+        is bounded by ``chunk_size`` rather than by the size of the selection.
+
+        :param criteria: Selection criteria, defaults to None
+        :type criteria: list[JobAttribute], optional
+        :param include_historical: Include finished jobs, defaults to False
+        :type include_historical: bool, optional
+        :param include_subjobs: Include array subjobs, defaults to False
+        :type include_subjobs: bool, optional
+        :param record_type: Record type to yield, defaults to "model"
+        :type record_type: RecordType, optional
+        :param fields: Job field names to request, defaults to None
+        :type fields: list[str], optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :yield: Jobs
+        :rtype: Generator[JobObject, Any, None]
+        """
+        ids = select_jobs(
+            self.connection,
+            criteria,
+            historical=include_historical,
+            subjobs=include_subjobs,
+        )
+        yield from self.iter_stat(
+            ids,
+            historical=include_historical,
+            subjobs=include_subjobs,
+            record_type=record_type,
+            fields=fields,
+            chunk_size=chunk_size,
+        )
+
     def select(
         self,
         criteria: list[JobAttribute] = None,
         include_historical: bool = False,
         include_subjobs: bool = False,
+        record_type: RecordType = "model",
+        fields: list[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ) -> list[JobObject]:
+        return list(
+            self.iter_select(
+                criteria=criteria,
+                include_historical=include_historical,
+                include_subjobs=include_subjobs,
+                record_type=record_type,
+                fields=fields,
+                chunk_size=chunk_size,
+            )
+        )
+
+    def where(
+        self,
+        expression: Optional[Expression] = None,
+        include_historical: bool = False,
+        include_subjobs: bool = False,
+    ) -> JobQuery:
+        """Builds a query over job fields, pushing what it can down to ``pbs_selectjob``
+
+        >>> query = pbs.jobs.where((F.job_state == "Q") & (F["resource_list.ncpus"] >= 16))
+        >>> jobs = query.all()
+        >>> print(query.explain())
+
+        :param expression: Condition built from :data:`F`, or None for every job, defaults to None
+        :type expression: Optional[Expression], optional
+        :param include_historical: Include finished jobs, defaults to False
+        :type include_historical: bool, optional
+        :param include_subjobs: Include array subjobs, defaults to False
+        :type include_subjobs: bool, optional
+        :return: Query, run by iterating it or calling ``all``
+        :rtype: JobQuery
+        """
+        return JobQuery(self, expression, include_historical, include_subjobs)
+
+    def _iter_raw(
+        self,
+        fields: list[str],
+        criteria: Optional[list[JobAttribute]],
+        include_historical: bool,
+        include_subjobs: bool,
+        chunk_size: int,
+    ) -> Generator[dict, Any, None]:
+        attributes = field_attributes(fields, self.object_type)
+        if criteria is None:
+            yield from stat_job(
+                self.connection,
+                attributes=attributes,
+                historical=include_historical,
+                subjobs=include_subjobs,
+            )
+            return
         ids = select_jobs(
             self.connection,
             criteria,
             historical=include_historical,
             subjobs=include_subjobs,
         )
-        if len(ids) == 0:
-            return []
-        return self.stat(
-            ids=ids, historical=include_historical, subjobs=include_subjobs
+        for chunk in chunked(ids, chunk_size):
+            yield from stat_job(
+                self.connection,
+                id=",".join(chunk),
+                attributes=attributes,
+                historical=include_historical,
+                subjobs=include_subjobs,
+            )
+
+    def to_table(
+        self,
+        fields: list[str],
+        criteria: list[JobAttribute] = None,
+        include_historical: bool = False,
+        include_subjobs: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> JobTable:
+        """Stats jobs straight into a columnar :class:`JobTable`, without building models
+
+        Without criteria this is a single projected stat of every job; with criteria
+        the selected jobs are statted in chunks and appended to the columns as each
+        chunk arrives.
+
+        :param fields: Job field names to fetch; dotted names select one resource
+        :type fields: list[str]
+        :param criteria: Selection criteria, or None for every job, defaults to None
+        :type criteria: list[JobAttribute], optional
+        :param include_historical: Include finished jobs, defaults to False
+        :type include_historical: bool, optional
+        :param include_subjobs: Include array subjobs, defaults to False
+        :type include_subjobs: bool, optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :return: Table with one row per job
+        :rtype: JobTable
+        """
+        return JobTable.from_stat(
+            self._iter_raw(
+                fields, criteria, include_historical, include_subjobs, chunk_size
+            ),
+            fields,
+        )
+
+    def watch(
+        self,
+        criteria: list[JobAttribute] = None,
+        fields: list[str] = None,
+        include_subjobs: bool = False,
+        include_existing: bool = False,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ) -> Generator[JobEvent, Any, None]:
+        """Watches a set of jobs with one poller, yielding typed events as they happen
+
+        Yields :class:`JobSubmitted`, :class:`JobStateChanged`,
+        :class:`JobResourcesUpdated` and :class:`JobFinished` events, diffed from
+        projected snapshots taken at an adaptive interval, see :class:`JobWatcher`.
+
+        :param criteria: Selection criteria, or None for every job, defaults to None
+        :type criteria: list[JobAttribute], optional
+        :param fields: Extra job fields to fetch into the event models, defaults to None
+        :type fields: list[str], optional
+        :param include_subjobs: Watch array subjobs as well, defaults to False
+        :type include_subjobs: bool, optional
+        :param include_existing: Report unfinished jobs that already exist as submitted, defaults to False
+        :type include_existing: bool, optional
+        :param min_interval: Shortest poll interval in seconds, defaults to 1.0
+        :type min_interval: float, optional
+        :param max_interval: Longest poll interval in seconds, defaults to 30.0
+        :type max_interval: float, optional
+        :param timeout: Stop after this many seconds, or None to watch forever, defaults to None
+        :type timeout: Optional[float], optional
+        :yield: Events
+        :rtype: Generator[JobEvent, Any, None]
+        """
+        yield from JobWatcher(
+            self,
+            criteria=criteria,
+            fields=fields if fields else self.fields,
+            include_subjobs=include_subjobs,
+            include_existing=include_existing,
+            min_interval=min_interval,
+            max_interval=max_interval,
+        ).watch(timeout)
+
+    def _wait_stat(self, waiter: JobWaiter) -> tuple[list[dict], set[str]]:
+        results, unknown = stat_history(
+            self.connection,
+            list(waiter.pending.values()),
+            waiter.attributes,
+            chunk_size=waiter.chunk_size,
         )
+        errno = get_errno()
+        if not results and not unknown and errno in CONNECTION_ERRORS:
+            raise PBSException(errno, context="Waiting for jobs")
+        return results, unknown
+
+    def wait_for(
+        self,
+        ids: list[str],
+        timeout: Optional[float] = None,
+        return_when: WaitCondition = WaitCondition.ALL,
+        fields: list[str] = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> WaitResult:
+        """Waits until the given jobs finish, polling all of them with one projected stat per cycle
+
+        Returns when every job has finished (``ALL``), when the first one has
+        (``FIRST``), when one has finished with a non-zero exit status
+        (``ANY_FAILED``), or when ``timeout`` expires. See :class:`JobWaiter`.
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param timeout: Maximum seconds to wait, or None to wait indefinitely, defaults to None
+        :type timeout: Optional[float], optional
+        :param return_when: When to return, defaults to WaitCondition.ALL
+        :type return_when: WaitCondition, optional
+        :param fields: Extra job fields to fetch into the results, defaults to None
+        :type fields: list[str], optional
+        :param interval: Initial seconds between cycles, defaults to 1.0
+        :type interval: float, optional
+        :param max_interval: Longest seconds between cycles, defaults to 30.0
+        :type max_interval: float, optional
+        :raises PBSException: If the connection fails while waiting
+        :return: Finished jobs with their exit status, and the IDs still pending
+        :rtype: WaitResult
+        """
+        waiter = JobWaiter(ids, return_when, fields, interval, max_interval)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not waiter.update(*self._wait_stat(waiter)):
+            delay = waiter.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    break
+            time.sleep(delay)
+        return waiter.result
+
+    async def wait_for_async(
+        self,
+        ids: list[str],
+        timeout: Optional[float] = None,
+        return_when: WaitCondition = WaitCondition.ALL,
+        fields: list[str] = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+    ) -> WaitResult:
+        """Awaitable :meth:`wait_for`, running each stat on the loop's default executor
+
+        :return: Finished jobs with their exit status, and the IDs still pending
+        :rtype: WaitResult
+        """
+        loop = asyncio.get_running_loop()
+        waiter = JobWaiter(ids, return_when, fields, interval, max_interval)
+        deadline = None if timeout is None else loop.time() + timeout
+        while not waiter.update(
+            *await loop.run_in_executor(None, self._wait_stat, waiter)
+        ):
+            delay = waiter.interval
+            if deadline is not None:
+                delay = min(delay, deadline - loop.time())
+                if delay <= 0:
+                    break
+            await asyncio.sleep(delay)
+        return waiter.result
+
+    def _bulk(
+        self, ids: list[str], call: Callable[[Connection, str], int], workers: int
+    ) -> dict[str, int]:
+        if isinstance(self.connection, ConnectionPool) and workers > 1 and len(ids) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(workers, self.connection.max_size),
+                thread_name_prefix="python-pbs-bulk",
+            ) as executor:
+                codes = list(executor.map(lambda id: call(self.connection, id), ids))
+        else:
+            codes = [call(self.connection, id) for id in ids]
+
+        if self.cache is not None and 0 in codes:
+            self.cache.invalidate(self.object_type)
+        return dict(zip(ids, codes))
+
+    def bulk_delete(self, ids: list[str], workers: int = 8) -> dict[str, int]:
+        """Deletes many jobs, without reloading any of them
+
+        Requests are spread over up to ``workers`` threads when the operator uses a
+        :class:`ConnectionPool`, and are sent one after another over a single
+        connection otherwise. Failures do not stop the remaining jobs.
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param workers: Maximum concurrent requests, defaults to 8
+        :type workers: int, optional
+        :return: Result code of each job, 0 on success
+        :rtype: dict[str, int]
+        """
+        return self._bulk(ids, delete_job, workers)
+
+    def bulk_hold(
+        self, ids: list[str], type: Literal["u", "o", "s"] = "u", workers: int = 8
+    ) -> dict[str, int]:
+        """Holds many jobs, see :meth:`bulk_delete`
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param type: Hold type, defaults to "u"
+        :type type: Literal["u", "o", "s"], optional
+        :param workers: Maximum concurrent requests, defaults to 8
+        :type workers: int, optional
+        :return: Result code of each job, 0 on success
+        :rtype: dict[str, int]
+        """
+        return self._bulk(
+            ids, lambda con, id: hold_job(con, id, hold_type=type), workers
+        )
+
+    def bulk_release(
+        self, ids: list[str], type: Literal["u", "o", "s"] = "u", workers: int = 8
+    ) -> dict[str, int]:
+        """Releases holds on many jobs, see :meth:`bulk_delete`
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param type: Hold type, defaults to "u"
+        :type type: Literal["u", "o", "s"], optional
+        :param workers: Maximum concurrent requests, defaults to 8
+        :type workers: int, optional
+        :return: Result code of each job, 0 on success
+        :rtype: dict[str, int]
+        """
+        return self._bulk(
+            ids, lambda con, id: release_job(con, id, hold_type=type), workers
+        )
+
+    def bulk_signal(
+        self, ids: list[str], signal: str, workers: int = 8
+    ) -> dict[str, int]:
+        """Sends a signal to many jobs, see :meth:`bulk_delete`
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param signal: Signal name, e.g. "SIGTERM", "suspend" or "resume"
+        :type signal: str
+        :param workers: Maximum concurrent requests, defaults to 8
+        :type workers: int, optional
+        :return: Result code of each job, 0 on success
+        :rtype: dict[str, int]
+        """
+        return self._bulk(ids, lambda con, id: signal_job(con, id, signal), workers)
+
+    def bulk_rerun(self, ids: list[str], workers: int = 8) -> dict[str, int]:
+        """Requeues many running jobs, see :meth:`bulk_delete`
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param workers: Maximum concurrent requests, defaults to 8
+        :type workers: int, optional
+        :return: Result code of each job, 0 on success
+        :rtype: dict[str, int]
+        """
+        return self._bulk(ids, rerun_job, workers)
@@ -18,13 +18,14 @@ class NodeOperator(BaseObjectManager):
     object_type = "node"
     object_model = Node
     object_factory = NodeObject
+    lite_model = LiteNode
 
     @property
     def all(self) -> list[NodeObject]:
         return super().all
 
-    def get(self, id: str) -> NodeObject | None:
-        return super().get(id)
+    def get(self, id: str, fields: list[str] = None) -> NodeObject | None:
+        return super().get(id, fields=fields)
 
     def __getitem__(self, key) -> NodeObject:
         return super().__getitem__(key)
@@ -0,0 +1,552 @@
+import operator
+import re
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Generator, Iterable, Optional
+
+from ...util import Attribute, BatchOperation, select_jobs, stat_job
+from ..models import Job, JobState, LazyJob, RecordType
+from .base import DEFAULT_CHUNK_SIZE, chunked, field_attributes
+
+if TYPE_CHECKING:
+    from .job import JobObject, JobOperator
+
+_OPERATORS: dict[str, tuple[Callable[[Any, Any], bool], BatchOperation]] = {
+    "==": (operator.eq, BatchOperation.EQ),
+    "!=": (operator.ne, BatchOperation.NE),
+    ">=": (operator.ge, BatchOperation.GE),
+    ">": (operator.gt, BatchOperation.GT),
+    "<=": (operator.le, BatchOperation.LE),
+    "<": (operator.lt, BatchOperation.LT),
+}
+_ALL_STATES = frozenset(state.value for state in JobState)
+
+# Attributes pbs_selectjob can filter on, and the operators it accepts for each
+PUSHDOWN_RELATIONAL = frozenset(
+    {"ctime", "etime", "execution_time", "mtime", "priority", "qtime", "stime"}
+)
+PUSHDOWN_EQUALITY = frozenset(
+    {
+        "account_name",
+        "array",
+        "checkpoint",
+        "hold_types",
+        "job_name",
+        "job_owner",
+        "project",
+        "queue",
+        "rerunable",
+    }
+)
+PUSHDOWN_GROUPS = frozenset({"resource_list"})
+
+
+def _server_value(value: Any) -> str:
+    if isinstance(value, datetime):
+        return str(int(value.timestamp()))
+    if isinstance(value, Enum):
+        return str(value.value)
+    return str(value)
+
+
+def _client_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+class Expression:
+    """Boolean condition over job fields, combined with ``&``, ``|`` and ``~``"""
+
+    def __and__(self, other: "Expression") -> "Expression":
+        return And(self, other)
+
+    def __or__(self, other: "Expression") -> "Expression":
+        return Or(self, other)
+
+    def __invert__(self) -> "Expression":
+        return Not(self)
+
+    def fields(self) -> set[str]:
+        """Gets the field names the expression reads"""
+        raise NotImplementedError
+
+    def evaluate(self, record: Any) -> bool:
+        """Evaluates the expression against a job record
+
+        :param record: Job or LazyJob
+        :type record: Any
+        :return: Whether the record matches
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+
+class Field:
+    def __init__(self, name: str) -> None:
+        """Reference to a job field, or to one resource with a dotted name like ``resource_list.ncpus``
+
+        Comparing a field builds a :class:`Comparison`.
+
+        :param name: Field name
+        :type name: str
+        :raises ValueError: If the name is not a job field or resource
+        """
+        group, _, resource = name.lower().partition(".")
+        if group not in Job.model_fields or (
+            resource and group not in LazyJob.plan.groups
+        ):
+            raise ValueError(f"Unknown job field {name!r}")
+        self.name = f"{group}.{resource}" if resource else group
+        self.group = group
+        self.resource = name.partition(".")[2] or None
+
+    def literal(self, value: Any) -> Any:
+        """Converts a literal to the type the field's values have on a record
+
+        Resource literals are decoded like the records' resources, so ``"10gb"``
+        compares as bytes and ``"01:00:00"`` as seconds.
+
+        :param value: Literal
+        :type value: Any
+        :return: Converted literal
+        :rtype: Any
+        """
+        if self.resource is not None and type(value) is str:
+            return LazyJob.plan.codec.decode(self.resource, value)
+        return _client_value(value)
+
+    def get(self, record: Any) -> Any:
+        value = getattr(record, self.group)
+        if self.resource is not None:
+            value = value.get(self.resource) if value else None
+        return _client_value(value)
+
+    def _compare(self, op: str, value: Any) -> "Comparison":
+        return Comparison(self, op, value)
+
+    def __eq__(self, value: Any) -> "Comparison":
+        return self._compare("==", value)
+
+    def __ne__(self, value: Any) -> "Comparison":
+        return self._compare("!=", value)
+
+    def __ge__(self, value: Any) -> "Comparison":
+        return self._compare(">=", value)
+
+    def __gt__(self, value: Any) -> "Comparison":
+        return self._compare(">", value)
+
+    def __le__(self, value: Any) -> "Comparison":
+        return self._compare("<=", value)
+
+    def __lt__(self, value: Any) -> "Comparison":
+        return self._compare("<", value)
+
+    __hash__ = None
+
+    def isin(self, values: Iterable[Any]) -> "Membership":
+        return Membership(self, values)
+
+    def startswith(self, prefix: str) -> "Match":
+        return Match(self, "startswith", re.compile(re.escape(prefix)))
+
+    def contains(self, text: str) -> "Match":
+        return Match(self, "contains", re.compile(re.escape(text)), search=True)
+
+    def matches(self, pattern: str) -> "Match":
+        return Match(self, "matches", re.compile(pattern), search=True)
+
+    def __repr__(self) -> str:
+        return f"Field({self.name!r})"
+
+
+class _Fields:
+    def __getattr__(self, name: str) -> Field:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Field(name)
+
+    def __getitem__(self, name: str) -> Field:
+        return Field(name)
+
+
+F = _Fields()
+"""Shorthand for :class:`Field`: ``F.queue``, ``F["resource_list.ncpus"]``"""
+
+
+class Comparison(Expression):
+    def __init__(self, field: Field, op: str, value: Any) -> None:
+        self.field = field
+        self.op = op
+        self.value = value
+        self.expected = field.literal(value)
+
+    def fields(self) -> set[str]:
+        return {self.field.name}
+
+    def evaluate(self, record: Any) -> bool:
+        actual = self.field.get(record)
+        if actual is None:
+            return self.op == "!="
+        try:
+            return _OPERATORS[self.op][0](actual, self.expected)
+        except TypeError:
+            raise TypeError(
+                f"Cannot compare {self.field.name} value {actual!r} with {self.value!r}"
+            ) from None
+
+    def __str__(self) -> str:
+        return f"{self.field.name} {self.op} {self.value!r}"
+
+
+class Membership(Expression):
+    def __init__(self, field: Field, values: Iterable[Any]) -> None:
+        self.field = field
+        self.values = [field.literal(v) for v in values]
+
+    def fields(self) -> set[str]:
+        return {self.field.name}
+
+    def evaluate(self, record: Any) -> bool:
+        return self.field.get(record) in self.values
+
+    def __str__(self) -> str:
+        return f"{self.field.name} in {self.values!r}"
+
+
+class Match(Expression):
+    def __init__(
+        self, field: Field, kind: str, pattern: re.Pattern, search: bool = False
+    ) -> None:
+        self.field = field
+        self.kind = kind
+        self.pattern = pattern
+        self.search = search
+
+    def fields(self) -> set[str]:
+        return {self.field.name}
+
+    def evaluate(self, record: Any) -> bool:
+        value = self.field.get(record)
+        if value is None:
+            return False
+        find = self.pattern.search if self.search else self.pattern.match
+        return find(str(value)) is not None
+
+    def __str__(self) -> str:
+        return f"{self.field.name} {self.kind} {self.pattern.pattern!r}"
+
+
+class And(Expression):
+    def __init__(self, *parts: Expression) -> None:
+        self.parts = [
+            p
+            for part in parts
+            for p in (part.parts if isinstance(part, And) else [part])
+        ]
+
+    def fields(self) -> set[str]:
+        return set().union(*(part.fields() for part in self.parts))
+
+    def evaluate(self, record: Any) -> bool:
+        return all(part.evaluate(record) for part in self.parts)
+
+    def __str__(self) -> str:
+        return "(" + " & ".join(map(str, self.parts)) + ")"
+
+
+class Or(Expression):
+    def __init__(self, *parts: Expression) -> None:
+        self.parts = [
+            p
+            for part in parts
+            for p in (part.parts if isinstance(part, Or) else [part])
+        ]
+
+    def fields(self) -> set[str]:
+        return set().union(*(part.fields() for part in self.parts))
+
+    def evaluate(self, record: Any) -> bool:
+        return any(part.evaluate(record) for part in self.parts)
+
+    def __str__(self) -> str:
+        return "(" + " | ".join(map(str, self.parts)) + ")"
+
+
+class Not(Expression):
+    def __init__(self, part: Expression) -> None:
+        self.part = part
+
+    def fields(self) -> set[str]:
+        return self.part.fields()
+
+    def evaluate(self, record: Any) -> bool:
+        return not self.part.evaluate(record)
+
+    def __str__(self) -> str:
+        return f"~{self.part}"
+
+
+def _states(expression: Expression) -> Optional[frozenset[str]]:
+    """Gets the job states an expression on ``job_state`` alone accepts, or None if it reads anything else"""
+    if isinstance(expression, (Comparison, Membership)):
+        if expression.field.name != "job_state":
+            return None
+        if isinstance(expression, Membership):
+            return frozenset(map(str, expression.values)) & _ALL_STATES
+        value = str(_client_value(expression.value))
+        if expression.op == "==":
+            return frozenset({value}) & _ALL_STATES
+        if expression.op == "!=":
+            return _ALL_STATES - {value}
+        return None
+    if isinstance(expression, (And, Or)):
+        states = [_states(part) for part in expression.parts]
+        if any(s is None for s in states):
+            return None
+        combine = (
+            frozenset.intersection if isinstance(expression, And) else frozenset.union
+        )
+        return combine(*states)
+    if isinstance(expression, Not):
+        states = _states(expression.part)
+        return None if states is None else _ALL_STATES - states
+    return None
+
+
+def _pushdown(expression: Expression) -> Optional[Attribute]:
+    if not isinstance(expression, Comparison):
+        return None
+    field, op = expression.field, expression.op
+    if field.resource is not None:
+        pushable = field.group in PUSHDOWN_GROUPS
+    elif field.name in PUSHDOWN_RELATIONAL:
+        pushable = True
+    else:
+        pushable = field.name in PUSHDOWN_EQUALITY and op in ("==", "!=")
+    if not pushable:
+        return None
+    value = expression.value
+    if field.resource is not None:
+        value = LazyJob.plan.codec.encode(field.resource, expression.expected)
+    return Attribute(
+        name=field.group,
+        resource=field.resource,
+        value=_server_value(value),
+        operation=_OPERATORS[op][1],
+    )
+
+
+class QueryPlan:
+    def __init__(self, expression: Optional[Expression]) -> None:
+        """Splits an expression into ``pbs_selectjob`` criteria and a client-side remainder
+
+        The expression's top-level ``&`` terms are considered one at a time. Terms
+        that only constrain ``job_state`` (including ``|``, ``~`` and ``isin`` over
+        states) are merged into a single state criterion. Comparisons on resources,
+        on time and priority attributes, and equality tests on names, owners,
+        queues and similar attributes become server criteria. Everything else is
+        evaluated client-side over records projected to the fields it reads.
+
+        :param expression: Condition, or None for every job
+        :type expression: Optional[Expression]
+        """
+        self.expression = expression
+        self.criteria: list[Attribute] = []
+        self.pushed: list[Expression] = []
+        self.residual: list[Expression] = []
+        self.states: Optional[frozenset[str]] = None
+
+        parts = (
+            []
+            if expression is None
+            else expression.parts if isinstance(expression, And) else [expression]
+        )
+        for part in parts:
+            states = _states(part)
+            if states is not None:
+                self.states = states if self.states is None else self.states & states
+                self.pushed.append(part)
+                continue
+            attribute = _pushdown(part)
+            if attribute is None:
+                self.residual.append(part)
+            else:
+                self.criteria.append(attribute)
+                self.pushed.append(part)
+        if self.states:
+            self.criteria.insert(
+                0,
+                Attribute(
+                    name="job_state",
+                    value="".join(sorted(self.states)),
+                    operation=BatchOperation.EQ,
+                ),
+            )
+
+    @property
+    def empty(self) -> bool:
+        """Whether the job state terms can never match, so nothing needs to be asked"""
+        return self.states is not None and not self.states
+
+    @property
+    def server_side(self) -> bool:
+        return bool(self.criteria)
+
+    def fields(self) -> set[str]:
+        """Gets the fields the client-side terms read"""
+        return set().union(*(part.fields() for part in self.residual))
+
+    def matches(self, record: Any) -> bool:
+        return all(part.evaluate(record) for part in self.residual)
+
+    def explain(self) -> str:
+        """Describes where each part of the expression is evaluated
+
+        :return: Readable plan
+        :rtype: str
+        """
+        lines = ["server (pbs_selectjob):"]
+        if self.empty:
+            lines.append("  nothing: the job_state terms exclude every state")
+        for attribute in self.criteria:
+            name = (
+                f"{attribute.name}.{attribute.resource}"
+                if attribute.resource
+                else attribute.name
+            )
+            lines.append(f"  {name} {attribute.operation.name} {attribute.value!r}")
+        if not self.criteria and not self.empty:
+            lines.append("  every job (single pbs_statjob)")
+        lines.append("client:")
+        for part in self.residual:
+            lines.append(f"  {part}")
+        if not self.residual:
+            lines.append("  nothing")
+        else:
+            lines.append(f"  reading {', '.join(sorted(self.fields()))}")
+        return "\n".join(lines)
+
+
+class JobQuery:
+    def __init__(
+        self,
+        operator: "JobOperator",
+        expression: Optional[Expression] = None,
+        include_historical: bool = False,
+        include_subjobs: bool = False,
+    ) -> None:
+        """Jobs matching an expression, fetched with as much filtering on the server as possible
+
+        See :class:`QueryPlan` for how the expression is split. After running,
+        :meth:`explain` also reports how many jobs each side let through.
+
+        :param operator: Job operator supplying the connection
+        :type operator: JobOperator
+        :param expression: Condition, or None for every job, defaults to None
+        :type expression: Optional[Expression], optional
+        :param include_historical: Include finished jobs, defaults to False
+        :type include_historical: bool, optional
+        :param include_subjobs: Include array subjobs, defaults to False
+        :type include_subjobs: bool, optional
+        """
+        self.operator = operator
+        self.plan = QueryPlan(expression)
+        self.include_historical = include_historical
+        self.include_subjobs = include_subjobs
+        self.selected: Optional[int] = None
+        self.matched: Optional[int] = None
+
+    def _attributes(self, fields: Optional[list[str]]) -> list[Attribute]:
+        fields = fields if fields else self.operator.fields
+        if not fields:
+            return []
+        return field_attributes(
+            list(dict.fromkeys(list(fields) + sorted(self.plan.fields()))), "job"
+        )
+
+    def _raw(
+        self, attributes: list[Attribute], chunk_size: int
+    ) -> Generator[dict, Any, None]:
+        if self.plan.empty:
+            return
+        if not self.plan.server_side:
+            yield from stat_job(
+                self.operator.connection,
+                attributes=attributes,
+                historical=self.include_historical,
+                subjobs=self.include_subjobs,
+            )
+            return
+        ids = select_jobs(
+            self.operator.connection,
+            self.plan.criteria,
+            historical=self.include_historical,
+            subjobs=self.include_subjobs,
+        )
+        for chunk in chunked(ids, chunk_size):
+            yield from stat_job(
+                self.operator.connection,
+                id=",".join(chunk),
+                attributes=attributes,
+                historical=self.include_historical,
+                subjobs=self.include_subjobs,
+            )
+
+    def iter(
+        self,
+        fields: Optional[list[str]] = None,
+        record_type: RecordType = "model",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Generator["JobObject", Any, None]:
+        """Runs the query, yielding matching jobs as their stat chunk arrives
+
+        :param fields: Job field names to request, defaults to the operator's fields
+        :type fields: Optional[list[str]], optional
+        :param record_type: Record type to yield, defaults to "model"
+        :type record_type: RecordType, optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        :yield: Matching jobs
+        :rtype: Generator[JobObject, Any, None]
+        """
+        self.selected = self.matched = 0
+        for data in self._raw(self._attributes(fields), chunk_size):
+            self.selected += 1
+            record = LazyJob(data)
+            if not self.plan.matches(record):
+                continue
+            self.matched += 1
+            if record_type != "lazy":
+                record = self.operator._make_record(data, record_type)
+            yield self.operator.object_factory(
+                self.operator.connection, record, self.operator.cache
+            )
+
+    def all(
+        self,
+        fields: Optional[list[str]] = None,
+        record_type: RecordType = "model",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> list["JobObject"]:
+        return list(self.iter(fields, record_type, chunk_size))
+
+    def __iter__(self) -> Generator["JobObject", Any, None]:
+        return self.iter()
+
+    def explain(self) -> str:
+        """Describes where each part of the query runs, with row counts once it has run
+
+        :return: Readable plan
+        :rtype: str
+        """
+        text = self.plan.explain()
+        if self.selected is not None:
+            text += (
+                f"\nlast run: server returned {self.selected} jobs,"
+                f" client kept {self.matched}"
+            )
+        return text
@@ -1,10 +1,19 @@
 from enum import Enum
+from itertools import chain
 from typing import Union
 
 from ...util.typed_wrapper import BatchOperation
-from .base import BaseAttributeModel, BaseObject, BaseObjectManager, AlterableObject
+from .base import (
+    DEFAULT_CHUNK_SIZE,
+    BaseAttributeModel,
+    BaseObject,
+    BaseObjectManager,
+    AlterableObject,
+    chunked,
+)
 from ..models import *
 from python_pbs.util import select_jobs, Attribute, stat_job
+from ..quota import queue_available
 
 
 class QueueObject(AlterableObject):
@@ -24,59 +33,55 @@ class QueueObject(AlterableObject):
         return user in self.data.acl_users.split(",")
 
     def available(self, user: str) -> int:
-        if not self.can_access(user):
-            return 0
+        """Computes how many CPUs a user may still request in this queue
 
-        if not self.data.resources_available.get("ncpus"):
-            return None
+        Only the user's jobs in the queue are selected, by ``euser`` since the server
+        compares ``job_owner`` against ``user@host``, and only their CPU usage is
+        requested. Use :class:`QuotaIndex` to answer for many users and queues.
 
-        ids = select_jobs(
-            self.connection, [Attribute(name="queue", value=self.data.id)]
-        )
-        jobs = [
-            Job.from_pbs(i)
-            for i in stat_job(self.connection, id=",".join(ids))
-            if i.get("Job_Owner", "").startswith(user + "@")
-        ]
+        :param user: User name
+        :type user: str
+        :return: Available CPUs, 0 without access, or None if the queue has no CPU limit
+        :rtype: int
+        """
+        if not self.can_access(user) or not self.data.resources_available.get("ncpus"):
+            return queue_available(self.data, user, 0)
 
-        cpu_usage = sum(
+        ids = select_jobs(
+            self.connection,
             [
-                i.resources_used.get("ncpus", None) if i.resources_used else None
-                for i in jobs
-            ]
+                Attribute(name="queue", value=self.data.id),
+                Attribute(name="euser", value=user),
+            ],
         )
-
-        queue_max = self.data.resources_available.get("ncpus")
-        queue_assigned = self.data.resources_assigned.get("ncpus", 0)
-        queue_availability = max(0, queue_max - queue_assigned)
-        max_user_cpus = self.data.max_user_res.get("ncpus", queue_availability)
-        user_available = max_user_cpus - cpu_usage
-
-        if user_available > queue_availability:
-            avaliable = queue_availability
-        else:
-            available = user_available
-
-        if available > max_user_cpus:
-            avaliable = max_user_cpus
-
-        if available > 0 and self.data.default_chunk.get("ncpus"):
-            available -= available % self.data.default_chunk.get("ncpus")
-
-        return max(0, available)
+        used = sum(
+            int(i.get("resources_used.ncpus", 0))
+            for i in chain.from_iterable(
+                stat_job(
+                    self.connection,
+                    id=",".join(chunk),
+                    attributes=[
+                        Attribute(name="resources_used", resource="ncpus"),
+                    ],
+                )
+                for chunk in chunked(ids, DEFAULT_CHUNK_SIZE)
+            )
+        )
+        return queue_available(self.data, user, used)
 
 
 class QueueOperator(BaseObjectManager):
     object_type = "queue"
     object_model = Queue
     object_factory = QueueObject
+    lite_model = LiteQueue
 
     @property
     def all(self) -> list[QueueObject]:
         return super().all
 
-    def get(self, id: str) -> QueueObject | None:
-        return super().get(id)
+    def get(self, id: str, fields: list[str] = None) -> QueueObject | None:
+        return super().get(id, fields=fields)
 
     def __getitem__(self, key) -> QueueObject:
         return super().__getitem__(key)
@@ -23,8 +23,8 @@ class SchedulerOperator(BaseObjectManager):
     def all(self) -> list[SchedulerObject]:
         return super().all
 
-    def get(self, id: str) -> SchedulerObject | None:
-        return super().get(id)
+    def get(self, id: str, fields: list[str] = None) -> SchedulerObject | None:
+        return super().get(id, fields=fields)
 
     def __getitem__(self, key) -> SchedulerObject:
         return super().__getitem__(key)
@@ -23,8 +23,8 @@ class ServerOperator(BaseObjectManager):
     def all(self) -> list[ServerObject]:
         return super().all
 
-    def get(self, id: str) -> ServerObject | None:
-        return super().get(id)
+    def get(self, id: str, fields: list[str] = None) -> ServerObject | None:
+        return super().get(id, fields=fields)
 
     def __getitem__(self, key) -> ServerObject:
         return super().__getitem__(key)
@@ -0,0 +1,395 @@
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Generator, Iterable, Optional
+
+from pydantic import BaseModel
+
+from ...util import Attribute, Connection, get_errno, select_jobs, stat_job
+from ..models import Job, JobState
+from .base import DEFAULT_CHUNK_SIZE, chunked, field_attributes
+from .ids import job_id_key
+
+if TYPE_CHECKING:
+    from .job import JobAttribute, JobOperator
+
+WATCH_FIELDS = ["job_state", "exit_status", "resources_used"]
+WAIT_FIELDS = ["job_state", "exit_status"]
+FINISHED_STATES = frozenset({"F", "X"})
+# pbs_errno of a stat naming a job the server does not know, history included
+PBSE_UNKJOBID = 15001
+_RESOURCES_USED = "resources_used."
+
+
+class JobEvent(BaseModel):
+    id: str
+    job: Job
+
+
+class JobSubmitted(JobEvent):
+    pass
+
+
+class JobStateChanged(JobEvent):
+    previous: Optional[JobState] = None
+    state: Optional[JobState] = None
+
+
+class JobResourcesUpdated(JobEvent):
+    resources_used: dict = {}
+
+
+class JobFinished(JobEvent):
+    exit_status: Optional[int] = None
+
+
+class WaitCondition(Enum):
+    ALL = "all"
+    FIRST = "first"
+    ANY_FAILED = "any_failed"
+
+
+class WaitResult(BaseModel):
+    done: dict[str, Job] = {}
+    pending: list[str] = []
+
+    @property
+    def failed(self) -> dict[str, Job]:
+        return {
+            id: job
+            for id, job in self.done.items()
+            if job.exit_status is not None and job.exit_status != 0
+        }
+
+
+def _resources_used(data: dict[str, str]) -> dict[str, str]:
+    return {k: v for k, v in data.items() if k.startswith(_RESOURCES_USED)}
+
+
+def stat_history(
+    connection: Connection,
+    ids: list[str],
+    attributes: list[Attribute],
+    subjobs: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[list[dict[str, str]], set[str]]:
+    """Stats jobs by ID, history included, telling unknown jobs apart from failed stats
+
+    A multi-ID ``pbs_statjob`` fails as a whole when one of the IDs is unknown, so
+    IDs missing from a chunk's results are stat'ed again one at a time. Only IDs
+    whose own stat fails with ``PBSE_UNKJOBID`` are reported unknown; IDs whose
+    stat failed for any other reason are in neither result.
+
+    :param connection: Connection ID or pool
+    :type connection: Connection
+    :param ids: Job IDs
+    :type ids: list[str]
+    :param attributes: Attributes to request
+    :type attributes: list[Attribute]
+    :param subjobs: Include array subjobs, defaults to False
+    :type subjobs: bool, optional
+    :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+    :type chunk_size: int, optional
+    :return: Raw stat dictionaries, and the IDs the server does not know
+    :rtype: tuple[list[dict[str, str]], set[str]]
+    """
+    results: list[dict[str, str]] = []
+    unknown: set[str] = set()
+    for chunk in chunked(ids, chunk_size):
+        found = stat_job(
+            connection,
+            id=",".join(chunk),
+            attributes=attributes,
+            historical=True,
+            subjobs=subjobs,
+        )
+        results.extend(found)
+        seen = {job_id_key(data["id"]) for data in found}
+        for id in chunk:
+            if job_id_key(id) in seen:
+                continue
+            if len(chunk) > 1:
+                found = stat_job(
+                    connection,
+                    id=id,
+                    attributes=attributes,
+                    historical=True,
+                    subjobs=subjobs,
+                )
+                if found:
+                    results.extend(found)
+                    continue
+            if get_errno() == PBSE_UNKJOBID:
+                unknown.add(id)
+    return results, unknown
+
+
+class JobWatcher:
+    def __init__(
+        self,
+        operator: "JobOperator",
+        criteria: Optional[list["JobAttribute"]] = None,
+        fields: Optional[list[str]] = None,
+        include_subjobs: bool = False,
+        include_existing: bool = False,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Turns successive projected snapshots of a set of jobs into events
+
+        Each :meth:`poll` takes one snapshot of the jobs that have not finished: a
+        single stat of every job when there are no criteria, or a select followed by
+        chunked stats of the selected jobs. History is only fetched for the jobs of
+        the previous snapshot that left it, to report how they finished; jobs the
+        server no longer knows at all are reported finished without an exit status,
+        and jobs whose stat failed are kept until a later poll. Snapshots are kept
+        as the raw stat dictionaries and compared to the previous one in a single
+        pass; only jobs that changed are parsed into models.
+
+        The first poll is a baseline: it emits no events unless ``include_existing``
+        is set, and then only for jobs that have not finished.
+
+        :attr:`interval` halves after a poll that produced events and grows by half
+        after one that did not, between ``min_interval`` and ``max_interval``.
+
+        :param operator: Job operator supplying the connection
+        :type operator: JobOperator
+        :param criteria: Selection criteria, or None for every job, defaults to None
+        :type criteria: Optional[list[JobAttribute]], optional
+        :param fields: Extra job fields to fetch into the event models, defaults to None
+        :type fields: Optional[list[str]], optional
+        :param include_subjobs: Watch array subjobs as well, defaults to False
+        :type include_subjobs: bool, optional
+        :param include_existing: Report jobs present in the first snapshot as submitted, defaults to False
+        :type include_existing: bool, optional
+        :param min_interval: Shortest poll interval in seconds, defaults to 1.0
+        :type min_interval: float, optional
+        :param max_interval: Longest poll interval in seconds, defaults to 30.0
+        :type max_interval: float, optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        """
+        self.operator = operator
+        self.criteria = criteria
+        self.include_subjobs = include_subjobs
+        self.include_existing = include_existing
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.chunk_size = chunk_size
+        self.interval = min_interval
+        self.attributes: list[Attribute] = field_attributes(
+            list(dict.fromkeys(WATCH_FIELDS + (fields or []))), "job"
+        )
+        self.snapshot: dict[str, dict[str, str]] = {}
+        self.finished: set[str] = set()
+        self.polls = 0
+
+    def _history(self, ids: list[str]) -> tuple[list[dict[str, str]], set[str]]:
+        return stat_history(
+            self.operator.connection,
+            ids,
+            self.attributes,
+            subjobs=self.include_subjobs,
+            chunk_size=self.chunk_size,
+        )
+
+    def _live(self) -> dict[str, dict[str, str]]:
+        connection = self.operator.connection
+        if self.criteria is None:
+            return {
+                data["id"]: data
+                for data in stat_job(
+                    connection,
+                    attributes=self.attributes,
+                    subjobs=self.include_subjobs,
+                )
+            }
+        selected = select_jobs(connection, self.criteria, subjobs=self.include_subjobs)
+        return {data["id"]: data for data in self._history(sorted(selected))[0]}
+
+    def _fetch(self) -> tuple[dict[str, dict[str, str]], set[str]]:
+        current = self._live()
+        unknown: set[str] = set()
+        gone = sorted(id for id in self.snapshot if id not in current)
+        if gone:
+            records, unknown = self._history(gone)
+            for data in records:
+                current.setdefault(data["id"], data)
+        return current, unknown
+
+    def poll(self) -> list[JobEvent]:
+        """Takes one snapshot and returns the events since the previous one
+
+        :return: Events, grouped per job
+        :rtype: list[JobEvent]
+        """
+        current, unknown = self._fetch()
+        previous, first = self.snapshot, self.polls == 0
+        self.polls += 1
+        self.finished = set()
+        events: list[JobEvent] = []
+
+        for id, data in current.items():
+            before = previous.get(id)
+            if before == data:
+                continue
+            state = data.get("job_state")
+            if before is None:
+                if first and (not self.include_existing or state in FINISHED_STATES):
+                    continue
+                job = Job.from_pbs(data)
+                events.append(JobSubmitted(id=id, job=job))
+            else:
+                job = Job.from_pbs(data)
+                if before.get("job_state") != state:
+                    events.append(
+                        JobStateChanged(
+                            id=id,
+                            job=job,
+                            previous=before.get("job_state"),
+                            state=state,
+                        )
+                    )
+                used = _resources_used(data)
+                if used != _resources_used(before):
+                    events.append(
+                        JobResourcesUpdated(
+                            id=id, job=job, resources_used=job.resources_used
+                        )
+                    )
+            if state in FINISHED_STATES:
+                self.finished.add(id)
+                events.append(JobFinished(id=id, job=job, exit_status=job.exit_status))
+
+        for id, data in previous.items():
+            if id in unknown:
+                self.finished.add(id)
+                events.append(JobFinished(id=id, job=Job.from_pbs(data)))
+            elif id not in current:
+                # The stat failed: keep the job until a later poll finds it
+                current[id] = data
+
+        self.snapshot = {
+            id: data
+            for id, data in current.items()
+            if id not in self.finished and data.get("job_state") not in FINISHED_STATES
+        }
+        if events:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        return events
+
+    def watch(self, timeout: Optional[float] = None) -> Generator[JobEvent, Any, None]:
+        """Polls at the adaptive interval, yielding events as they are found
+
+        :param timeout: Stop after this many seconds, or None to watch forever, defaults to None
+        :type timeout: Optional[float], optional
+        :yield: Events
+        :rtype: Generator[JobEvent, Any, None]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            yield from self.poll()
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+
+class JobWaiter:
+    def __init__(
+        self,
+        ids: list[str],
+        return_when: WaitCondition = WaitCondition.ALL,
+        fields: Optional[list[str]] = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """Tracks completion of a set of jobs, one projected stat of the unfinished ones per cycle
+
+        Only ``job_state`` and ``exit_status`` (plus ``fields``) are requested, history
+        included, and only for jobs that have not finished yet, so each cycle gets
+        cheaper as jobs complete. Jobs the server explicitly reports unknown
+        (``PBSE_UNKJOBID``) count as finished with an unknown exit status; jobs
+        missing from a cycle for any other reason stay pending. The interval grows
+        by half after every cycle in which nothing finished, up to ``max_interval``,
+        and drops back once something does.
+
+        :param ids: Job IDs
+        :type ids: list[str]
+        :param return_when: When waiting is over, defaults to WaitCondition.ALL
+        :type return_when: WaitCondition, optional
+        :param fields: Extra job fields to fetch into the results, defaults to None
+        :type fields: Optional[list[str]], optional
+        :param interval: Initial seconds between cycles, defaults to 1.0
+        :type interval: float, optional
+        :param max_interval: Longest seconds between cycles, defaults to 30.0
+        :type max_interval: float, optional
+        :param chunk_size: Maximum job IDs per stat request, defaults to DEFAULT_CHUNK_SIZE
+        :type chunk_size: int, optional
+        """
+        self.return_when = WaitCondition(return_when)
+        self.min_interval = interval
+        self.max_interval = max(interval, max_interval)
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.attributes = field_attributes(
+            list(dict.fromkeys(WAIT_FIELDS + (fields or []))), "job"
+        )
+        self.pending: dict[str, str] = {job_id_key(id): id for id in ids}
+        self.done: dict[str, Job] = {}
+        self.failed = False
+
+    def update(
+        self, results: list[dict[str, str]], unknown: Iterable[str] = ()
+    ) -> bool:
+        """Records the stat results of a cycle
+
+        :param results: Raw stat dictionaries of every request of the cycle
+        :type results: list[dict[str, str]]
+        :param unknown: IDs the server reported unknown, see :func:`stat_history`, defaults to ()
+        :type unknown: Iterable[str], optional
+        :return: True if waiting is over
+        :rtype: bool
+        """
+        finished = 0
+        for data in results:
+            key = job_id_key(data["id"])
+            if key in self.pending and data.get("job_state") in FINISHED_STATES:
+                self._finish(key, Job.from_pbs(data))
+                finished += 1
+        for id in unknown:
+            key = job_id_key(id)
+            if key in self.pending:
+                self._finish(key, Job(id=self.pending[key]))
+                finished += 1
+
+        if finished:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+        return self.complete
+
+    def _finish(self, key: str, job: Job) -> None:
+        self.done[self.pending.pop(key)] = job
+        if job.exit_status is not None and job.exit_status != 0:
+            self.failed = True
+
+    @property
+    def complete(self) -> bool:
+        if not self.pending:
+            return True
+        if self.return_when == WaitCondition.FIRST:
+            return bool(self.done)
+        if self.return_when == WaitCondition.ANY_FAILED:
+            return self.failed
+        return False
+
+    @property
+    def result(self) -> WaitResult:
+        return WaitResult(done=self.done, pending=list(self.pending.values()))
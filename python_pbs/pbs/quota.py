@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, Union
+
+from ..util import Attribute, AttributeList, Connection, stat_job, stat_queue
+from .models import Queue
+
+QUEUE_ATTRIBUTES = AttributeList(
+    [
+        Attribute(name="acl_user_enable"),
+        Attribute(name="acl_users"),
+        Attribute(name="resources_available"),
+        Attribute(name="resources_assigned"),
+        Attribute(name="max_user_res"),
+        Attribute(name="default_chunk"),
+    ]
+)
+
+JOB_ATTRIBUTES = AttributeList(
+    [
+        Attribute(name="euser"),
+        Attribute(name="job_owner"),
+        Attribute(name="queue"),
+        Attribute(name="resources_used", resource="ncpus"),
+    ]
+)
+
+
+def queue_available(queue: Queue, user: str, used: int) -> Union[int, None]:
+    """Computes how many CPUs a user may still request in a queue
+
+    The result is the smallest of the queue's unassigned CPUs, the user's
+    ``max_user_res.ncpus`` limit minus the CPUs they already use, and the limit
+    itself, rounded down to a multiple of ``default_chunk.ncpus``.
+
+    :param queue: Queue model with its ACL and resource attributes
+    :type queue: Queue
+    :param user: User name
+    :type user: str
+    :param used: CPUs used by the user's jobs in the queue
+    :type used: int
+    :return: Available CPUs, 0 without access, or None if the queue has no CPU limit
+    :rtype: Union[int, None]
+    """
+    if queue.acl_user_enable and user not in (queue.acl_users or "").split(","):
+        return 0
+
+    queue_max = queue.resources_available.get("ncpus")
+    if not queue_max:
+        return None
+
+    queue_availability = max(0, queue_max - queue.resources_assigned.get("ncpus", 0))
+    max_user_cpus = queue.max_user_res.get("ncpus", queue_availability)
+    available = min(queue_availability, max_user_cpus - used, max_user_cpus)
+
+    chunk = queue.default_chunk.get("ncpus")
+    if available > 0 and chunk:
+        available -= available % chunk
+
+    return max(0, available)
+
+
+def _user(owner: str) -> str:
+    return owner.split("@", 1)[0]
+
+
+def _ncpus(data: dict[str, str]) -> int:
+    value = data.get("resources_used.ncpus")
+    return int(value) if value else 0
+
+
+class QuotaIndex:
+    def __init__(self, connection: Connection, ttl: Optional[float] = None) -> None:
+        """Per-user, per-queue CPU usage of every queue, built from one projected job stat
+
+        :meth:`available` answers for any user and queue in constant time from the
+        index. :meth:`update` re-stats only the given jobs and adjusts the totals they
+        contribute to, and :meth:`refresh` rebuilds everything with one queue stat
+        and one job stat. The index is built on first use and, with a ``ttl``,
+        rebuilt by :meth:`available` once it is older than that.
+
+        :param connection: Connection ID or pool
+        :type connection: Connection
+        :param ttl: Seconds before the index refreshes itself, or None to only refresh on request, defaults to None
+        :type ttl: Optional[float], optional
+        """
+        self.connection = connection
+        self.ttl = ttl
+        self.refreshed: float = 0.0
+        self.queues: dict[str, Queue] = {}
+        self.usage: defaultdict[tuple[str, str], int] = defaultdict(int)
+        self._jobs: dict[str, tuple[str, str, int]] = {}
+        self._lock = threading.RLock()
+
+    def _add(self, data: dict[str, str]) -> None:
+        # Usage is charged to the user the job runs as, like QueueObject.available
+        user = data.get("euser") or _user(data.get("Job_Owner") or "")
+        queue = data.get("queue")
+        if not user or not queue:
+            return
+        contribution = (user, queue, _ncpus(data))
+        self._jobs[data["id"]] = contribution
+        self.usage[contribution[:2]] += contribution[2]
+
+    def _remove(self, id: str) -> None:
+        contribution = self._jobs.pop(id, None)
+        if contribution:
+            self.usage[contribution[:2]] -= contribution[2]
+
+    def refresh_queues(self) -> None:
+        """Re-reads the limits of every queue"""
+        queues = {
+            q.id: q
+            for q in map(
+                Queue.from_pbs, stat_queue(self.connection, attributes=QUEUE_ATTRIBUTES)
+            )
+        }
+        with self._lock:
+            self.queues = queues
+
+    def refresh(self) -> None:
+        """Rebuilds the whole index from one queue stat and one job stat"""
+        self.refresh_queues()
+        jobs = stat_job(self.connection, attributes=JOB_ATTRIBUTES)
+        with self._lock:
+            self.usage = defaultdict(int)
+            self._jobs = {}
+            for data in jobs:
+                self._add(data)
+            self.refreshed = time.monotonic()
+
+    def update(self, ids: list[str]) -> None:
+        """Re-stats the given jobs and moves their usage to where it now belongs
+
+        Jobs that no longer exist or have finished stop counting.
+
+        :param ids: Job IDs as known to the index
+        :type ids: list[str]
+        """
+        if not ids:
+            return
+        jobs = stat_job(self.connection, id=",".join(ids), attributes=JOB_ATTRIBUTES)
+        with self._lock:
+            for id in ids:
+                self._remove(id)
+            for data in jobs:
+                self._remove(data["id"])
+                self._add(data)
+
+    def used(self, user: str, queue: str) -> int:
+        """Gets the CPUs used by a user's jobs in a queue
+
+        :param user: User name
+        :type user: str
+        :param queue: Queue name
+        :type queue: str
+        :return: CPUs in use
+        :rtype: int
+        """
+        with self._lock:
+            return self.usage.get((user, queue), 0)
+
+    def available(self, user: str, queue: str) -> Union[int, None]:
+        """Computes how many CPUs a user may still request in a queue, see :func:`queue_available`
+
+        :param user: User name
+        :type user: str
+        :param queue: Queue name
+        :type queue: str
+        :raises KeyError: If the queue is unknown
+        :return: Available CPUs
+        :rtype: Union[int, None]
+        """
+        if not self.refreshed or (
+            self.ttl is not None and time.monotonic() - self.refreshed > self.ttl
+        ):
+            self.refresh()
+        with self._lock:
+            return queue_available(
+                self.queues[queue], user, self.usage.get((user, queue), 0)
+            )
@@ -1,23 +1,66 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 from ..util import *
+from .cache import StatCache
 from .exceptions import PBSException
 from .models import *
 from .operators import *
+from .taskfarm import TaskFarm, submit_task_farm
 
 
 class PBS:
-    def __init__(self, server: Union[str, None] = None) -> None:
+    def __init__(
+        self,
+        server: Union[str, None] = None,
+        pool_size: Union[int, None] = None,
+        cache: Union[StatCache, None] = None,
+    ) -> None:
         """Primary wrapper class for the PBS API
 
         :param server: Server name or None for default, defaults to None
         :type server: Union[str, None], optional
+        :param pool_size: Share a thread-safe pool of up to this many connections instead of a single connection, defaults to None
+        :type pool_size: Union[int, None], optional
+        :param cache: Serve repeated stat requests from this cache until they expire or a write invalidates them, defaults to None
+        :type cache: Union[StatCache, None], optional
         :raises PBSException: Failed connection
         """
         self.server_name = server if server else default_server()
-        self.connection = connect(self.server_name)
-        if self.connection < 0:
-            raise PBSException(abs(self.connection), context="Connection attempt")
+        self.cache = cache
+        self.resolver = IdResolver()
+        if pool_size:
+            try:
+                self.connection: Connection = ConnectionPool(
+                    self.server_name, max_size=pool_size
+                )
+            except ConnectionError as e:
+                raise PBSException(e.errno, context="Connection attempt")
+        else:
+            self.connection = connect(self.server_name)
+            if self.connection < 0:
+                raise PBSException(abs(self.connection), context="Connection attempt")
+
+    def close(self) -> None:
+        """Disconnects from the server, closing every pooled connection"""
+        if isinstance(self.connection, ConnectionPool):
+            self.connection.close()
+        else:
+            disconnect(self.connection)
+
+    def __enter__(self) -> "PBS":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def load_resource_types(self) -> int:
+        """Reads resource types from the server so site-defined resources are parsed by type
+
+        :return: Number of resources read
+        :rtype: int
+        """
+        return RESOURCE_CODEC.load(self.connection)
 
     @property
     def server(self) -> ServerObject:
@@ -26,7 +69,9 @@ class PBS:
         :return: Server object
         :rtype: ServerObject
         """
-        return ServerOperator(self.connection).get(self.server_name)
+        return ServerOperator(self.connection, self.cache, self.resolver).get(
+            self.server_name
+        )
 
     @property
     def status(self) -> Server:
@@ -35,7 +80,11 @@ class PBS:
         :return: Server model
         :rtype: Server
         """
-        return ServerOperator(self.connection).get(self.server_name).data
+        return (
+            ServerOperator(self.connection, self.cache, self.resolver)
+            .get(self.server_name)
+            .data
+        )
 
     @property
     def hooks(self) -> HookOperator:
@@ -44,7 +93,7 @@ class PBS:
         :return: HookOperator object
         :rtype: HookOperator
         """
-        return HookOperator(self.connection)
+        return HookOperator(self.connection, self.cache, self.resolver)
 
     @property
     def nodes(self) -> NodeOperator:
@@ -53,7 +102,7 @@ class PBS:
         :return: NodeOperator object
         :rtype: NodeOperator
         """
-        return NodeOperator(self.connection)
+        return NodeOperator(self.connection, self.cache, self.resolver)
 
     @property
     def queues(self) -> QueueOperator:
@@ -62,7 +111,7 @@ class PBS:
         :return: QueueOperator object
         :rtype: QueueOperator
         """
-        return QueueOperator(self.connection)
+        return QueueOperator(self.connection, self.cache, self.resolver)
 
     @property
     def schedulers(self) -> SchedulerOperator:
@@ -71,7 +120,7 @@ class PBS:
         :return: SchedulerOperator object
         :rtype: SchedulerOperator
         """
-        return SchedulerOperator(self.connection)
+        return SchedulerOperator(self.connection, self.cache, self.resolver)
 
     @property
     def jobs(self) -> JobOperator:
@@ -80,14 +129,78 @@ class PBS:
         :return: JobOperator object
         :rtype: JobOperator
         """
-        return JobOperator(self.connection)
+        return JobOperator(self.connection, self.cache, self.resolver)
+
+    def _submission_attributes(self, spec: JobSpec) -> list[Attribute]:
+        attributes = dict(spec.attributes)
+        name = spec.name
+        if spec.output_directory:
+            os.makedirs(spec.output_directory, exist_ok=True)
+            attributes["output_path"] = os.path.join(
+                os.path.abspath(spec.output_directory),
+                f"{name}.out.log" if name else "script.out.log",
+            )
+            attributes["error_path"] = os.path.join(
+                os.path.abspath(spec.output_directory),
+                f"{name}.err.log" if name else "script.err.log",
+            )
+        if name:
+            attributes["job_name"] = name
+
+        if spec.alt_user:
+            attributes["User_List"] = spec.alt_user
+        if spec.executable:
+            attributes["executable"] = (
+                f"<jsdl-hpcpa:Executable>{spec.executable}</jsdl-hpcpa:Executable>"
+            )
+            attributes["argument_list"] = (
+                " ".join(
+                    [
+                        f"<jsdl-hpcpa:Argument>{i}</jsdl-hpcpa:Argument>"
+                        for i in spec.args
+                    ]
+                )
+                if len(spec.args) > 0
+                else None
+            )
+        result = []
+        for k, v in attributes.items():
+            name, _, resource = k.partition(".")
+            if v is not None:
+                # Typed resource values (bytes, seconds) go back in PBS units
+                v = RESOURCE_CODEC.encode(resource, v) if resource else str(v)
+            result.append(
+                Attribute(
+                    name=name,
+                    resource=resource or None,
+                    value=v,
+                    operation=BatchOperation.SET,
+                )
+            )
+        return result
+
+    def _submit(self, spec: JobSpec) -> str:
+        result = submit_job(
+            self.connection,
+            self._submission_attributes(spec),
+            spec.script,
+            destination=spec.queue,
+        )
+        if result == None:
+            raise PBSException(get_errno() or -1, context="Job submission failed.")
+        return result
+
+    def _submitted(self) -> None:
+        if self.cache is not None:
+            self.cache.invalidate("job")
+        self.resolver.forget("job")
 
     def submit_script(
         self,
         script: str,
         queue: str = None,
         name: str = None,
-        attributes: JobSubmission = {},
+        attributes: JobSubmission = None,
         output_directory: str = None,
         alt_user: str = None,
     ) -> JobObject:
@@ -99,7 +212,7 @@ class PBS:
         :type queue: str, optional
         :param name: Job name, defaults to None
         :type name: str, optional
-        :param attributes: Attribute mapping, defaults to {}
+        :param attributes: Attribute mapping, defaults to None
         :type attributes: JobSubmission, optional
         :param output_directory: Output folder path, defaults to None
         :type output_directory: str, optional
@@ -109,37 +222,18 @@ class PBS:
         :return: Initialized job
         :rtype: JobObject
         """
-        if output_directory:
-            os.makedirs(output_directory, exist_ok=True)
-            attributes["output_path"] = os.path.join(
-                os.path.abspath(output_directory),
-                f"{name}.out.log" if name else "script.out.log",
-            )
-            attributes["error_path"] = os.path.join(
-                os.path.abspath(output_directory),
-                f"{name}.err.log" if name else "script.err.log",
-            )
-        if name:
-            attributes["job_name"] = name
-
-        if alt_user:
-            attributes["User_List"] = alt_user
-        parsed_attrs = [
-            Attribute(name=k, value=v, operation=BatchOperation.SET)
-            if not "." in k
-            else Attribute(
-                name=k.split(".")[0],
-                resource=k.split(".")[1],
-                value=v,
-                operation=BatchOperation.SET,
+        result = self._submit(
+            JobSpec(
+                script=script,
+                queue=queue,
+                name=name,
+                attributes=attributes if attributes else {},
+                output_directory=output_directory,
+                alt_user=alt_user,
             )
-            for k, v in attributes.items()
-        ]
-        result = submit_job(self.connection, parsed_attrs, script, destination=queue)
-        if result == None:
-            raise PBSException(-1, context="Job submission failed.")
-        else:
-            return self.jobs.get(result, historical=True, subjob=True)
+        )
+        self._submitted()
+        return self.jobs.get(result, historical=True, subjob=True)
 
     def submit_command(
         self,
@@ -147,7 +241,7 @@ class PBS:
         *args,
         queue: str = None,
         name: str = None,
-        attributes: JobSubmission = {},
+        attributes: JobSubmission = None,
         output_directory: str = None,
         alt_user: str = None,
     ) -> JobObject:
@@ -161,7 +255,7 @@ class PBS:
         :type queue: str, optional
         :param name: Job name, defaults to None
         :type name: str, optional
-        :param attributes: Attribute mapping, defaults to {}
+        :param attributes: Attribute mapping, defaults to None
         :type attributes: JobSubmission, optional
         :param output_directory: Output folder path, defaults to None
         :type output_directory: str, optional
@@ -171,42 +265,113 @@ class PBS:
         :return: Initialized job
         :rtype: JobObject
         """
-        if output_directory:
-            os.makedirs(output_directory, exist_ok=True)
-            attributes["output_path"] = os.path.join(
-                os.path.abspath(output_directory),
-                f"{name}.out.log" if name else "script.out.log",
+        result = self._submit(
+            JobSpec(
+                executable=executable,
+                args=[str(i) for i in args],
+                queue=queue,
+                name=name,
+                attributes=attributes if attributes else {},
+                output_directory=output_directory,
+                alt_user=alt_user,
             )
-            attributes["error_path"] = os.path.join(
-                os.path.abspath(output_directory),
-                f"{name}.err.log" if name else "script.err.log",
-            )
-        if name:
-            attributes["job_name"] = name
-
-        if alt_user:
-            attributes["User_List"] = alt_user
-        attributes[
-            "executable"
-        ] = f"<jsdl-hpcpa:Executable>{executable}</jsdl-hpcpa:Executable>"
-        attributes["argument_list"] = (
-            " ".join([f"<jsdl-hpcpa:Argument>{i}</jsdl-hpcpa:Argument>" for i in args])
-            if len(args) > 0
-            else None
         )
-        parsed_attrs = [
-            Attribute(name=k, value=v, operation=BatchOperation.SET)
-            if not "." in k
-            else Attribute(
-                name=k.split(".")[0],
-                resource=k.split(".")[1],
-                value=v,
-                operation=BatchOperation.SET,
-            )
-            for k, v in attributes.items()
-        ]
-        result = submit_job(self.connection, parsed_attrs, None, destination=queue)
-        if result == None:
-            raise PBSException(-1, context="Job submission failed.")
+        self._submitted()
+        return self.jobs.get(result, historical=True, subjob=True)
+
+    def submit_many(
+        self,
+        specs: list[JobSpec],
+        status: bool = False,
+        workers: int = 8,
+        record_type: RecordType = "model",
+    ) -> list[SubmitResult]:
+        """Submits many jobs, collecting a result for each instead of stopping at the first failure
+
+        Submissions are spread over up to ``workers`` threads when this client uses a
+        connection pool (``pool_size``), and are sent one after another otherwise.
+        Without ``status`` only the job IDs are returned; with it, the submitted jobs
+        are stat'ed afterwards in chunks rather than one request per job.
+
+        :param specs: Job specifications
+        :type specs: list[JobSpec]
+        :param status: Also fetch the status of each submitted job, defaults to False
+        :type status: bool, optional
+        :param workers: Maximum concurrent submissions, defaults to 8
+        :type workers: int, optional
+        :param record_type: Record type of fetched statuses, defaults to "model"
+        :type record_type: RecordType, optional
+        :return: One result per spec, in order
+        :rtype: list[SubmitResult]
+        """
+
+        def submit(spec: JobSpec) -> SubmitResult:
+            try:
+                return SubmitResult(spec=spec, id=self._submit(spec))
+            except PBSException as e:
+                return SubmitResult(spec=spec, code=e.code, error=str(e))
+            except OSError as e:
+                return SubmitResult(spec=spec, code=-1, error=str(e))
+
+        if isinstance(self.connection, ConnectionPool) and workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(workers, self.connection.max_size),
+                thread_name_prefix="python-pbs-submit",
+            ) as executor:
+                results = list(executor.map(submit, specs))
         else:
-            return self.jobs.get(result, historical=True, subjob=True)
+            results = [submit(spec) for spec in specs]
+
+        submitted = [r for r in results if r.id]
+        if submitted:
+            self._submitted()
+        if status and submitted:
+            jobs = {
+                job_id_key(j.data.id): j.data
+                for j in self.jobs.iter_stat(
+                    [r.id for r in submitted],
+                    historical=True,
+                    subjobs=True,
+                    record_type=record_type,
+                )
+            }
+            for result in submitted:
+                result.job = jobs.get(job_id_key(result.id))
+        return results
+
+    def submit_task_farm(
+        self,
+        commands: list[str],
+        directory: str,
+        tasks_per_subjob: int = None,
+        queue: str = None,
+        name: str = "taskfarm",
+        attributes: JobSubmission = None,
+    ) -> TaskFarm:
+        """Submits many commands as one array job instead of one job each, see :func:`submit_task_farm`
+
+        :param commands: Single-line shell commands
+        :type commands: list[str]
+        :param directory: Farm directory on a shared filesystem
+        :type directory: str
+        :param tasks_per_subjob: Commands run by each subjob, defaults to None
+        :type tasks_per_subjob: int, optional
+        :param queue: Queue name, defaults to None
+        :type queue: str, optional
+        :param name: Job name, defaults to "taskfarm"
+        :type name: str, optional
+        :param attributes: Attribute mapping, defaults to None
+        :type attributes: JobSubmission, optional
+        :raises PBSException: If the array job failed to submit
+        :return: Handle mapping tasks back to subjobs
+        :rtype: TaskFarm
+        """
+        return submit_task_farm(
+            self,
+            commands,
+            directory,
+            tasks_per_subjob=tasks_per_subjob,
+            queue=queue,
+            name=name,
+            attributes=attributes,
+        )
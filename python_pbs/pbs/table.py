@@ -0,0 +1,540 @@
+import math
+import operator
+from functools import partial
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Optional,
+    Sequence,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from .models import Job, LazyJob
+from .models.parsing import _GROUP
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+_MISSING = math.nan
+_OPERATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+
+def _require_numpy() -> Any:
+    if _np is None:
+        raise ImportError("NumPy is required for this operation")
+    return _np
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return _MISSING
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class NumericColumn:
+    """Column of numbers stored as a contiguous ``array('d')``, with NaN for missing values
+
+    :param values: Column values, defaults to an empty array
+    :type values: array, optional
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Optional[array] = None) -> None:
+        self.values = values if values is not None else array("d")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Optional[float]:
+        value = self.values[index]
+        return None if value != value else value
+
+    def to_list(self) -> list[Optional[float]]:
+        return [None if v != v else v for v in self.values]
+
+    def present(self, indices: Optional[Iterable[int]] = None) -> list[float]:
+        """Gets the non-missing values, optionally of some rows only
+
+        :param indices: Row indices, or None for every row, defaults to None
+        :type indices: Optional[Iterable[int]], optional
+        :return: Values
+        :rtype: list[float]
+        """
+        values = self.values
+        if indices is not None:
+            return [v for v in map(values.__getitem__, indices) if v == v]
+        return [v for v in values if v == v]
+
+    def mask(self, op: str, value: Any) -> list[bool]:
+        compare = _OPERATORS[op]
+        if _np is not None and op in ("==", "!=", "<", "<=", ">", ">="):
+            data = self.to_numpy()
+            return list(compare(data, value) & ~_np.isnan(data))
+        return [v == v and compare(v, value) for v in self.values]
+
+    def take(self, indices: Sequence[int]) -> "NumericColumn":
+        return NumericColumn(array("d", map(self.values.__getitem__, indices)))
+
+    def sum(self, indices: Optional[Iterable[int]] = None) -> float:
+        return math.fsum(self.present(indices))
+
+    def mean(self, indices: Optional[Iterable[int]] = None) -> float:
+        values = self.present(indices)
+        return math.fsum(values) / len(values) if values else _MISSING
+
+    def percentile(self, q: float, indices: Optional[Iterable[int]] = None) -> float:
+        return _percentile(self.present(indices), q)
+
+    def _combine(
+        self, other: Union["NumericColumn", float], combine: Callable
+    ) -> "NumericColumn":
+        if isinstance(other, NumericColumn):
+            return NumericColumn(array("d", map(combine, self.values, other.values)))
+        return NumericColumn(array("d", (combine(v, other) for v in self.values)))
+
+    def __add__(self, other: Union["NumericColumn", float]) -> "NumericColumn":
+        return self._combine(other, operator.add)
+
+    def __sub__(self, other: Union["NumericColumn", float]) -> "NumericColumn":
+        return self._combine(other, operator.sub)
+
+    def __mul__(self, other: Union["NumericColumn", float]) -> "NumericColumn":
+        return self._combine(other, operator.mul)
+
+    def to_numpy(self) -> Any:
+        """Wraps the column in a float64 NumPy array sharing its memory
+
+        :raises ImportError: If NumPy is not installed
+        :return: Array view of the values
+        :rtype: numpy.ndarray
+        """
+        return _require_numpy().frombuffer(self.values, dtype=_np.float64)
+
+    def __repr__(self) -> str:
+        return f"NumericColumn(rows={len(self)})"
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column: one ``array('i')`` code per row indexing a list of distinct values
+
+    Missing values have code -1. Comparisons are evaluated once per distinct value
+    rather than once per row.
+
+    :param codes: Row codes, defaults to an empty array
+    :type codes: array, optional
+    :param categories: Distinct values, defaults to None
+    :type categories: list, optional
+    :param raw: Raw strings the categories were parsed from, defaults to the categories
+    :type raw: list, optional
+    """
+
+    __slots__ = ("codes", "categories", "raw")
+
+    def __init__(
+        self,
+        codes: Optional[array] = None,
+        categories: Optional[list] = None,
+        raw: Optional[list] = None,
+    ) -> None:
+        self.codes = codes if codes is not None else array("i")
+        self.categories = categories if categories is not None else []
+        self.raw = raw if raw is not None else self.categories
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Any:
+        code = self.codes[index]
+        return None if code < 0 else self.categories[code]
+
+    def to_list(self) -> list:
+        categories = self.categories
+        return [None if c < 0 else categories[c] for c in self.codes]
+
+    def matching(self, op: str, value: Any) -> set[int]:
+        """Gets the codes of the categories satisfying a comparison
+
+        Categories match on either their parsed or their raw value, so enum columns
+        can be filtered with ``JobState.QUEUED`` or ``"Q"`` alike.
+
+        :param op: Comparison operator
+        :type op: str
+        :param value: Value to compare with
+        :type value: Any
+        :return: Matching codes
+        :rtype: set[int]
+        """
+        compare = _OPERATORS[op]
+        matches = set()
+        for code, (category, raw) in enumerate(zip(self.categories, self.raw)):
+            try:
+                if compare(category, value) or (
+                    raw is not category and compare(raw, value)
+                ):
+                    matches.add(code)
+            except TypeError:
+                continue
+        if op in ("!=", "not in"):
+            negated = _OPERATORS["==" if op == "!=" else "in"]
+            matches = {
+                code
+                for code in matches
+                if not negated(self.raw[code], value)
+                and not negated(self.categories[code], value)
+            }
+        return matches
+
+    def mask(self, op: str, value: Any) -> list[bool]:
+        matches = self.matching(op, value)
+        if _np is not None:
+            return list(_np.isin(self.to_numpy(), list(matches)))
+        return [code in matches for code in self.codes]
+
+    def take(self, indices: Sequence[int]) -> "CategoricalColumn":
+        return CategoricalColumn(
+            array("i", map(self.codes.__getitem__, indices)), self.categories, self.raw
+        )
+
+    def to_numpy(self) -> Any:
+        """Wraps the codes in an int32 NumPy array sharing their memory
+
+        Decode with ``categories``; -1 marks a missing value.
+
+        :raises ImportError: If NumPy is not installed
+        :return: Array view of the codes
+        :rtype: numpy.ndarray
+        """
+        return _require_numpy().frombuffer(self.codes, dtype=_np.int32)
+
+    def __repr__(self) -> str:
+        return f"CategoricalColumn(rows={len(self)}, categories={len(self.categories)})"
+
+
+Column = Union[NumericColumn, CategoricalColumn]
+
+
+class _Builder:
+    __slots__ = ("kind", "coerce", "values", "codes", "lookup", "categories", "raw")
+
+    def __init__(self, kind: str, coerce: Callable[[Any], Any], rows: int) -> None:
+        self.kind = kind
+        self.coerce = coerce
+        self.values: Union[array, list] = (
+            array("d", [_MISSING]) * rows if kind == "numeric" else [None] * rows
+        )
+        self.codes = array("i", [-1]) * rows
+        self.lookup: dict[Any, int] = {}
+        self.categories: list = []
+        self.raw: list = []
+
+    def append(self, value: Any) -> None:
+        if self.kind == "numeric":
+            if value is None:
+                self.values.append(_MISSING)
+                return
+            try:
+                self.values.append(float(self.coerce(value)))
+            except (KeyError, TypeError, ValueError):
+                self.values.append(_MISSING)
+        elif self.kind == "categorical":
+            self.codes.append(self._code(value))
+        else:
+            self.values.append(None if value is None else self.coerce(value))
+
+    def _code(self, value: Any) -> int:
+        if value is None:
+            return -1
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.categories)
+            try:
+                self.categories.append(self.coerce(value))
+            except (KeyError, TypeError, ValueError):
+                self.categories.append(value)
+            self.raw.append(value)
+        return code
+
+    def build(self) -> Column:
+        if self.kind == "numeric":
+            return NumericColumn(self.values)
+        if self.kind == "categorical":
+            return CategoricalColumn(self.codes, self.categories, self.raw)
+        if all(
+            v is None or (type(v) in (int, float) and type(v) is not bool)
+            for v in self.values
+        ):
+            return NumericColumn(
+                array("d", (_MISSING if v is None else v for v in self.values))
+            )
+        self.kind = "categorical"
+        for value in self.values:
+            self.codes.append(self._code(value))
+        return CategoricalColumn(self.codes, self.categories, self.raw)
+
+
+def _kind(annotation: Any) -> str:
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return _kind(args[0])
+        return "categorical"
+    if annotation in (int, float, bool):
+        return "numeric"
+    return "categorical"
+
+
+class JobTable:
+    """Struct-of-arrays table of job attributes
+
+    Numeric fields are stored as ``array('d')`` columns, strings and enums as
+    dictionary-encoded columns, and resources as one flattened column each, named
+    like ``resource_list.ncpus``. Resource columns are numeric when every value
+    is a number and dictionary-encoded otherwise. Job IDs are kept in :attr:`ids`.
+
+    :param ids: Job ID of each row
+    :type ids: list[str]
+    :param columns: Columns by field name
+    :type columns: dict[str, Column]
+    """
+
+    def __init__(self, ids: list[str], columns: dict[str, Column]) -> None:
+        self.ids = ids
+        self.columns = columns
+
+    @classmethod
+    def from_stat(
+        cls, records: Iterable[dict[str, str]], fields: Iterable[str]
+    ) -> "JobTable":
+        """Builds a table straight from raw stat dictionaries, without building models
+
+        :param records: Raw stat dictionaries
+        :type records: Iterable[dict[str, str]]
+        :param fields: Field names; a bare resource group name adds a column per resource
+        :type fields: Iterable[str]
+        :return: Table
+        :rtype: JobTable
+        """
+        plan = LazyJob.plan
+        wanted = {f.lower() for f in fields if f != "id"}
+        annotations = {name: info.annotation for name, info in Job.model_fields.items()}
+        builders: dict[str, _Builder] = {}
+        columns: dict[str, Optional[str]] = {}
+        ids: list[str] = []
+
+        for field in wanted:
+            resolved = plan.resolve(field)
+            if resolved is not None and resolved[0] is not _GROUP:
+                name = resolved[0]
+                builders[name] = _Builder(
+                    _kind(annotations[name]), plan.coercers[name], 0
+                )
+
+        for data in records:
+            rows = len(ids)
+            ids.append(data.get("id"))
+            row: dict[str, Any] = {}
+            for key, value in data.items():
+                try:
+                    name = columns[key]
+                except KeyError:
+                    name = columns[key] = cls._column(plan, key, wanted)
+                if name is None:
+                    continue
+                if name not in builders:
+                    builders[name] = _Builder(
+                        "inferred",
+                        partial(plan.convert_resource, resource=name.split(".", 1)[1]),
+                        rows,
+                    )
+                row[name] = value
+            for name, builder in builders.items():
+                builder.append(row.get(name))
+
+        return cls(ids, {name: builder.build() for name, builder in builders.items()})
+
+    @staticmethod
+    def _column(plan: Any, key: str, wanted: set[str]) -> Optional[str]:
+        resolved = plan.resolve(key)
+        if resolved is None:
+            return None
+        if resolved[0] is _GROUP:
+            name = f"{resolved[1]}.{resolved[2]}"
+            return name if resolved[1] in wanted or name.lower() in wanted else None
+        return resolved[0] if resolved[0].lower() in wanted else None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __setitem__(self, name: str, column: Column) -> None:
+        if len(column) != len(self):
+            raise ValueError(f"Column {name} has {len(column)} rows, not {len(self)}")
+        self.columns[name] = column
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def mask(self, name: str, op: str, value: Any) -> list[bool]:
+        """Evaluates a comparison on every row of a column
+
+        Missing values never match.
+
+        :param name: Column name
+        :type name: str
+        :param op: One of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in``, ``not in``
+        :type op: str
+        :param value: Value to compare with
+        :type value: Any
+        :raises KeyError: If the column or operator is unknown
+        :return: One boolean per row
+        :rtype: list[bool]
+        """
+        if op not in _OPERATORS:
+            raise KeyError(f"Unknown operator {op!r}")
+        return self.columns[name].mask(op, value)
+
+    def take(self, indices: Sequence[int]) -> "JobTable":
+        """Builds a table from some rows
+
+        :param indices: Row indices
+        :type indices: Sequence[int]
+        :return: Table of the rows
+        :rtype: JobTable
+        """
+        return JobTable(
+            [self.ids[i] for i in indices],
+            {name: column.take(indices) for name, column in self.columns.items()},
+        )
+
+    def filter(self, name: str, op: str, value: Any) -> "JobTable":
+        """Keeps the rows where a column satisfies a comparison, see :meth:`mask`
+
+        :return: Filtered table
+        :rtype: JobTable
+        """
+        mask = self.mask(name, op, value)
+        return self.take([i for i, keep in enumerate(mask) if keep])
+
+    def group_by(self, *names: str) -> "GroupBy":
+        """Groups rows by the values of one or more columns
+
+        :return: Grouping to aggregate over
+        :rtype: GroupBy
+        """
+        return GroupBy(self, names)
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Converts the table back to one dictionary per row
+
+        :return: Rows
+        :rtype: list[dict[str, Any]]
+        """
+        columns = {name: column.to_list() for name, column in self.columns.items()}
+        return [
+            {"id": id, **{name: values[i] for name, values in columns.items()}}
+            for i, id in enumerate(self.ids)
+        ]
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Hands every column to NumPy without copying, see :meth:`NumericColumn.to_numpy`
+
+        :raises ImportError: If NumPy is not installed
+        :return: Arrays by column name; dictionary-encoded columns give their codes
+        :rtype: dict[str, numpy.ndarray]
+        """
+        return {name: column.to_numpy() for name, column in self.columns.items()}
+
+    def __repr__(self) -> str:
+        return f"JobTable(rows={len(self)}, columns={list(self.columns)})"
+
+
+class GroupBy:
+    def __init__(self, table: JobTable, names: Sequence[str]) -> None:
+        """Row indices of a table grouped by the values of some columns
+
+        Dictionary-encoded keys are grouped by code and decoded once per group.
+        Single-column groupings are keyed by value, others by tuples of values.
+
+        :param table: Table to group
+        :type table: JobTable
+        :param names: Key column names
+        :type names: Sequence[str]
+        """
+        self.table = table
+        self.names = tuple(names)
+        keys = [self._keys(table.columns[name]) for name in self.names]
+        groups: dict[Hashable, array] = {}
+        for index, key in enumerate(zip(*keys) if len(keys) > 1 else keys[0]):
+            try:
+                groups[key].append(index)
+            except KeyError:
+                groups[key] = array("l", [index])
+        columns = [table.columns[name] for name in self.names]
+        self.groups: dict[Any, array] = {
+            self._decode(columns, key): indices for key, indices in groups.items()
+        }
+
+    @staticmethod
+    def _keys(column: Column) -> Sequence[Hashable]:
+        if isinstance(column, CategoricalColumn):
+            return column.codes
+        return column.to_list()
+
+    def _decode(self, columns: list[Column], key: Any) -> Any:
+        if len(columns) == 1:
+            key = (key,)
+        decoded = tuple(
+            (
+                (None if k < 0 else column.categories[k])
+                if isinstance(column, CategoricalColumn)
+                else k
+            )
+            for column, k in zip(columns, key)
+        )
+        return decoded[0] if len(columns) == 1 else decoded
+
+    def _aggregate(self, name: str, function: Callable) -> dict[Any, float]:
+        column = self.table.columns[name]
+        if not isinstance(column, NumericColumn):
+            raise TypeError(f"Column {name} is not numeric")
+        return {key: function(column, indices) for key, indices in self.groups.items()}
+
+    def count(self) -> dict[Any, int]:
+        return {key: len(indices) for key, indices in self.groups.items()}
+
+    def sum(self, name: str) -> dict[Any, float]:
+        return self._aggregate(name, NumericColumn.sum)
+
+    def mean(self, name: str) -> dict[Any, float]:
+        return self._aggregate(name, NumericColumn.mean)
+
+    def percentile(self, name: str, q: float) -> dict[Any, float]:
+        return self._aggregate(
+            name, lambda column, indices: column.percentile(q, indices)
+        )
+
+    def median(self, name: str) -> dict[Any, float]:
+        return self.percentile(name, 50)
@@ -0,0 +1,302 @@
+import math
+import os
+import shlex
+from typing import TYPE_CHECKING, Iterable, Optional, Union
+
+from pydantic import BaseModel
+
+from ..util import Attribute, AttributeList, Connection, delete_job, stat_job
+from .exceptions import PBSException
+from .models import JobSpec, JobState, JobSubmission
+
+if TYPE_CHECKING:
+    from .server import PBS
+
+TASK_FILE = "tasks"
+RUNNER_FILE = "run.sh"
+STATUS_PREFIX = "status."
+
+# Runs this subjob's slice of the task file, one line per task, recording
+# "<task index> <exit code>" for each and exiting with the first failure. Tasks
+# read from /dev/null so they cannot consume the rest of the task list
+RUNNER = """#!/bin/sh
+TASKS={tasks}
+STATUS={status}"$PBS_ARRAY_INDEX"
+first=$((PBS_ARRAY_INDEX * {per_subjob} + 1))
+last=$((first + {per_subjob} - 1))
+index=$((first - 1))
+result=0
+sed -n "${{first}},${{last}}p" "$TASKS" > "$STATUS.tasks"
+: > "$STATUS"
+while IFS= read -r task; do
+    {shell} -c "$task" < /dev/null
+    code=$?
+    echo "$index $code" >> "$STATUS"
+    if [ "$result" -eq 0 ]; then result=$code; fi
+    index=$((index + 1))
+done < "$STATUS.tasks"
+rm -f "$STATUS.tasks"
+exit $result
+"""
+
+STAT_ATTRIBUTES = AttributeList(
+    [
+        Attribute(name="job_state"),
+        Attribute(name="Exit_status"),
+        Attribute(name="array_index"),
+    ]
+)
+
+
+class TaskStatus(BaseModel):
+    index: int
+    subjob: int
+    state: Optional[JobState] = None
+    exit_status: Optional[int] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.EXPIRED, JobState.FINISHED)
+
+    @property
+    def successful(self) -> bool:
+        return self.finished and self.exit_status == 0
+
+
+def write_task_file(commands: Iterable[str], path: str) -> int:
+    """Writes one command per line to a task file
+
+    :param commands: Shell commands
+    :type commands: Iterable[str]
+    :param path: Task file path
+    :type path: str
+    :raises ValueError: If a command is empty or spans several lines
+    :return: Number of tasks written
+    :rtype: int
+    """
+    count = 0
+    with open(path, "w") as f:
+        for command in commands:
+            if not command.strip() or "\n" in command or "\r" in command:
+                raise ValueError(f"Task {count} is not a single-line command")
+            f.write(command)
+            f.write("\n")
+            count += 1
+    return count
+
+
+class TaskFarm:
+    def __init__(
+        self,
+        connection: Connection,
+        id: str,
+        directory: str,
+        count: int,
+        tasks_per_subjob: int = 1,
+    ) -> None:
+        """Handle on a set of commands running as one array job
+
+        Task ``i`` runs in subjob ``i // tasks_per_subjob``. :meth:`status` maps every
+        task back to its subjob with a single stat of the array; with several tasks
+        per subjob, per-task exit codes are read from the status files the runner
+        leaves in ``directory`` when it is visible from this host.
+
+        :param connection: Connection ID or pool
+        :type connection: Connection
+        :param id: Array job ID
+        :type id: str
+        :param directory: Farm directory holding the task file and status files
+        :type directory: str
+        :param count: Number of tasks
+        :type count: int
+        :param tasks_per_subjob: Tasks run by each subjob, defaults to 1
+        :type tasks_per_subjob: int, optional
+        """
+        self.connection = connection
+        self.id = id
+        self.directory = directory
+        self.count = count
+        self.tasks_per_subjob = tasks_per_subjob
+
+    @property
+    def subjobs(self) -> int:
+        return math.ceil(self.count / self.tasks_per_subjob)
+
+    def command(self, index: int) -> str:
+        """Reads a task's command back from the task file
+
+        :param index: Task index
+        :type index: int
+        :raises IndexError: If there is no such task
+        :return: Command line
+        :rtype: str
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        with open(os.path.join(self.directory, TASK_FILE)) as f:
+            for number, line in enumerate(f):
+                if number == index:
+                    return line.rstrip("\n")
+        raise IndexError(index)
+
+    def _exit_codes(self, subjob: int) -> dict[int, int]:
+        try:
+            with open(os.path.join(self.directory, f"{STATUS_PREFIX}{subjob}")) as f:
+                return {
+                    int(index): int(code)
+                    for index, code in (line.split() for line in f if line.strip())
+                }
+        except (OSError, ValueError):
+            return {}
+
+    def status(self) -> list[TaskStatus]:
+        """Gets the state and exit status of every task from one stat of the array
+
+        Tasks of an array the server no longer reports have no state. When a subjob
+        runs several tasks, each task's exit status comes from the runner's status
+        file only; a task with no recorded line (the runner was killed before
+        reaching it) has no exit status and is never successful.
+
+        :return: One status per task, in task order
+        :rtype: list[TaskStatus]
+        """
+        subjobs: dict[int, dict] = {}
+        for data in stat_job(
+            self.connection,
+            id=self.id,
+            attributes=STAT_ATTRIBUTES,
+            historical=True,
+            subjobs=True,
+        ):
+            if data.get("array_index") is not None:
+                subjobs[int(data["array_index"])] = data
+
+        results = []
+        for subjob in range(self.subjobs):
+            data = subjobs.get(subjob, {})
+            state = JobState(data["job_state"]) if data.get("job_state") else None
+            exit_status = data.get("Exit_status")
+            exit_status = int(exit_status) if exit_status is not None else None
+            codes = (
+                self._exit_codes(subjob)
+                if self.tasks_per_subjob > 1 and exit_status is not None
+                else {}
+            )
+            first = subjob * self.tasks_per_subjob
+            for index in range(first, min(first + self.tasks_per_subjob, self.count)):
+                results.append(
+                    TaskStatus(
+                        index=index,
+                        subjob=subjob,
+                        state=state,
+                        exit_status=(
+                            codes.get(index)
+                            if self.tasks_per_subjob > 1
+                            else exit_status
+                        ),
+                    )
+                )
+        return results
+
+    def exit_codes(self) -> dict[int, Union[int, None]]:
+        """Gets the exit status of every task, None for tasks that have not finished
+
+        :return: Mapping of task index to exit status
+        :rtype: dict[int, Union[int, None]]
+        """
+        return {
+            task.index: task.exit_status if task.finished else None
+            for task in self.status()
+        }
+
+    @property
+    def finished(self) -> bool:
+        return all(task.finished for task in self.status())
+
+    def delete(self) -> None:
+        """Deletes the array job and every subjob still queued or running
+
+        :raises PBSException: If the deletion fails
+        """
+        result = delete_job(self.connection, self.id)
+        if result != 0:
+            raise PBSException(result, context=f"Failed to delete task farm {self.id}")
+
+
+def submit_task_farm(
+    pbs: "PBS",
+    commands: Iterable[str],
+    directory: str,
+    tasks_per_subjob: Optional[int] = None,
+    queue: str = None,
+    name: str = "taskfarm",
+    attributes: JobSubmission = None,
+    shell: str = "/bin/sh",
+) -> TaskFarm:
+    """Submits many commands as a single array job
+
+    The commands are written one per line to a task file in ``directory``, which
+    must be on a filesystem shared with the execution hosts, together with a
+    runner script that each subjob uses to execute its slice of the file. Without
+    ``tasks_per_subjob``, each command gets its own subjob unless that would exceed
+    the server's ``max_array_size``, in which case the commands are packed evenly.
+
+    :param pbs: Client to submit with
+    :type pbs: PBS
+    :param commands: Single-line shell commands
+    :type commands: Iterable[str]
+    :param directory: Farm directory, created if missing
+    :type directory: str
+    :param tasks_per_subjob: Commands run by each subjob, defaults to None
+    :type tasks_per_subjob: Optional[int], optional
+    :param queue: Queue name, defaults to None
+    :type queue: str, optional
+    :param name: Job name, defaults to "taskfarm"
+    :type name: str, optional
+    :param attributes: Attribute mapping applied to the array job, defaults to None
+    :type attributes: JobSubmission, optional
+    :param shell: Shell each command runs in, defaults to "/bin/sh"
+    :type shell: str, optional
+    :raises ValueError: If there are no commands or one is not a single line
+    :raises PBSException: If the array job failed to submit
+    :return: Handle on the submitted farm
+    :rtype: TaskFarm
+    """
+    directory = os.path.abspath(directory)
+    os.makedirs(directory, exist_ok=True)
+    count = write_task_file(commands, os.path.join(directory, TASK_FILE))
+    if count == 0:
+        raise ValueError("A task farm needs at least one command")
+
+    if tasks_per_subjob is None:
+        limit = pbs.status.max_array_size or 10000
+        tasks_per_subjob = math.ceil(count / limit)
+    elif tasks_per_subjob < 1:
+        raise ValueError("tasks_per_subjob must be at least 1")
+
+    runner = os.path.join(directory, RUNNER_FILE)
+    with open(runner, "w") as f:
+        f.write(
+            RUNNER.format(
+                tasks=shlex.quote(os.path.join(directory, TASK_FILE)),
+                status=shlex.quote(os.path.join(directory, STATUS_PREFIX)),
+                per_subjob=tasks_per_subjob,
+                shell=shlex.quote(shell),
+            )
+        )
+    os.chmod(runner, 0o755)
+
+    subjobs = math.ceil(count / tasks_per_subjob)
+    attributes = dict(attributes) if attributes else {}
+    attributes["array_indices_submitted"] = f"0-{subjobs - 1}"
+    id = pbs._submit(
+        JobSpec(
+            script=runner,
+            queue=queue,
+            name=name,
+            attributes=attributes,
+            output_directory=None,
+        )
+    )
+    pbs._submitted()
+    return TaskFarm(pbs.connection, id, directory, count, tasks_per_subjob)
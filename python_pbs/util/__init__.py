@@ -5,6 +5,7 @@ from .typed_wrapper import (
     MessageFile,
     TerminationMode,
     Attribute,
+    AttributeList,
     BatchStatus,
     ResourceResult,
     connect,
@@ -37,3 +38,12 @@ from .typed_wrapper import (
     terminate,
     release_job,
 )
+from .pool import Connection, ConnectionPool, PoolMetrics, lease
+from .backend import (
+    get_backend,
+    get_errno,
+    set_backend,
+    use_backend,
+    native_available,
+)
+from .simulator import PBSSimulator
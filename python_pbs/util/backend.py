@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from typing import Any, Generator
+
+from .. import extensions
+
+try:
+    from ..extensions.pbs import pbs_ifl as _native
+except ImportError:
+    _native = None
+
+_active: Any = _native
+
+
+def get_backend() -> Any:
+    """Gets the IFL backend currently used by the typed wrapper functions
+
+    A backend is any object exposing the ``pbs_*`` functions and the ``attrl``,
+    ``attropl`` and ``batch_status`` structures of the SWIG ``pbs_ifl`` module.
+
+    Raises:
+        RuntimeError: If the native extension is not built and no backend was set
+
+    Returns:
+        Any: Active backend
+    """
+    if _active is None:
+        raise RuntimeError(
+            "The native pbs_ifl extension is not available; build it or install a backend with set_backend()."
+        )
+    return _active
+
+
+def set_backend(backend: Any = None) -> Any:
+    """Replaces the IFL backend used by the typed wrapper functions
+
+    Args:
+        backend (Any, optional): New backend, or None to restore the native extension. Defaults to None.
+
+    Returns:
+        Any: The previously active backend
+    """
+    global _active
+    previous = _active
+    _active = backend if backend is not None else _native
+    return previous
+
+
+@contextmanager
+def use_backend(backend: Any) -> Generator[Any, Any, None]:
+    """Temporarily installs a backend for the duration of a `with` block
+
+    Args:
+        backend (Any): Backend to install
+
+    Yields:
+        Any: The installed backend
+    """
+    previous = set_backend(backend)
+    try:
+        yield backend
+    finally:
+        set_backend(previous)
+
+
+def get_errno() -> int:
+    """Gets the ``pbs_errno`` left by the last IFL call made on this thread
+
+    The native library keeps ``pbs_errno`` per thread, so this must be called on
+    the thread that made the call, before it makes another one.
+
+    Returns:
+        int: Error code, 0 if the backend does not report one
+    """
+    backend = get_backend()
+    getter = getattr(backend, "get_pbs_errno", None)
+    if getter is not None:
+        return getter()
+    return getattr(backend, "pbs_errno", 0)
+
+
+def native_available() -> bool:
+    """Checks whether the SWIG extension could be imported
+
+    Returns:
+        bool: True if the native backend is available
+    """
+    return extensions.NATIVE_IFL
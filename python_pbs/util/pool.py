@@ -0,0 +1,263 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Generator, Optional, Union
+
+from pydantic import BaseModel
+
+from .backend import get_backend, get_errno
+
+# pbs_errno values that mean the handle itself is unusable (see ``pbs_error.h``)
+CONNECTION_ERRORS = frozenset({15031, 15033, 15034})  # PROTOCOL, NOCONNECTS, NOSERVER
+
+
+class PoolMetrics(BaseModel):
+    max_size: int
+    size: int
+    in_use: int
+    idle: int
+    leases: int
+    waits: int
+    wait_time: float
+    max_wait_time: float
+    reconnects: int
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        server: Optional[str] = None,
+        max_size: int = 4,
+        min_size: int = 1,
+        timeout: Optional[float] = None,
+        validate_after: float = 5.0,
+    ) -> None:
+        """Thread-safe pool of IFL connection handles
+
+        Handles are leased for the duration of a single call. A handle that sat idle
+        for longer than ``validate_after`` seconds is checked with a one-attribute
+        server stat before it is handed out, and replaced if the server no longer
+        knows it (for instance after a restart). Handles whose call left a
+        connection-level ``pbs_errno`` behind on the leasing thread are replaced as
+        well.
+
+        A pool can be passed anywhere a connection ID is accepted: to the typed
+        wrapper functions, to the operators, or to ``PBS``.
+
+        Args:
+            server (Optional[str], optional): Server name, or None for the default. Defaults to None.
+            max_size (int, optional): Maximum number of open handles. Defaults to 4.
+            min_size (int, optional): Handles opened immediately. Defaults to 1.
+            timeout (Optional[float], optional): Maximum seconds to wait for a free handle, or None to wait forever. Defaults to None.
+            validate_after (float, optional): Idle seconds after which a handle is validated before reuse. Defaults to 5.0.
+
+        Raises:
+            ValueError: If the sizes are inconsistent
+            ConnectionError: If the initial connections fail
+        """
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise ValueError(f"Invalid pool sizes: min {min_size}, max {max_size}")
+        self.server = server
+        self.max_size = max_size
+        self.timeout = timeout
+        self.validate_after = validate_after
+
+        self._condition = threading.Condition()
+        self._idle: list[tuple[int, float]] = []
+        self._in_use: set[int] = set()
+        self._size = 0
+        self._closed = False
+        self._leases = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._reconnects = 0
+        self._broken = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._open(), time.monotonic()))
+            self._size += 1
+
+    def _open(self) -> int:
+        handle = get_backend().pbs_connect(self.server)
+        if handle < 0:
+            raise ConnectionError(
+                abs(handle), f"Failed to connect to PBS server {self.server!r}"
+            )
+        return handle
+
+    def _close(self, handle: int) -> None:
+        try:
+            get_backend().pbs_disconnect(handle)
+        except Exception:
+            pass
+
+    def _valid(self, handle: int) -> bool:
+        backend = get_backend()
+        probe = backend.attrl()
+        probe.name = "server_state"
+        return bool(backend.pbs_statserver(handle, probe, None))
+
+    def _failed(self) -> bool:
+        return get_errno() in CONNECTION_ERRORS
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """Takes a handle out of the pool, opening or revalidating one if needed
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait, or None for the pool default. Defaults to None.
+
+        Raises:
+            TimeoutError: If no handle became free in time
+            ConnectionError: If a new connection could not be opened
+
+        Returns:
+            int: Connection ID
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        with self._condition:
+            waited = False
+            while not self._idle and self._size >= self.max_size:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                waited = True
+                remaining = (
+                    None if timeout is None else timeout - (time.monotonic() - start)
+                )
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(
+                        f"No PBS connection became free within {timeout}s"
+                    )
+                self._condition.wait(remaining)
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            if waited:
+                elapsed = time.monotonic() - start
+                self._waits += 1
+                self._wait_time += elapsed
+                self._max_wait_time = max(self._max_wait_time, elapsed)
+            self._leases += 1
+            if self._idle:
+                handle, last_used = self._idle.pop()
+                replacing = False
+            else:
+                handle, last_used = None, 0.0
+                # A slot freed by a broken handle is reopened as a reconnect
+                replacing = self._broken > 0
+                self._broken -= replacing
+            self._size += handle is None
+
+        stale = (
+            handle is not None and time.monotonic() - last_used > self.validate_after
+        )
+        try:
+            if stale and not self._valid(handle):
+                self._close(handle)
+                handle = None
+                replacing = True
+            if handle is None:
+                handle = self._open()
+        except BaseException:
+            if handle is not None:
+                self._close(handle)
+            with self._condition:
+                self._size -= 1
+                self._broken += replacing
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._reconnects += replacing
+            self._in_use.add(handle)
+        return handle
+
+    def release(self, handle: int, broken: bool = False) -> None:
+        """Returns a leased handle to the pool
+
+        Args:
+            handle (int): Connection ID from `acquire`
+            broken (bool, optional): Close the handle instead of reusing it. Defaults to False.
+        """
+        with self._condition:
+            self._in_use.discard(handle)
+            if broken or self._closed:
+                self._size -= 1
+                if broken and not self._closed:
+                    self._broken += 1
+            else:
+                self._idle.append((handle, time.monotonic()))
+            self._condition.notify()
+        if broken or self._closed:
+            self._close(handle)
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Generator[int, Any, None]:
+        """Leases a handle for the duration of a `with` block
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait, or None for the pool default. Defaults to None.
+
+        Yields:
+            int: Connection ID
+        """
+        handle = self.acquire(timeout)
+        try:
+            yield handle
+        finally:
+            # pbs_errno is per thread: read it on the leasing thread, straight after the call
+            self.release(handle, broken=self._failed())
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Snapshot of the pool counters
+
+        Returns:
+            PoolMetrics: Current metrics
+        """
+        with self._condition:
+            return PoolMetrics(
+                max_size=self.max_size,
+                size=self._size,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                leases=self._leases,
+                waits=self._waits,
+                wait_time=self._wait_time,
+                max_wait_time=self._max_wait_time,
+                reconnects=self._reconnects,
+            )
+
+    def close(self) -> None:
+        """Disconnects every idle handle. Leased handles are closed when released."""
+        with self._condition:
+            self._closed = True
+            idle = [handle for handle, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for handle in idle:
+            self._close(handle)
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+Connection = Union[int, ConnectionPool]
+
+
+def lease(connection: Connection) -> ContextManager[int]:
+    """Gets a connection ID for a single call from either a connection ID or a pool
+
+    Args:
+        connection (Connection): Connection ID or pool
+
+    Returns:
+        ContextManager[int]: Context manager yielding the connection ID to use
+    """
+    if isinstance(connection, int):
+        return nullcontext(connection)
+    return connection.lease()
@@ -0,0 +1,1547 @@
+"""In-memory PBS server simulator.
+
+:class:`PBSSimulator` implements the ``pbs_*`` calls of the SWIG ``pbs_ifl``
+module in pure Python, so it can be installed with
+:func:`python_pbs.util.backend.set_backend` to exercise, profile and benchmark
+the typed wrapper, the operators and the :class:`python_pbs.PBS` class without
+a live ``pbs_server``.
+
+It models queues, nodes, jobs (including job history), a simple FIFO scheduler
+and a simulated clock. Job records are kept compact so the simulator can hold a
+million jobs; stat results are only rendered to dictionaries on request.
+"""
+
+import functools
+import getpass
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional, Union
+
+from ..extensions import (
+    MGR_CMD_CREATE,
+    MGR_CMD_DELETE,
+    MGR_CMD_SET,
+    MGR_CMD_UNSET,
+    MGR_OBJ_HOOK,
+    MGR_OBJ_NODE,
+    MGR_OBJ_QUEUE,
+    MGR_OBJ_SCHED,
+    MGR_OBJ_SERVER,
+    UNSET,
+    INCR,
+    DECR,
+    EQ,
+    NE,
+    GE,
+    GT,
+    LE,
+    LT,
+)
+from ..extensions.ifl_fallback import attrl, attropl, batch_status
+
+# Error codes reported through ``pbs_errno`` (see ``pbs_error.h``)
+PBSE_NONE = 0
+PBSE_UNKJOBID = 15001
+PBSE_NOATTR = 15002
+PBSE_UNKREQ = 15005
+PBSE_PERM = 15007
+PBSE_BADHOST = 15010
+PBSE_SYSTEM = 15012
+PBSE_UNKSIG = 15015
+PBSE_BADATVAL = 15016
+PBSE_BADSTATE = 15018
+PBSE_UNKQUE = 15020
+PBSE_QUNOENB = 15023
+PBSE_QUEEXIST = 15027
+PBSE_NOCONNECTS = 15033
+PBSE_NOSERVER = 15034
+PBSE_NORERUN = 15038
+PBSE_UNKNODE = 15062
+PBSE_HISTJOBID = 15139
+
+# Exit status reported for jobs deleted before they ran
+JOB_EXEC_DELETED = -3
+
+_SUBSTATES = {
+    "Q": 10,
+    "H": 20,
+    "W": 30,
+    "R": 42,
+    "S": 43,
+    "E": 51,
+    "F": 92,
+}
+
+_STATE_NAMES = [
+    ("T", "Transit"),
+    ("Q", "Queued"),
+    ("H", "Held"),
+    ("W", "Waiting"),
+    ("R", "Running"),
+    ("E", "Exiting"),
+    ("B", "Begun"),
+]
+
+_SIGNALS = {
+    "SIGHUP": 1,
+    "SIGINT": 2,
+    "SIGKILL": 9,
+    "SIGUSR1": 10,
+    "SIGUSR2": 12,
+    "SIGTERM": 15,
+}
+
+_RESOURCE_TYPES = {
+    "arch": 3,
+    "cput": 1,
+    "file": 5,
+    "host": 3,
+    "mem": 5,
+    "mpiprocs": 1,
+    "ncpus": 1,
+    "nodect": 1,
+    "nodes": 3,
+    "ompthreads": 1,
+    "pcput": 1,
+    "place": 3,
+    "pmem": 5,
+    "pvmem": 5,
+    "select": 3,
+    "soft_walltime": 1,
+    "software": 3,
+    "start_time": 1,
+    "vmem": 5,
+    "vnode": 3,
+    "walltime": 1,
+}
+
+
+def _duration(seconds: Union[int, float]) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _parse_duration(value: str) -> int:
+    total = 0
+    for part in value.split(":"):
+        total = total * 60 + int(float(part))
+    return total
+
+
+def _parse_indices(value: str) -> list[int]:
+    indices = []
+    for part in value.split(","):
+        bounds, _, step = part.partition(":")
+        first, _, last = bounds.partition("-")
+        indices.extend(
+            range(int(first), int(last or first) + 1, int(step) if step else 1)
+        )
+    return indices
+
+
+def _format_indices(indices: Iterable[int]) -> str:
+    parts = []
+    start = previous = None
+    for index in indices:
+        if previous is not None and index == previous + 1:
+            previous = index
+            continue
+        if start is not None:
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = index
+    if start is not None:
+        parts.append(str(start) if start == previous else f"{start}-{previous}")
+    return ",".join(parts)
+
+
+def _compare(actual: Optional[str], expected: Optional[str], op: int) -> bool:
+    if actual is None:
+        return op == NE
+    try:
+        left, right = int(actual), int(expected)
+    except (TypeError, ValueError):
+        left, right = actual, expected if expected is not None else ""
+    if op == EQ:
+        return left == right
+    if op == NE:
+        return left != right
+    if op == GE:
+        return left >= right
+    if op == GT:
+        return left > right
+    if op == LE:
+        return left <= right
+    if op == LT:
+        return left < right
+    return False
+
+
+def _ifl_call(method: Callable) -> Callable:
+    """Wraps a simulated IFL call with latency, call accounting and locking"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: "PBSSimulator", *args):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.calls[name] += 1
+            if self.advance_per_call:
+                self.advance(self.advance_per_call)
+            self.pbs_errno = PBSE_NONE
+            return method(self, *args)
+
+    return wrapper
+
+
+def _entries(
+    attributes: Union[attrl, list[tuple], None],
+) -> Iterable[tuple[str, Optional[str], Optional[str], Optional[int]]]:
+    """Yields ``(name, resource, value, op)`` from an attribute chain or tuple list"""
+    if isinstance(attributes, (list, tuple)):
+        for entry in attributes:
+            yield entry if len(entry) == 4 else (*entry, None)
+        return
+    current = attributes
+    while current:
+        yield current.name, current.resource, current.value, current.op
+        current = current.next
+
+
+class _SimJob:
+    __slots__ = (
+        "seq",
+        "name",
+        "owner",
+        "euser",
+        "queue",
+        "state",
+        "substate",
+        "hold_types",
+        "ctime",
+        "qtime",
+        "mtime",
+        "stime",
+        "runtime",
+        "exit_status",
+        "ncpus",
+        "resources",
+        "node",
+        "run_count",
+        "priority",
+        "attributes",
+        "parent",
+        "index",
+        "subjobs",
+        "subjob_states",
+        "indices",
+    )
+
+    def __init__(self, seq: int, name: str, owner: str, euser: str, queue: str):
+        self.seq = seq
+        self.name = name
+        self.owner = owner
+        self.euser = euser
+        self.queue = queue
+        self.state = "Q"
+        self.substate = _SUBSTATES["Q"]
+        self.hold_types = "n"
+        self.ctime = 0
+        self.qtime = 0
+        self.mtime = 0
+        self.stime = None
+        self.runtime = 0
+        self.exit_status = None
+        self.ncpus = 1
+        self.resources = ()
+        self.node = None
+        self.run_count = 0
+        self.priority = 0
+        self.attributes = None
+        self.parent = None
+        self.index = None
+        self.subjobs = None
+        self.subjob_states = None
+        self.indices = None
+
+
+class _SimObject:
+    __slots__ = ("name", "attributes", "assigned_ncpus", "state_counts", "jobs")
+
+    def __init__(self, name: str, attributes: dict[str, str]):
+        self.name = name
+        self.attributes = attributes
+        self.assigned_ncpus = 0
+        self.state_counts = Counter()
+        self.jobs = []
+
+
+class PBSSimulator:
+    """Pure-Python stand-in for the ``pbs_ifl`` module
+
+    :param server_name: Name reported by ``pbs_default`` and used as job ID suffix, defaults to "pbs-sim"
+    :type server_name: str, optional
+    :param history: Keep finished jobs (``job_history_enable``), defaults to True
+    :type history: bool, optional
+    :param default_runtime: Seconds of simulated time a job runs when it has no walltime, defaults to 60
+    :type default_runtime: int, optional
+    :param latency: Real seconds slept by every IFL call to emulate a network round trip, defaults to 0
+    :type latency: float, optional
+    :param advance_per_call: Simulated seconds the clock advances on every IFL call, defaults to 0
+    :type advance_per_call: int, optional
+    :param user: Submitting user, defaults to the current user
+    :type user: str, optional
+    """
+
+    attrl = attrl
+    attropl = attropl
+    batch_status = batch_status
+    # Attribute lists may be passed as (name, resource, value[, op]) tuples
+    ATTRL_SEQUENCES = True
+
+    def __init__(
+        self,
+        server_name: str = "pbs-sim",
+        history: bool = True,
+        default_runtime: int = 60,
+        latency: float = 0,
+        advance_per_call: int = 0,
+        user: str = None,
+    ) -> None:
+        self.server_name = server_name
+        self.host = socket.gethostname()
+        self.user = user if user else getpass.getuser()
+        self.default_runtime = default_runtime
+        self.latency = latency
+        self.advance_per_call = advance_per_call
+        self.now = int(time.time())
+        self._errno = threading.local()
+        self.calls = Counter()
+
+        self.jobs: dict[str, _SimJob] = {}
+        self.queues: dict[str, _SimObject] = {}
+        self.nodes: dict[str, _SimObject] = {}
+        self.hooks: dict[str, _SimObject] = {}
+        self.server = _SimObject(
+            server_name,
+            {
+                "server_state": "Active",
+                "server_host": self.host,
+                "scheduling": "True",
+                "default_queue": "workq",
+                "log_events": "511",
+                "mail_from": "adm",
+                "query_other_jobs": "True",
+                "resources_default.ncpus": "1",
+                "default_chunk.ncpus": "1",
+                "scheduler_iteration": "600",
+                "flatuid": "True",
+                "job_history_enable": "True" if history else "False",
+                "pbs_version": "simulated",
+                "eligible_time_enable": "False",
+                "max_array_size": "10000",
+            },
+        )
+        self.scheduler = _SimObject(
+            "default",
+            {
+                "sched_host": self.host,
+                "pbs_version": "simulated",
+                "scheduling": "True",
+                "scheduler_iteration": "600",
+                "state": "idle",
+                "sched_cycle_length": "00:20:00",
+                "throughput_mode": "True",
+                "opt_backfill_fuzzy": "low",
+                "preempt_order": "SCR",
+                "log_events": "767",
+            },
+        )
+
+        self._lock = threading.RLock()
+        self._connections: set[int] = set()
+        self._next_connection = 1
+        self._next_seq = 0
+        self._queued: dict[str, _SimJob] = {}
+        self._running: dict[str, _SimJob] = {}
+        self._interned: dict[Any, Any] = {}
+
+        self.add_queue("workq")
+
+    # Simulation control
+
+    @property
+    def history(self) -> bool:
+        return self.server.attributes.get("job_history_enable") == "True"
+
+    def add_queue(
+        self, name: str, enabled: bool = True, started: bool = True, **attributes: Any
+    ) -> None:
+        """Creates an execution queue
+
+        :param name: Queue name
+        :type name: str
+        :param enabled: Accept new jobs, defaults to True
+        :type enabled: bool, optional
+        :param started: Allow jobs to be scheduled, defaults to True
+        :type started: bool, optional
+        :param **attributes: Extra queue attributes, with resources written as ``resources_max__ncpus``
+        """
+        with self._lock:
+            self.queues[name] = _SimObject(
+                name,
+                {
+                    "queue_type": "Execution",
+                    "enabled": str(enabled),
+                    "started": str(started),
+                    **{k.replace("__", "."): str(v) for k, v in attributes.items()},
+                },
+            )
+
+    def add_node(
+        self, name: str, ncpus: int = 8, mem: str = "16gb", **attributes: Any
+    ) -> None:
+        """Creates an execution node
+
+        :param name: Node name
+        :type name: str
+        :param ncpus: CPUs available to jobs, defaults to 8
+        :type ncpus: int, optional
+        :param mem: Memory available to jobs, defaults to "16gb"
+        :type mem: str, optional
+        :param **attributes: Extra node attributes, with resources written as ``resources_available__arch``
+        """
+        with self._lock:
+            self.nodes[name] = _SimObject(
+                name,
+                {
+                    "Mom": name,
+                    "Port": "15002",
+                    "pbs_version": "simulated",
+                    "ntype": "PBS",
+                    "pcpus": str(ncpus),
+                    "resources_available.ncpus": str(ncpus),
+                    "resources_available.mem": mem,
+                    "resources_available.host": name,
+                    "resources_available.vnode": name,
+                    "resv_enable": "True",
+                    "sharing": "default_shared",
+                    "last_state_change_time": str(self.now),
+                    **{k.replace("__", "."): str(v) for k, v in attributes.items()},
+                },
+            )
+
+    def add_hook(self, name: str, event: str = "queuejob", **attributes: Any) -> None:
+        """Creates a site hook
+
+        :param name: Hook name
+        :type name: str
+        :param event: Triggering event, defaults to "queuejob"
+        :type event: str, optional
+        """
+        with self._lock:
+            self.hooks[name] = _SimObject(
+                name,
+                {
+                    "type": "site",
+                    "enabled": "True",
+                    "event": event,
+                    "user": "pbsadmin",
+                    "alarm": "30",
+                    "order": "1",
+                    "debug": "False",
+                    "fail_action": "none",
+                    **{k: str(v) for k, v in attributes.items()},
+                },
+            )
+
+    def generate_jobs(
+        self,
+        count: int,
+        queue: str = None,
+        owners: Iterable[str] = None,
+        ncpus: int = 1,
+        runtime: int = None,
+        state: str = "Q",
+        name: str = "STDIN",
+    ) -> None:
+        """Bulk-loads jobs directly into the simulator, bypassing ``pbs_submit``
+
+        :param count: Number of jobs to create
+        :type count: int
+        :param queue: Queue to place jobs in, defaults to the server's default queue
+        :type queue: str, optional
+        :param owners: Owners to assign round-robin, defaults to the simulator user
+        :type owners: Iterable[str], optional
+        :param ncpus: CPUs requested per job, defaults to 1
+        :type ncpus: int, optional
+        :param runtime: Simulated runtime in seconds, defaults to ``default_runtime``
+        :type runtime: int, optional
+        :param state: Initial state, one of Q, H or F, defaults to "Q"
+        :type state: str, optional
+        :param name: Job name, defaults to "STDIN"
+        :type name: str, optional
+        """
+        with self._lock:
+            queue = queue if queue else self.server.attributes["default_queue"]
+            owners = list(owners) if owners else [self.user]
+            owner_ids = [self._intern(f"{o}@{self.host}") for o in owners]
+            resources = self._intern(
+                (
+                    ("ncpus", str(ncpus)),
+                    ("nodect", "1"),
+                    ("place", "pack"),
+                    ("select", f"1:ncpus={ncpus}"),
+                )
+            )
+            for i in range(count):
+                owner = owner_ids[i % len(owner_ids)]
+                job = self._create_job(
+                    name, owner, owners[i % len(owners)], queue, resources
+                )
+                job.runtime = runtime if runtime is not None else self.default_runtime
+                if state == "H":
+                    job.hold_types = "u"
+                    self._transition(job, "H")
+                elif state == "F":
+                    self._transition(job, "F")
+                    job.exit_status = 0
+                    if not self.history:
+                        self._forget(job)
+
+    def advance(self, seconds: int = 1) -> None:
+        """Advances the simulated clock, finishing expired jobs and starting queued ones
+
+        :param seconds: Simulated seconds to advance, defaults to 1
+        :type seconds: int, optional
+        """
+        with self._lock:
+            self.now += int(seconds)
+            for job in list(self._running.values()):
+                if job.state == "R" and job.stime + job.runtime <= self.now:
+                    self._finish(job, 0)
+            self.schedule()
+
+    def schedule(self) -> int:
+        """Runs one FIFO scheduling cycle over queued jobs
+
+        :return: Number of jobs started
+        :rtype: int
+        """
+        started = 0
+        with self._lock:
+            if self.server.attributes.get("scheduling") != "True":
+                return 0
+            free = {
+                name: self._node_free(node)
+                for name, node in self.nodes.items()
+                if self._node_schedulable(node)
+            }
+            for job in list(self._queued.values()):
+                if not any(free.values()):
+                    break
+                if self.queues[job.queue].attributes.get("started") != "True":
+                    continue
+                for name, available in free.items():
+                    if available >= job.ncpus:
+                        self._start(job, self.nodes[name])
+                        free[name] = available - job.ncpus
+                        started += 1
+                        break
+        return started
+
+    def finish(self, job_id: str, exit_status: int = 0) -> None:
+        """Immediately finishes a running job
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param exit_status: Exit status to record, defaults to 0
+        :type exit_status: int, optional
+        """
+        with self._lock:
+            job = self._lookup(job_id)
+            if job and job.state in ("R", "S", "E"):
+                self._finish(job, exit_status)
+
+    def set_runtime(self, job_id: str, seconds: int) -> None:
+        """Overrides how long a job runs for in simulated time
+
+        :param job_id: Job ID
+        :type job_id: str
+        :param seconds: Runtime in seconds
+        :type seconds: int
+        """
+        with self._lock:
+            job = self._lookup(job_id)
+            if job:
+                job.runtime = seconds
+
+    def restart(self) -> None:
+        """Simulates a server restart, invalidating every open connection"""
+        with self._lock:
+            self._connections.clear()
+
+    # Internal state management
+
+    def _intern(self, value: Any) -> Any:
+        return self._interned.setdefault(value, value)
+
+    def _key(self, job: _SimJob) -> str:
+        return str(job.seq) if job.index is None else f"{job.seq}[{job.index}]"
+
+    def _job_id(self, job: _SimJob) -> str:
+        if job.subjobs is not None:
+            return f"{job.seq}[].{self.server_name}"
+        return f"{self._key(job)}.{self.server_name}"
+
+    def _lookup(self, job_id: str) -> Optional[_SimJob]:
+        if not job_id:
+            return None
+        key = job_id.split(".", 1)[0]
+        return self.jobs.get(key[:-2] if key.endswith("[]") else key)
+
+    def _expand(self, jobs: Iterable[_SimJob]) -> list[_SimJob]:
+        result = []
+        for job in jobs:
+            result.append(job)
+            if job.subjobs is not None:
+                result.extend(job.subjobs)
+        return result
+
+    def _create_job(
+        self, name: str, owner: str, euser: str, queue: str, resources: tuple
+    ) -> _SimJob:
+        seq = self._next_seq
+        self._next_seq += 1
+        job = _SimJob(seq, name, owner, euser, queue)
+        job.ctime = job.qtime = job.mtime = self.now
+        job.resources = resources
+        for key, value in resources:
+            if key == "ncpus":
+                job.ncpus = int(value)
+            elif key == "walltime":
+                job.runtime = min(self.default_runtime, _parse_duration(value))
+        if not job.runtime:
+            job.runtime = self.default_runtime
+        self.jobs[str(seq)] = job
+        self._queued[str(seq)] = job
+        self._count(job, 1)
+        return job
+
+    def _create_array(self, job: _SimJob, indices: list[int], submitted: str) -> None:
+        self._queued.pop(str(job.seq), None)
+        job.indices = submitted
+        job.subjobs = []
+        job.subjob_states = Counter()
+        for index in indices:
+            subjob = _SimJob(job.seq, job.name, job.owner, job.euser, job.queue)
+            subjob.ctime = subjob.qtime = subjob.mtime = self.now
+            subjob.resources = job.resources
+            subjob.ncpus = job.ncpus
+            subjob.runtime = job.runtime
+            subjob.attributes = job.attributes
+            subjob.parent = job
+            subjob.index = index
+            key = self._key(subjob)
+            self.jobs[key] = subjob
+            self._queued[key] = subjob
+            job.subjobs.append(subjob)
+            job.subjob_states["Q"] += 1
+
+    def _update_parent(self, parent: _SimJob) -> None:
+        states = parent.subjob_states
+        total = len(parent.subjobs)
+        if states["F"] == total:
+            failed = any(j.exit_status for j in parent.subjobs)
+            parent.exit_status = 1 if failed else 0
+            parent.runtime = (self.now - parent.stime) if parent.stime else 0
+            self._transition(parent, "F")
+            if not self.history:
+                self._forget(parent)
+        elif states["R"] + states["S"] + states["E"] + states["F"]:
+            if parent.state != "B":
+                parent.stime = parent.stime or self.now
+                self._transition(parent, "B")
+        elif states["H"] == total:
+            if parent.state != "H":
+                self._transition(parent, "H")
+        elif parent.state != "Q":
+            self._transition(parent, "Q")
+
+    def _count(self, job: _SimJob, delta: int) -> None:
+        if job.parent is not None:
+            return
+        queue = self.queues.get(job.queue)
+        if queue:
+            queue.state_counts[job.state] += delta
+        self.server.state_counts[job.state] += delta
+
+    def _transition(self, job: _SimJob, state: str) -> None:
+        key = self._key(job)
+        self._count(job, -1)
+        if job.subjobs is not None:
+            pass
+        elif job.state == "Q":
+            self._queued.pop(key, None)
+        elif job.state in ("R", "S", "E"):
+            self._running.pop(key, None)
+        previous = job.state
+        job.state = state
+        job.substate = _SUBSTATES.get(state, 0)
+        job.mtime = self.now
+        if job.subjobs is not None:
+            pass
+        elif state == "Q":
+            self._queued[key] = job
+        elif state in ("R", "S", "E"):
+            self._running[key] = job
+        self._count(job, 1)
+        if job.parent is not None:
+            job.parent.subjob_states[previous] -= 1
+            job.parent.subjob_states[state] += 1
+            self._update_parent(job.parent)
+
+    def _forget(self, job: _SimJob) -> None:
+        self._count(job, -1)
+        self.jobs.pop(self._key(job), None)
+        for subjob in job.subjobs or ():
+            self.jobs.pop(self._key(subjob), None)
+
+    def _node_schedulable(self, node: _SimObject) -> bool:
+        return node.attributes.get("state", "free") not in ("offline", "down")
+
+    def _node_free(self, node: _SimObject) -> int:
+        return int(node.attributes["resources_available.ncpus"]) - node.assigned_ncpus
+
+    def _start(self, job: _SimJob, node: _SimObject) -> None:
+        self._transition(job, "R")
+        job.stime = self.now
+        job.node = node.name
+        job.run_count += 1
+        node.assigned_ncpus += job.ncpus
+        node.jobs.append(self._key(job))
+        self.queues[job.queue].assigned_ncpus += job.ncpus
+        self.server.assigned_ncpus += job.ncpus
+
+    def _release(self, job: _SimJob) -> None:
+        node = self.nodes.get(job.node)
+        if node:
+            node.assigned_ncpus -= job.ncpus
+            key = self._key(job)
+            if key in node.jobs:
+                node.jobs.remove(key)
+        queue = self.queues.get(job.queue)
+        if queue:
+            queue.assigned_ncpus -= job.ncpus
+        self.server.assigned_ncpus -= job.ncpus
+
+    def _finish(self, job: _SimJob, exit_status: Optional[int]) -> None:
+        if job.state in ("R", "S", "E"):
+            self._release(job)
+        job.exit_status = exit_status
+        job.runtime = (self.now - job.stime) if job.stime else 0
+        self._transition(job, "F")
+        if not self.history:
+            self._forget(job)
+
+    def _job_value(self, job: _SimJob, name: str, resource: Optional[str]) -> Any:
+        if resource is None:
+            if name == "job_state":
+                return job.state
+            if name == "queue":
+                return job.queue
+            if name == "job_owner":
+                return job.owner
+            if name == "job_name":
+                return job.name
+            if name == "euser":
+                return job.euser
+        elif name == "resource_list":
+            for key, value in job.resources:
+                if key == resource:
+                    return value
+            return None
+        key = name if resource is None else f"{name}.{resource}"
+        for k, v in self._render_job(job).items():
+            if k.lower() == key:
+                return v
+        return None
+
+    def _render_job(self, job: _SimJob) -> dict[str, str]:
+        jid = self._job_id(job)
+        cwd = f"{self.host}:{os.getcwd()}"
+        data = {
+            "id": jid,
+            "Job_Name": job.name,
+            "Job_Owner": job.owner,
+            "job_state": job.state,
+            "queue": job.queue,
+            "server": self.server_name,
+            "Checkpoint": "u",
+            "ctime": str(job.ctime),
+            "Error_Path": f"{cwd}/{job.name}.e{job.seq}",
+            "Hold_Types": job.hold_types,
+            "Join_Path": "n",
+            "Keep_Files": "n",
+            "Mail_Points": "a",
+            "mtime": str(job.mtime),
+            "Output_Path": f"{cwd}/{job.name}.o{job.seq}",
+            "Priority": str(job.priority),
+            "qtime": str(job.qtime),
+            "Rerunable": "True",
+            "substate": str(job.substate),
+            "euser": job.euser,
+            "egroup": job.euser,
+            "queue_type": "E",
+            "run_count": str(job.run_count),
+            "project": "_pbs_project_default",
+            "Submit_arguments": "",
+        }
+        for key, value in job.resources:
+            data[f"Resource_List.{key}"] = value
+        if job.stime is not None:
+            elapsed = job.runtime if job.state == "F" else max(0, self.now - job.stime)
+            data["stime"] = str(job.stime)
+            data["exec_host"] = f"{job.node}/0*{job.ncpus}"
+            data["exec_vnode"] = f"({job.node}:ncpus={job.ncpus})"
+            data["session_id"] = str(1000 + job.seq)
+            data["resources_used.ncpus"] = str(job.ncpus)
+            data["resources_used.walltime"] = _duration(elapsed)
+            data["resources_used.cput"] = _duration(elapsed * job.ncpus)
+            data["resources_used.mem"] = "0kb"
+            data["resources_used.vmem"] = "0kb"
+            data["resources_used.cpupercent"] = "0"
+        if job.exit_status is not None:
+            data["Exit_status"] = str(job.exit_status)
+        if job.attributes:
+            data.update(job.attributes)
+        if job.subjobs is not None:
+            states = job.subjob_states
+            data["array"] = "True"
+            data["array_indices_submitted"] = job.indices
+            data["array_indices_remaining"] = (
+                _format_indices(j.index for j in job.subjobs if j.state in ("Q", "H"))
+                or "-"
+            )
+            data["array_state_count"] = (
+                f"Queued:{states['Q'] + states['H']} Running:{states['R'] + states['S']}"
+                f" Exiting:{states['E']} Expired:{states['F']} "
+            )
+        elif job.parent is not None:
+            data["array_id"] = self._job_id(job.parent)
+            data["array_index"] = str(job.index)
+            if job.state == "F":
+                data["job_state"] = "X"
+        return data
+
+    def _render_queue(self, queue: _SimObject) -> dict[str, str]:
+        data = {"id": queue.name, **queue.attributes}
+        total = sum(
+            count for state, count in queue.state_counts.items() if state != "F"
+        )
+        data["total_jobs"] = str(total)
+        data["state_count"] = self._state_count(queue.state_counts)
+        data["resources_assigned.ncpus"] = str(queue.assigned_ncpus)
+        data["resources_assigned.nodect"] = str(
+            queue.state_counts["R"] + queue.state_counts["E"]
+        )
+        return data
+
+    def _render_node(self, node: _SimObject) -> dict[str, str]:
+        data = {"id": node.name, **node.attributes}
+        if not self._node_schedulable(node):
+            state = node.attributes["state"]
+        elif node.assigned_ncpus >= int(node.attributes["resources_available.ncpus"]):
+            state = "job-busy"
+        else:
+            state = "free"
+        data["state"] = state
+        data["resources_assigned.ncpus"] = str(node.assigned_ncpus)
+        if node.jobs:
+            data["jobs"] = ", ".join(
+                f"{key}.{self.server_name}/{i}" for i, key in enumerate(node.jobs)
+            )
+        return data
+
+    def _render_server(self) -> dict[str, str]:
+        data = {"id": self.server_name, **self.server.attributes}
+        data["total_jobs"] = str(
+            sum(c for s, c in self.server.state_counts.items() if s != "F")
+        )
+        data["state_count"] = self._state_count(self.server.state_counts)
+        data["resources_assigned.ncpus"] = str(self.server.assigned_ncpus)
+        data["resources_available.ncpus"] = str(
+            sum(
+                int(n.attributes["resources_available.ncpus"])
+                for n in self.nodes.values()
+            )
+        )
+        return data
+
+    def _state_count(self, counts: Counter) -> str:
+        return "".join(f"{name}:{counts[state]} " for state, name in _STATE_NAMES)
+
+    def _project(
+        self, data: dict[str, str], attributes: Optional[attrl]
+    ) -> dict[str, str]:
+        return self._projection(attributes)(data)
+
+    def _projection(
+        self, attributes: Optional[attrl]
+    ) -> Callable[[dict[str, str]], dict[str, str]]:
+        if attributes is None:
+            return lambda data: data
+        names = set()
+        pairs = set()
+        for name, resource, _, _ in _entries(attributes):
+            if resource:
+                pairs.add(f"{name}.{resource}".lower())
+            else:
+                names.add(name.lower())
+        selected: dict[str, bool] = {}
+
+        def project(data: dict[str, str]) -> dict[str, str]:
+            result = {"id": data["id"]}
+            for key, value in data.items():
+                try:
+                    keep = selected[key]
+                except KeyError:
+                    lowered = key.lower()
+                    keep = selected[key] = (
+                        lowered in pairs or lowered.split(".", 1)[0] in names
+                    )
+                if keep:
+                    result[key] = value
+            return result
+
+        return project
+
+    def _criteria(self, attributes: Optional[attropl]) -> list[tuple]:
+        return [
+            (name.lower(), resource, value, op if op is not None else EQ)
+            for name, resource, value, op in _entries(attributes)
+        ]
+
+    def _matches(self, job: _SimJob, criteria: list[tuple]) -> bool:
+        for name, resource, value, op in criteria:
+            actual = self._job_value(job, name, resource)
+            if name == "job_state" and value and op in (EQ, NE):
+                if (actual in value) != (op == EQ):
+                    return False
+            elif not _compare(actual, value, op):
+                return False
+        return True
+
+    # IFL surface
+
+    @property
+    def pbs_errno(self) -> int:
+        """Error code of the last call made on the current thread, like the C library's"""
+        return getattr(self._errno, "value", PBSE_NONE)
+
+    @pbs_errno.setter
+    def pbs_errno(self, value: int) -> None:
+        self._errno.value = value
+
+    def get_pbs_errno(self) -> int:
+        return self.pbs_errno
+
+    def _connected(self, connection: int) -> bool:
+        if connection in self._connections:
+            return True
+        self.pbs_errno = PBSE_NOSERVER
+        return False
+
+    def _fail(self, code: int) -> int:
+        self.pbs_errno = code
+        return code
+
+    @_ifl_call
+    def pbs_default(self) -> str:
+        return self.server_name
+
+    @_ifl_call
+    def pbs_connect(self, server: Optional[str]) -> int:
+        if server and server.split(":", 1)[0] not in (
+            self.server_name,
+            self.host,
+            "localhost",
+        ):
+            self.pbs_errno = PBSE_BADHOST
+            return -1
+        handle = self._next_connection
+        self._next_connection += 1
+        self._connections.add(handle)
+        return handle
+
+    @_ifl_call
+    def pbs_disconnect(self, connection: int) -> int:
+        if connection not in self._connections:
+            return self._fail(PBSE_NOSERVER)
+        self._connections.discard(connection)
+        return 0
+
+    @_ifl_call
+    def pbs_statjob(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        historical = bool(extend) and "x" in extend
+        subjobs = bool(extend) and "t" in extend
+        if id:
+            jobs = []
+            for jid in id.split(","):
+                job = self._lookup(jid.strip())
+                if job is None:
+                    self.pbs_errno = PBSE_UNKJOBID
+                elif job.state == "F" and not historical:
+                    self.pbs_errno = PBSE_HISTJOBID
+                else:
+                    jobs.append(job)
+        else:
+            jobs = [
+                j
+                for j in self.jobs.values()
+                if j.parent is None and (historical or j.state != "F")
+            ]
+        if subjobs:
+            jobs = self._expand(jobs)
+        project = self._projection(attributes)
+        return [project(self._render_job(j)) for j in jobs]
+
+    @_ifl_call
+    def pbs_selectjob(
+        self, connection: int, attributes: Optional[attropl], extend: Optional[str]
+    ) -> list[str]:
+        if not self._connected(connection):
+            return None
+        historical = bool(extend) and "x" in extend
+        subjobs = bool(extend) and "t" in extend
+        criteria = self._criteria(attributes)
+        return [
+            self._job_id(j)
+            for j in self.jobs.values()
+            if (subjobs or j.parent is None)
+            and (historical or j.state != "F")
+            and self._matches(j, criteria)
+        ]
+
+    @_ifl_call
+    def pbs_submit(
+        self,
+        connection: int,
+        attributes: Optional[attropl],
+        script: Optional[str],
+        destination: Optional[str],
+        extend: Optional[str],
+    ) -> Optional[str]:
+        if not self._connected(connection):
+            return None
+        if script and not os.path.exists(script):
+            self.pbs_errno = PBSE_SYSTEM
+            return None
+        queue_name = (
+            destination.split("@", 1)[0]
+            if destination
+            else self.server.attributes["default_queue"]
+        )
+        queue = self.queues.get(queue_name)
+        if queue is None:
+            self.pbs_errno = PBSE_UNKQUE
+            return None
+        if queue.attributes.get("enabled") != "True":
+            self.pbs_errno = PBSE_QUNOENB
+            return None
+
+        values = {}
+        resources = {}
+        for name, resource, value, _ in _entries(attributes):
+            if name.lower() == "resource_list" and resource:
+                resources[resource] = str(value)
+            else:
+                values[name] = value
+        lowered = {k.lower(): (k, v) for k, v in values.items()}
+
+        for prefix in (queue.attributes, self.server.attributes):
+            for key, value in prefix.items():
+                if key.startswith("resources_default."):
+                    resources.setdefault(key.split(".", 1)[1], value)
+        resources.setdefault("ncpus", "1")
+        resources.setdefault("nodect", "1")
+        resources.setdefault("place", "pack")
+        resources.setdefault("select", f"1:ncpus={resources['ncpus']}")
+
+        name = lowered.pop("job_name", (None, None))[1]
+        if not name:
+            name = os.path.basename(script) if script else "STDIN"
+        euser = lowered.pop("user_list", (None, self.user))[1] or self.user
+        hold_types = lowered.pop("hold_types", (None, "n"))[1] or "n"
+        submitted = lowered.pop("array_indices_submitted", (None, None))[1]
+        if submitted:
+            try:
+                indices = _parse_indices(submitted)
+            except ValueError:
+                indices = []
+            limit = int(self.server.attributes.get("max_array_size", "10000"))
+            if not indices or len(indices) > limit or len(set(indices)) < len(indices):
+                self.pbs_errno = PBSE_BADATVAL
+                return None
+        job = self._create_job(
+            self._intern(name),
+            self._intern(f"{self.user}@{self.host}"),
+            self._intern(euser),
+            queue_name,
+            self._intern(tuple(sorted(resources.items()))),
+        )
+        extra = {
+            k: v for k, v in lowered.values() if v is not None and k.lower() != "queue"
+        }
+        if euser != self.user:
+            extra["User_List"] = euser
+        job.attributes = extra if extra else None
+        if submitted:
+            self._create_array(job, indices, submitted)
+        if hold_types != "n":
+            for held in job.subjobs if submitted else (job,):
+                held.hold_types = hold_types
+                self._transition(held, "H")
+        return self._job_id(job)
+
+    @_ifl_call
+    def pbs_alterjob(
+        self,
+        connection: int,
+        job_id: str,
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.parent is not None:
+            return self._fail(PBSE_PERM)
+        for attribute, resource, value, _ in _entries(attributes):
+            name = attribute.lower()
+            if name == "resource_list" and resource:
+                if job.state in ("R", "E"):
+                    return self._fail(PBSE_BADSTATE)
+                resources = dict(job.resources)
+                resources[resource] = str(value)
+                job.resources = self._intern(tuple(sorted(resources.items())))
+                if resource == "ncpus":
+                    job.ncpus = int(value)
+            elif name == "job_name":
+                job.name = self._intern(value)
+            elif name == "priority":
+                job.priority = int(value)
+            elif name in ("job_state", "job_owner", "queue", "server", "ctime"):
+                return self._fail(PBSE_PERM)
+            else:
+                if job.attributes is None:
+                    job.attributes = {}
+                job.attributes[attribute] = value
+        job.mtime = self.now
+        return 0
+
+    @_ifl_call
+    def pbs_deljob(self, connection: int, job_id: str, extend: Optional[str]) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        for target in job.subjobs if job.subjobs is not None else (job,):
+            if target.state != "F":
+                self._finish(
+                    target,
+                    256 + _SIGNALS["SIGTERM"] if target.stime else JOB_EXEC_DELETED,
+                )
+        return 0
+
+    @_ifl_call
+    def pbs_holdjob(
+        self, connection: int, job_id: str, hold_type: str, extend: Optional[str]
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        types = set(job.hold_types.replace("n", "")) | set(hold_type or "u")
+        job.hold_types = "".join(sorted(types))
+        for target in job.subjobs if job.subjobs is not None else (job,):
+            target.hold_types = job.hold_types
+            if target.state == "Q":
+                self._transition(target, "H")
+        return 0
+
+    @_ifl_call
+    def pbs_rlsjob(
+        self, connection: int, job_id: str, hold_type: str, extend: Optional[str]
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        types = set(job.hold_types.replace("n", "")) - set(hold_type or "u")
+        job.hold_types = "".join(sorted(types)) if types else "n"
+        for target in job.subjobs if job.subjobs is not None else (job,):
+            target.hold_types = job.hold_types
+            if target.state == "H" and not types:
+                self._transition(target, "Q")
+        return 0
+
+    @_ifl_call
+    def pbs_rerunjob(self, connection: int, job_id: str, extend: Optional[str]) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.state not in ("R", "S"):
+            return self._fail(PBSE_BADSTATE)
+        self._release(job)
+        job.stime = None
+        job.node = None
+        self._transition(job, "Q")
+        return 0
+
+    @_ifl_call
+    def pbs_sigjob(
+        self, connection: int, job_id: str, signal: str, extend: Optional[str]
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.state not in ("R", "S"):
+            return self._fail(PBSE_BADSTATE)
+        if signal == "suspend":
+            self._transition(job, "S")
+            return 0
+        if signal == "resume":
+            self._transition(job, "R")
+            return 0
+        name = signal.upper()
+        if not name.startswith("SIG"):
+            name = f"SIG{name}"
+        number = int(signal) if signal.isdigit() else _SIGNALS.get(name)
+        if number is None:
+            return self._fail(PBSE_UNKSIG)
+        if number in (_SIGNALS["SIGKILL"], _SIGNALS["SIGTERM"], _SIGNALS["SIGINT"]):
+            self._finish(job, 256 + number)
+        return 0
+
+    @_ifl_call
+    def pbs_orderjob(
+        self, connection: int, job_id_1: str, job_id_2: str, extend: Optional[str]
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        first, second = self._lookup(job_id_1), self._lookup(job_id_2)
+        if first is None or second is None:
+            return self._fail(PBSE_UNKJOBID)
+        if first.state == "F" or second.state == "F":
+            return self._fail(PBSE_BADSTATE)
+        first.priority, second.priority = second.priority, first.priority
+        if first.state == "Q" and second.state == "Q":
+            ordered = list(self._queued.items())
+            k1, k2 = str(first.seq), str(second.seq)
+            positions = {k: i for i, (k, _) in enumerate(ordered)}
+            i1, i2 = positions[k1], positions[k2]
+            ordered[i1], ordered[i2] = ordered[i2], ordered[i1]
+            self._queued = dict(ordered)
+        return 0
+
+    @_ifl_call
+    def pbs_movejob(
+        self,
+        connection: int,
+        job_id: str,
+        destination: Optional[str],
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.state not in ("Q", "H", "W"):
+            return self._fail(PBSE_BADSTATE)
+        queue_name = (
+            destination.split("@", 1)[0]
+            if destination
+            else self.server.attributes["default_queue"]
+        )
+        if queue_name not in self.queues:
+            return self._fail(PBSE_UNKQUE)
+        self._count(job, -1)
+        job.queue = queue_name
+        self._count(job, 1)
+        return 0
+
+    @_ifl_call
+    def pbs_msgjob(
+        self,
+        connection: int,
+        job_id: str,
+        file: int,
+        message: str,
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.state != "R":
+            return self._fail(PBSE_BADSTATE)
+        return 0
+
+    @_ifl_call
+    def pbs_runjob(
+        self,
+        connection: int,
+        job_id: str,
+        location: Optional[str],
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        return self._run(job_id, location)
+
+    @_ifl_call
+    def pbs_asyrunjob(
+        self,
+        connection: int,
+        job_id: str,
+        location: Optional[str],
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        return self._run(job_id, location)
+
+    def _run(self, job_id: str, location: Optional[str]) -> int:
+        job = self._lookup(job_id)
+        if job is None or job.state == "F":
+            return self._fail(PBSE_UNKJOBID)
+        if job.state not in ("Q", "H"):
+            return self._fail(PBSE_BADSTATE)
+        candidates = (
+            [self.nodes.get(location.split(":", 1)[0].strip("()"))]
+            if location
+            else list(self.nodes.values())
+        )
+        for node in candidates:
+            if node is None:
+                return self._fail(PBSE_UNKNODE)
+            if self._node_schedulable(node) and self._node_free(node) >= job.ncpus:
+                self._start(job, node)
+                return 0
+        return self._fail(PBSE_BADSTATE)
+
+    @_ifl_call
+    def pbs_locjob(
+        self, connection: int, job_id: str, extend: Optional[str]
+    ) -> Optional[str]:
+        if not self._connected(connection):
+            return None
+        if self._lookup(job_id) is None:
+            self.pbs_errno = PBSE_UNKJOBID
+            return None
+        return self.server_name
+
+    @_ifl_call
+    def pbs_manager(
+        self,
+        connection: int,
+        command: int,
+        object_type: int,
+        object_name: str,
+        attributes: Optional[attropl],
+        extend: Optional[str],
+    ) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        if object_type == MGR_OBJ_SERVER:
+            target = self.server
+        elif object_type == MGR_OBJ_SCHED:
+            target = self.scheduler
+        else:
+            collection, create, missing = {
+                MGR_OBJ_QUEUE: (self.queues, self.add_queue, PBSE_UNKQUE),
+                MGR_OBJ_NODE: (self.nodes, self.add_node, PBSE_UNKNODE),
+                MGR_OBJ_HOOK: (self.hooks, self.add_hook, PBSE_UNKREQ),
+            }.get(object_type, (None, None, PBSE_PERM))
+            if collection is None:
+                return self._fail(PBSE_PERM)
+            if command == MGR_CMD_CREATE:
+                if object_name in collection:
+                    return self._fail(PBSE_QUEEXIST)
+                create(object_name)
+            elif object_name not in collection:
+                return self._fail(missing)
+            elif command == MGR_CMD_DELETE:
+                if (
+                    collection[object_name].state_counts.total()
+                    or collection[object_name].jobs
+                ):
+                    return self._fail(PBSE_BADSTATE)
+                del collection[object_name]
+                return 0
+            target = collection[object_name]
+
+        if command not in (MGR_CMD_CREATE, MGR_CMD_SET, MGR_CMD_UNSET):
+            return 0
+        for name, resource, value, op in _entries(attributes):
+            key = f"{name}.{resource}" if resource else name
+            if command == MGR_CMD_UNSET or op == UNSET:
+                target.attributes.pop(key, None)
+            elif op in (INCR, DECR):
+                try:
+                    base = int(target.attributes.get(key, "0"))
+                    delta = int(value)
+                except (TypeError, ValueError):
+                    return self._fail(PBSE_BADATVAL)
+                target.attributes[key] = str(
+                    base + delta if op == INCR else base - delta
+                )
+            else:
+                target.attributes[key] = str(value)
+        return 0
+
+    def _stat_objects(
+        self,
+        connection: int,
+        collection: dict[str, _SimObject],
+        render: Callable[[_SimObject], dict[str, str]],
+        id: Optional[str],
+        attributes: Optional[attrl],
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        if id:
+            names = [i.strip() for i in id.split(",")]
+            objects = [collection[n] for n in names if n in collection]
+        else:
+            objects = list(collection.values())
+        project = self._projection(attributes)
+        return [project(render(o)) for o in objects]
+
+    @_ifl_call
+    def pbs_statque(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        return self._stat_objects(
+            connection, self.queues, self._render_queue, id, attributes
+        )
+
+    @_ifl_call
+    def pbs_statnode(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        return self._stat_objects(
+            connection, self.nodes, self._render_node, id, attributes
+        )
+
+    @_ifl_call
+    def pbs_stathook(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        return self._stat_objects(
+            connection,
+            self.hooks,
+            lambda hook: {"id": hook.name, **hook.attributes},
+            id,
+            attributes,
+        )
+
+    @_ifl_call
+    def pbs_statserver(
+        self, connection: int, attributes: Optional[attrl], extend: Optional[str]
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        return [self._project(self._render_server(), attributes)]
+
+    @_ifl_call
+    def pbs_statsched(
+        self, connection: int, attributes: Optional[attrl], extend: Optional[str]
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        return [
+            self._project(
+                {"id": self.scheduler.name, **self.scheduler.attributes},
+                attributes,
+            )
+        ]
+
+    @_ifl_call
+    def pbs_statrsc(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        names = [i.strip() for i in id.split(",")] if id else _RESOURCE_TYPES
+        return [
+            self._project(
+                {"id": name, "type": str(_RESOURCE_TYPES[name]), "flag": ""},
+                attributes,
+            )
+            for name in names
+            if name in _RESOURCE_TYPES
+        ]
+
+    @_ifl_call
+    def pbs_statresv(
+        self,
+        connection: int,
+        id: Optional[str],
+        attributes: Optional[attrl],
+        extend: Optional[str],
+    ) -> list[dict[str, str]]:
+        if not self._connected(connection):
+            return []
+        return []
+
+    @_ifl_call
+    def pbs_statfree(self, status: Optional[batch_status]) -> None:
+        return None
+
+    @_ifl_call
+    def pbs_terminate(self, connection: int, manner: int, extend: Optional[str]) -> int:
+        if not self._connected(connection):
+            return self.pbs_errno
+        self.server.attributes["server_state"] = "Terminating"
+        self._connections.clear()
+        return 0
@@ -1,5 +1,7 @@
 from typing import Literal, Optional, Union
 from ..extensions import *
+from .backend import get_backend
+from .pool import Connection, lease
 from pydantic import BaseModel
 from enum import Enum
 
@@ -87,11 +89,41 @@ class Attribute(BaseModel):
         attributes: list["Attribute"],
         with_op: bool = False,
         force_op: BatchOperation = None,
+    ) -> Union[attrl, attropl, list[tuple]]:
+        if not attributes:
+            return None
+
+        backend = get_backend()
+        if isinstance(attributes, AttributeList):
+            return attributes.build(backend, with_op, force_op)
+        return Attribute._convert(attributes, with_op, force_op, backend)
+
+    @staticmethod
+    def _convert(
+        attributes: list["Attribute"],
+        with_op: bool,
+        force_op: Optional[BatchOperation],
+        backend,
+    ) -> Union[attrl, attropl, list[tuple]]:
+        # Backends that build the chain themselves take plain tuples
+        if getattr(backend, "ATTRL_SEQUENCES", False):
+            if not with_op:
+                return [(i.name, i.resource, i.value) for i in attributes]
+            return [(i.name, i.resource, i.value, i._op(force_op)) for i in attributes]
+        return Attribute.link_attrl(attributes, with_op, force_op, backend)
+
+    @staticmethod
+    def link_attrl(
+        attributes: list["Attribute"],
+        with_op: bool = False,
+        force_op: BatchOperation = None,
+        backend=None,
     ) -> Union[attrl, attropl]:
-        if len(attributes) == 0:
+        if not attributes:
             return None
 
-        root = attropl() if with_op else attrl()
+        backend = backend if backend is not None else get_backend()
+        root = backend.attropl() if with_op else backend.attrl()
         current = root
         count = 1
         for i in attributes:
@@ -99,18 +131,19 @@ class Attribute(BaseModel):
             current.resource = i.resource
             current.value = i.value
             if with_op:
-                current.op = (
-                    (i.operation.value if i.operation else BatchOperation.EQ.value)
-                    if not force_op
-                    else force_op.value
-                )
+                current.op = i._op(force_op)
             if count < len(attributes):
-                current.next = attropl() if with_op else attrl()
+                current.next = backend.attropl() if with_op else backend.attrl()
                 current = current.next
             count += 1
 
         return root
 
+    def _op(self, force_op: Optional[BatchOperation]) -> int:
+        if force_op:
+            return force_op.value
+        return self.operation.value if self.operation else BatchOperation.EQ.value
+
     @classmethod
     def from_attrl(cls, attr: attrl) -> list["Attribute"]:
         results = []
@@ -129,6 +162,51 @@ class Attribute(BaseModel):
         return results
 
 
+class AttributeList(tuple):
+    """Immutable attribute list whose IFL form is built once per backend
+
+    Use for attribute lists sent with many calls, such as the projections of
+    pollers and the module-level attribute constants. `Attribute.make_attrl`
+    returns the cached structure instead of rebuilding it on every call.
+
+    Args:
+        attributes (Iterable[Attribute], optional): Attributes. Defaults to ().
+    """
+
+    def __new__(cls, attributes=()) -> "AttributeList":
+        return super().__new__(cls, attributes)
+
+    def __init__(self, attributes=()) -> None:
+        self._built: dict[tuple, tuple] = {}
+
+    def build(
+        self,
+        backend,
+        with_op: bool = False,
+        force_op: BatchOperation = None,
+    ) -> Union[attrl, attropl, list[tuple], None]:
+        """Gets the IFL form of the list for a backend, building it on first use
+
+        Args:
+            backend (Any): IFL backend the structure is passed to
+            with_op (bool, optional): Build `attropl` entries. Defaults to False.
+            force_op (BatchOperation, optional): Operation used for every entry. Defaults to None.
+
+        Returns:
+            Union[attrl, attropl, list[tuple], None]: Attribute structure, or None if the list is empty
+        """
+        key = (id(backend), with_op, force_op)
+        try:
+            owner, built = self._built[key]
+            if owner is backend:
+                return built
+        except KeyError:
+            pass
+        built = Attribute._convert(self, with_op, force_op, backend) if self else None
+        self._built[key] = (backend, built)
+        return built
+
+
 class ResourceResult(BaseModel):
     successful: bool
     available: Optional[int] = None
@@ -147,15 +225,16 @@ class BatchStatus(BaseModel):
         if len(statuses) == 0:
             return None
 
-        root = batch_status()
+        backend = get_backend()
+        root = backend.batch_status()
         current = root
         count = 1
         for i in statuses:
             current.name = i.name
             current.text = i.text
-            current.attribs = Attribute.make_attrl(i.attributes)
+            current.attribs = Attribute.link_attrl(i.attributes, backend=backend)
             if count < len(statuses):
-                current.next = batch_status()
+                current.next = backend.batch_status()
                 current = current.next
             count += 1
 
@@ -187,40 +266,42 @@ def connect(name: Union[str, None] = None) -> int:
     Returns:
         int: Connection ID, or < 0 if error.
     """
-    return pbs_connect(name)
+    return get_backend().pbs_connect(name)
 
 
 def run_asynchronous_job(
-    connection_id: int, job_id: str, location: Union[str, None] = None
+    connection_id: Connection, job_id: str, location: Union[str, None] = None
 ) -> int:
     """An "Asynchronous Run Job" request is generated and sent to the server over the connection.
     The server will validate the request and reply before initiating the execution of the job. This version of the call can be used to reduce latency in scheduling, especially when the scheduler must start a large number of jobs.
 
     Args:
-        connection_id (int): COnnection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID to be run, in the form `sequence_number.server`
         location (Union[str, None], optional): The location where the job should be run. Defaults to None.
 
     Returns:
         int: Result code (!= 0 is error)
     """
-    return pbs_asyrunjob(connection_id, job_id, location, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_asyrunjob(con, job_id, location, None)
 
 
-def alter_job(connection_id: int, job_id: str, attributes: list[Attribute] = []):
+def alter_job(connection_id: Connection, job_id: str, attributes: list[Attribute] = []):
     """Alters a job given an array of attributes
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         attributes (list[Attribute], optional): List of attributes to set. Defaults to [].
 
     Returns:
         _type_: _description_
     """
-    return pbs_alterjob(
-        connection_id, job_id, Attribute.make_attrl(attributes, with_op=True), None
-    )
+    with lease(connection_id) as con:
+        return get_backend().pbs_alterjob(
+            con, job_id, Attribute.make_attrl(attributes, with_op=True), None
+        )
 
 
 def default_server() -> str:
@@ -229,20 +310,21 @@ def default_server() -> str:
     Returns:
         str: Default server name
     """
-    return pbs_default()
+    return get_backend().pbs_default()
 
 
-def delete_job(connection_id: int, job_id: str) -> int:
+def delete_job(connection_id: Connection, job_id: str) -> int:
     """Deletes a job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (int): Job ID
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_deljob(connection_id, job_id, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_deljob(con, job_id, None)
 
 
 def disconnect(connection_id: int) -> int:
@@ -254,40 +336,42 @@ def disconnect(connection_id: int) -> int:
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_disconnect(connection_id)
+    return get_backend().pbs_disconnect(connection_id)
 
 
 def hold_job(
-    connection_id: int, job_id: str, hold_type: Literal["u", "o", "s"] = "u"
+    connection_id: Connection, job_id: str, hold_type: Literal["u", "o", "s"] = "u"
 ) -> int:
     """Hold a given job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         hold_type (Literal[&quot;u&quot;, &quot;o&quot;, &quot;s&quot;], optional): Hold Type (see documentation). Defaults to "u".
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_holdjob(connection_id, job_id, hold_type, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_holdjob(con, job_id, hold_type, None)
 
 
-def locate_job(connection_id: int, job_id: str) -> Union[str, None]:
+def locate_job(connection_id: Connection, job_id: str) -> Union[str, None]:
     """Locates a given job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
 
     Returns:
         Union[str, None]: Location or None if error
     """
-    return pbs_locjob(connection_id, job_id, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_locjob(con, job_id, None)
 
 
 def execute_manager_command(
-    connection_id: int,
+    connection_id: Connection,
     command: ManagerCommand,
     object: ManagerObject,
     object_name: str,
@@ -296,7 +380,7 @@ def execute_manager_command(
     """Executes a qmgr command on the given connection
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         command (ManagerCommand): Command
         object (ManagerObject): Object type
         object_name (str): Object name
@@ -305,37 +389,41 @@ def execute_manager_command(
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_manager(
-        connection_id,
-        command.value,
-        object.value,
-        object_name,
-        Attribute.make_attrl(attributes, with_op=True),
-        None,
-    )
-
-
-def move_job(connection_id: int, job_id: str, destination: Optional[str] = None) -> int:
+    with lease(connection_id) as con:
+        return get_backend().pbs_manager(
+            con,
+            command.value,
+            object.value,
+            object_name,
+            Attribute.make_attrl(attributes, with_op=True),
+            None,
+        )
+
+
+def move_job(
+    connection_id: Connection, job_id: str, destination: Optional[str] = None
+) -> int:
     """Moves a job to a new destination
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         destination (Optional[str], optional): Destination, default if None. Defaults to None.
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_movejob(connection_id, job_id, destination, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_movejob(con, job_id, destination, None)
 
 
 def message_job(
-    connection_id: int, job_id: str, file: MessageFile, message: str
+    connection_id: Connection, job_id: str, file: MessageFile, message: str
 ) -> int:
     """Sends a message to the output file of a job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         file (MessageFile): Which file to send to
         message (str): Message to send
@@ -343,51 +431,57 @@ def message_job(
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_msgjob(connection_id, job_id, file, message, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_msgjob(con, job_id, file.value, message, None)
 
 
-def swap_jobs(connection_id: int, job_id_1: str, job_id_2: str) -> int:
+def swap_jobs(connection_id: Connection, job_id_1: str, job_id_2: str) -> int:
     """Swaps the order of two jobs in the queue
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id_1 (str): Job ID
         job_id_2 (str): Job ID
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_orderjob(connection_id, job_id_1, job_id_2, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_orderjob(con, job_id_1, job_id_2, None)
 
 
-def rerun_job(connection_id: int, job_id: str) -> int:
+def rerun_job(connection_id: Connection, job_id: str) -> int:
     """Rerun a given job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_rerunjob(connection_id, job_id, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_rerunjob(con, job_id, None)
 
 
-def run_job(connection_id: int, job_id: str, location: Optional[str] = None) -> int:
+def run_job(
+    connection_id: Connection, job_id: str, location: Optional[str] = None
+) -> int:
     """Runs a given job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         location (Optional[str], optional): Location to run at. Defaults to None.
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_runjob(connection_id, job_id, location, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_runjob(con, job_id, location, None)
 
 
 def select_jobs(
-    connection_id: int,
+    connection_id: Connection,
     attributes: list[Attribute],
     historical: bool = False,
     subjobs: bool = False,
@@ -395,45 +489,50 @@ def select_jobs(
     """Select jobs based on criteria
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         attributes (list[Attribute]): Attributes to match
 
     Returns:
         list[str]: List of results
     """
-    result = pbs_selectjob(
-        connection_id,
-        Attribute.make_attrl(attributes, with_op=True),
-        f"{'x' if historical else ''}{'t' if subjobs else ''}",
-    )
+    with lease(connection_id) as con:
+        result = get_backend().pbs_selectjob(
+            con,
+            Attribute.make_attrl(attributes, with_op=True),
+            f"{'x' if historical else ''}{'t' if subjobs else ''}",
+        )
     return [] if result == None else result
 
 
-def signal_job(connection_id: int, job_id: str, signal: str) -> int:
+def signal_job(connection_id: Connection, job_id: str, signal: str) -> int:
     """Sends an OS signal to the job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         signal (str): Signal to send
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_sigjob(connection_id, job_id, signal, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_sigjob(con, job_id, signal, None)
 
 
 def stat_free(status: list[BatchStatus]) -> None:
     """Free space held by stat functions
 
+    Results of the stat functions are already converted and freed by the
+    extension; this only releases chains built from ``BatchStatus`` objects.
+
     Args:
         status (list[BatchStatus]): List of statuses to free
     """
-    pbs_statfree(BatchStatus.make_batch_status(status))
+    get_backend().pbs_statfree(BatchStatus.make_batch_status(status))
 
 
 def stat_job(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     historical: bool = False,
@@ -443,23 +542,24 @@ def stat_job(
     """Get status of job(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_statjob(
-        connection_id,
-        id,
-        Attribute.make_attrl(attributes),
-        f"{'x' if historical else ''}{'t' if subjobs else ''}",
-    )
+    with lease(connection_id) as con:
+        return get_backend().pbs_statjob(
+            con,
+            id,
+            Attribute.make_attrl(attributes),
+            f"{'x' if historical else ''}{'t' if subjobs else ''}",
+        )
 
 
 def stat_node(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     **kwargs,
@@ -467,18 +567,21 @@ def stat_node(
     """Get status of nodes(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_statnode(connection_id, id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statnode(
+            con, id, Attribute.make_attrl(attributes), None
+        )
 
 
 def stat_queue(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     **kwargs,
@@ -486,33 +589,37 @@ def stat_queue(
     """Get status of queue(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_statque(connection_id, id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statque(
+            con, id, Attribute.make_attrl(attributes), None
+        )
 
 
 def stat_server(
-    connection_id: int, attributes: list[Attribute] = [], **kwargs
+    connection_id: Connection, attributes: list[Attribute] = [], **kwargs
 ) -> list[dict]:
     """Get status of server
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: Server status
     """
-    return pbs_statserver(connection_id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statserver(con, Attribute.make_attrl(attributes), None)
 
 
 def stat_resource(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     **kwargs,
@@ -520,33 +627,37 @@ def stat_resource(
     """Get status of resource(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_statrsc(connection_id, id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statrsc(
+            con, id, Attribute.make_attrl(attributes), None
+        )
 
 
 def stat_scheduler(
-    connection_id: int, attributes: list[Attribute] = [], **kwargs
+    connection_id: Connection, attributes: list[Attribute] = [], **kwargs
 ) -> list[dict]:
     """Get status of scheduler
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: Scheduler status
     """
-    return pbs_statsched(connection_id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statsched(con, Attribute.make_attrl(attributes), None)
 
 
 def stat_reservation(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     **kwargs,
@@ -554,18 +665,21 @@ def stat_reservation(
     """Get status of reservation(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_statresv(connection_id, id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_statresv(
+            con, id, Attribute.make_attrl(attributes), None
+        )
 
 
 def stat_hook(
-    connection_id: int,
+    connection_id: Connection,
     id: Optional[str] = "",
     attributes: list[Attribute] = [],
     **kwargs,
@@ -573,18 +687,21 @@ def stat_hook(
     """Get status of hook(s)
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         id (Optional[str], optional): Object ID or blank for all. Defaults to "".
         attributes (list[Attribute], optional): List of filter attributes. Defaults to None.
 
     Returns:
         list[dict]: List of statuses
     """
-    return pbs_stathook(connection_id, id, Attribute.make_attrl(attributes), None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_stathook(
+            con, id, Attribute.make_attrl(attributes), None
+        )
 
 
 def submit_job(
-    connection_id: int,
+    connection_id: Connection,
     attributes: list[Attribute],
     script: str,
     destination: Optional[str] = None,
@@ -592,7 +709,7 @@ def submit_job(
     """Submits a job to PBS
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         attributes (list[Attribute]): Attributes
         script (str): Script path
         destination (Optional[str], optional): Destination. Defaults to None.
@@ -600,39 +717,42 @@ def submit_job(
     Returns:
         str: Created job ID
     """
-    return pbs_submit(
-        connection_id,
-        Attribute.make_attrl(attributes, with_op=True, force_op=BatchOperation.SET),
-        script,
-        destination,
-        None,
-    )
+    with lease(connection_id) as con:
+        return get_backend().pbs_submit(
+            con,
+            Attribute.make_attrl(attributes, with_op=True, force_op=BatchOperation.SET),
+            script,
+            destination,
+            None,
+        )
 
 
-def terminate(connection_id: int, manner: TerminationMode) -> int:
+def terminate(connection_id: Connection, manner: TerminationMode) -> int:
     """Terminate batch server
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         manner (TerminationMode): How to shut down
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_terminate(connection_id, manner, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_terminate(con, manner.value, None)
 
 
 def release_job(
-    connection_id: int, job_id: str, hold_type: Literal["u", "o", "s"] = "u"
+    connection_id: Connection, job_id: str, hold_type: Literal["u", "o", "s"] = "u"
 ) -> int:
     """Release held job
 
     Args:
-        connection_id (int): Connection ID
+        connection_id (Connection): Connection ID or pool
         job_id (str): Job ID
         hold_type (Literal[&quot;u&quot;, &quot;o&quot;, &quot;s&quot;], optional): Hold Type. Defaults to "u".
 
     Returns:
         int: 0 if successful, otherwise error
     """
-    return pbs_rlsjob(connection_id, job_id, hold_type, None)
+    with lease(connection_id) as con:
+        return get_backend().pbs_rlsjob(con, job_id, hold_type, None)
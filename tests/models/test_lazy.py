@@ -0,0 +1,48 @@
+from pytest import raises
+from python_pbs.pbs.models import Job, JobState, LazyJob
+
+DATA = {
+    "id": "1.server",
+    "Job_Name": "test",
+    "Job_Owner": "alice@host",
+    "job_state": "Q",
+    "Resource_List.ncpus": "4",
+    "Resource_List.mem": "1gb",
+    "Rerunable": "False",
+}
+
+
+def test_fields_parse_on_access():
+    job = LazyJob(DATA)
+    assert "job_state" not in vars(job)
+    assert job.job_state == JobState.QUEUED
+    assert "job_state" in vars(job)
+    assert job.job_owner == "alice@host"
+    assert job.resource_list == {"ncpus": 4, "mem": 1 << 30}
+    assert job.rerunable is False
+    assert job.exit_status is None
+    assert job.project == "_pbs_project_default"
+
+
+def test_materialize():
+    assert LazyJob(DATA).materialize() == Job.from_pbs(DATA)
+
+
+def test_read_only():
+    job = LazyJob(DATA)
+    with raises(AttributeError):
+        job.job_name = "other"
+    with raises(AttributeError):
+        job.not_a_field
+
+
+def test_shared_strings():
+    copies = [{k.encode().decode(): v.encode().decode() for k, v in DATA.items()}]
+    copies.append({k.encode().decode(): v.encode().decode() for k, v in DATA.items()})
+    first, second = [LazyJob(data) for data in copies]
+    assert first.raw == DATA
+    assert first.raw["Job_Owner"] is second.raw["Job_Owner"]
+    assert [*first.raw][1] is [*second.raw][1]
+    assert first.raw["id"] is not second.raw["id"]
+    models = [Job.from_pbs(data) for data in copies]
+    assert models[0].job_owner is models[1].job_owner
@@ -0,0 +1,33 @@
+from pytest import raises
+from python_pbs.pbs.models import Job, JobState, LiteJob, LiteQueue, Queue
+
+DATA = {
+    "id": "1.server",
+    "Job_Name": "test",
+    "job_state": "R",
+    "Resource_List.ncpus": "4",
+    "resources_used.walltime": "00:01:00",
+    "Exit_status": "0",
+}
+
+
+def test_lite_round_trip():
+    job = LiteJob.from_pbs(DATA)
+    assert job.job_state == JobState.RUNNING
+    assert job.resource_list == {"ncpus": 4}
+    assert job.resources_used == {"walltime": 60}
+    assert job.job_name == "test" and job.project == "_pbs_project_default"
+    assert job.to_model() == Job.from_pbs(DATA)
+    assert LiteJob.from_model(Job.from_pbs(DATA)) == job
+
+    other = LiteJob.from_pbs({"id": "2.server"})
+    assert other.resources_released is LiteJob.from_pbs(DATA).resources_released
+    assert other.to_model().resources_released == {}
+
+    with raises(AttributeError):
+        job.job_name = "other"
+    with raises(TypeError):
+        other.resources_released["ncpus"] = 1
+
+    queue = {"id": "workq", "queue_type": "Execution", "state_count": "Queued:2"}
+    assert LiteQueue.from_pbs(queue).to_model() == Queue.from_pbs(queue)
@@ -0,0 +1,64 @@
+from pydantic import ValidationError
+from pytest import raises
+from python_pbs.pbs.models import Job, JobState, Node, NodeState, Queue, Server
+from python_pbs.pbs.models.job import JobAccrueType
+
+
+def test_job_single_pass():
+    data = {
+        "id": "1.server",
+        "Job_Name": "test",
+        "job_state": "R",
+        "Resource_List.ncpus": "4",
+        "Resource_List.walltime": "01:00:00",
+        "resources_used.cput": "00:00:10",
+        "Rerunable": "False",
+        "Exit_status": "0",
+        "accrue_type": "3",
+        "estimated.start_time": "100",
+    }
+    job = Job.from_pbs(data)
+    assert job.job_name == "test"
+    assert job.job_state == JobState.RUNNING
+    assert job.resource_list == {"ncpus": 4, "walltime": 3600}
+    assert job.resources_used == {"cput": 10}
+    assert job.rerunable is False
+    assert job.exit_status == 0
+    assert job.accrue_type == JobAccrueType.RUN_TIME
+    assert "resource_list" not in data
+
+
+def test_matches_validation():
+    data = {
+        "id": "node1",
+        "state": "free",
+        "pcpus": "8",
+        "resv_enable": "True",
+        "resources_available.ncpus": "8",
+        "resources_available.mem": "16gb",
+    }
+    parsed = Node.from_pbs(data)
+    assert parsed.state == NodeState.FREE
+    assert parsed == Node.model_validate(
+        {
+            **data,
+            "resources_available": {"ncpus": 8, "mem": 16 << 30},
+            "resources_assigned": {},
+        }
+    )
+
+
+def test_nested_and_filled():
+    queue = Queue.from_pbs({"id": "workq", "queue_type": "Execution"})
+    assert queue.state_count.queued == 0
+
+    server = Server.from_pbs(
+        {"id": "server", "state_count": "Queued:3 Running:1", "FLicenses": "5"}
+    )
+    assert server.state_count.queued == 3
+    assert server.FLicenses == 5
+
+
+def test_invalid_falls_back_to_validation():
+    with raises(ValidationError):
+        Job.from_pbs({"id": "1.server", "job_state": "not-a-state"})
@@ -0,0 +1,42 @@
+from pytest import raises
+from python_pbs.pbs.models import ArrayStateCount, Job, LazyJob, RangeSet
+
+
+def test_range_set():
+    indices = RangeSet.from_string("1-1000:2,2001-3000")
+    assert indices.runs == ((1, 999, 2), (2001, 3000, 1))
+    assert len(indices) == 1500
+    assert 999 in indices and 2500 in indices
+    assert 998 not in indices and 1001 not in indices and 3001 not in indices
+    assert str(indices) == "1-999:2,2001-3000"
+    assert RangeSet.from_string("-") == RangeSet() and not RangeSet.from_string("")
+
+    done = RangeSet.from_string("0-9") - RangeSet.from_string("3-5,8")
+    assert list(done) == [0, 1, 2, 6, 7, 9]
+    assert str(done) == "0-2,6-7,9"
+    assert RangeSet.from_indices([4, 2, 3, 7]) == RangeSet.from_string("2-4,7")
+    assert RangeSet.from_string("1-9:2,2-10:2") == RangeSet.from_string("1-10")
+
+    with raises(ValueError):
+        RangeSet.from_string("4-2")
+    with raises(ValueError):
+        RangeSet.from_string("1-x")
+
+
+def test_array_fields():
+    data = {
+        "id": "7[].server",
+        "array": "True",
+        "array_indices_submitted": "0-9999",
+        "array_indices_remaining": "5000-9999",
+        "array_state_count": "Queued:5000 Running:10 Exiting:0 Expired:4990 ",
+    }
+    for job in (Job.from_pbs(data), LazyJob(data)):
+        assert len(job.array_indices_submitted) == 10000
+        assert 4999 not in job.array_indices_remaining
+        assert job.array_state_count == ArrayStateCount(
+            queued=5000, running=10, expired=4990
+        )
+    validated = Job.model_validate({"array_indices_remaining": "5000-9999"})
+    assert validated.array_indices_remaining == RangeSet([(5000, 9999, 1)])
+    assert Job.from_pbs(data).model_dump()["array_indices_submitted"] == "0-9999"
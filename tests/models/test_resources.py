@@ -0,0 +1,67 @@
+from python_pbs import PBS
+from python_pbs.pbs.models import (
+    Job,
+    Queue,
+    ResourceCodec,
+    format_duration,
+    format_size,
+    parse_duration,
+    parse_size,
+)
+from python_pbs.pbs.models.resources import TYPE_BOOLEAN, TYPE_FLOAT, TYPE_SIZE
+from python_pbs.util import PBSSimulator
+
+
+def test_units():
+    assert parse_size("16gb") == parse_size("16GB") == 16 << 30
+    assert parse_size("2mw") == 2 << 20 << 3
+    assert parse_size("100") == 100
+    assert parse_duration("24:00:00") == 86400
+    assert parse_duration("90:30") == 5430
+    assert parse_duration("1.5") == 1.5
+    assert format_size(16 << 30) == "16gb" and format_size(0) == "0b"
+    assert format_duration(86400) == "24:00:00"
+    assert format_duration(5430.25) == "01:30:30.25"
+
+
+def test_codec():
+    codec = ResourceCodec(cache_size=2)
+    codec.update([("scratch", TYPE_SIZE), ("load", str(TYPE_FLOAT))])
+    assert codec.decode("scratch", "1tb") == 1 << 40
+    assert codec.decode("load", "0.5") == 0.5
+    assert codec.decode("custom", "12") == 12
+    assert codec.decode("custom", "a:b") == "a:b"
+    assert codec.decode("mem", "lots") == "lots"
+    assert len(codec._cache) == 2
+    codec.decode("custom", "a:b")
+    assert codec.hits == 1
+    assert codec.encode("mem", 16 << 30) == "16gb"
+    assert codec.encode("mem", 1536) == "1536b"
+    assert codec.encode("mem", "2gb") == "2gb"
+
+    queue = Queue.from_pbs({"id": "workq", "resources_max.walltime": "48:00:00"})
+    assert queue.resources_max == {"walltime": 172800}
+    job = Job.from_pbs({"id": "1.server", "resources_used.vmem": "2048kb"})
+    assert job.resources_used == {"vmem": 2 << 20}
+
+
+def test_codec_round_trip():
+    codec = ResourceCodec()
+    codec.update([("exclusive", TYPE_BOOLEAN), ("load", TYPE_FLOAT)])
+    values = [
+        ("mem", 16 << 30),
+        ("vmem", 3 << 20),
+        ("pmem", 1000),
+        ("walltime", 86400),
+        ("cput", 1.5),
+        ("exclusive", True),
+        ("exclusive", False),
+        ("load", 0.25),
+    ]
+    for resource, value in values:
+        assert codec.decode(resource, codec.encode(resource, value)) == value
+
+
+def test_load_resource_types(simulator: PBSSimulator, pbs: PBS):
+    assert pbs.load_resource_types() > 0
+    assert simulator.calls["pbs_statrsc"] == 1
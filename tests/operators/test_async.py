@@ -0,0 +1,47 @@
+import asyncio
+
+from python_pbs import AsyncPBS, JobAttribute, StatCache
+from python_pbs.pbs.models import JobState
+from python_pbs.util import PBSSimulator
+
+
+def test_async_client(simulator: PBSSimulator):
+    simulator.generate_jobs(6, owners=["alice", "bob"])
+    simulator.latency = 0.02
+
+    async def main():
+        async with AsyncPBS(max_workers=2) as pbs:
+            jobs, selected, node = await asyncio.gather(
+                pbs.jobs.stat(),
+                pbs.jobs.select([JobAttribute(name="euser", value="bob")]),
+                pbs.nodes.get("node1"),
+            )
+            assert len(jobs) == 6 and len(selected) == 3
+            assert node.id == "node1"
+
+            submitted = await pbs.submit_command("/bin/true", name="async")
+            await pbs.jobs.hold(submitted.id)
+            assert (await pbs.jobs.get(submitted.id)).job_state == JobState.HELD
+            await pbs.jobs.alter(
+                submitted.id, [JobAttribute(name="job_name", value="renamed")]
+            )
+            await pbs.jobs.release(submitted.id)
+            await pbs.jobs.delete(submitted.id)
+            assert await pbs.jobs.get(submitted.id) is None
+            waited = await pbs.jobs.wait_for([submitted.id], interval=0.001)
+            assert list(waited.done) == [submitted.id] and waited.pending == []
+            return len(pbs._clients)
+
+    assert asyncio.run(main()) <= 2
+    assert simulator._connections == set()
+
+
+def test_async_writes_invalidate(simulator: PBSSimulator):
+    async def main():
+        async with AsyncPBS(max_workers=1, cache=StatCache(ttl=60)) as pbs:
+            submitted = await pbs.submit_command("/bin/true")
+            assert (await pbs.jobs.get(submitted.id)).job_state == JobState.QUEUED
+            await pbs.jobs.hold(submitted.id)
+            assert (await pbs.jobs.get(submitted.id)).job_state == JobState.HELD
+
+    asyncio.run(main())
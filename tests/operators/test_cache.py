@@ -0,0 +1,61 @@
+import time
+
+from python_pbs import PBS, StatCache
+from python_pbs.pbs.models import JobState
+from python_pbs.util import PBSSimulator
+
+
+def test_stat_cache(simulator: PBSSimulator):
+    simulator.generate_jobs(3)
+    cache = StatCache(ttl=60, max_size=4)
+    pbs = PBS(cache=cache)
+
+    before = simulator.calls["pbs_statjob"]
+    jobs = pbs.jobs.all
+    assert len(pbs.jobs.all) == 3 and jobs[0] is not pbs.jobs.all[0]
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    pbs.status
+    jobs[0].hold()
+    assert pbs.jobs.all[0].data.job_state == JobState.HELD
+    assert simulator.calls["pbs_statjob"] == before + 3
+    assert all(key[0] != "server" for key in cache._entries)
+
+    pbs.submit_command("/bin/true")
+    assert len(pbs.jobs.all) == 4
+
+    for i in range(5):
+        pbs.nodes.stat(fields=["state", f"resources_available.r{i}"])
+    assert len(cache) == 4
+
+
+def test_stat_cache_ttl(simulator: PBSSimulator):
+    pbs = PBS(cache=StatCache(ttl=0.01))
+    assert pbs.queues["workq"].data.enabled
+    simulator.queues["workq"].attributes["enabled"] = "False"
+    assert pbs.queues["workq"].data.enabled
+    time.sleep(0.02)
+    assert not pbs.queues["workq"].data.enabled
+
+    pbs.queues["workq"].set("enabled", True)
+    assert pbs.queues["workq"].data.enabled
+
+
+def test_stat_cache_copies(simulator: PBSSimulator):
+    simulator.generate_jobs(2, ncpus=2)
+    pbs = PBS(cache=StatCache(ttl=60))
+    for record_type in ("model", "lazy", "lite"):
+        first = pbs.jobs.stat(record_type=record_type)[0].data
+        first.resource_list["ncpus"] = 99
+        again = pbs.jobs.stat(record_type=record_type)[0].data
+        assert again.resource_list["ncpus"] == 2
+        again.resource_list["ncpus"] = 98
+        assert (
+            pbs.jobs.stat(record_type=record_type)[0].data.resource_list["ncpus"] == 2
+        )
+    assert pbs.cache.misses == 3 and pbs.cache.hits == 6
+
+    queue = pbs.queues["workq"].data
+    queue.enabled = False
+    assert pbs.queues["workq"].data.enabled
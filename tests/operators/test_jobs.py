@@ -0,0 +1,291 @@
+import asyncio
+
+from pytest import raises
+from python_pbs import (
+    PBS,
+    JobAttribute,
+    JobFinished,
+    JobResourcesUpdated,
+    JobStateChanged,
+    JobSubmitted,
+    JobWaiter,
+    JobWatcher,
+    PBSException,
+    WaitCondition,
+    job_id_key,
+)
+from python_pbs.pbs.models import Job, JobSpec, JobState, LazyJob, LiteJob
+from python_pbs.util import Attribute, PBSSimulator, stat_job
+
+
+def test_lazy_records(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(4, owners=["alice", "bob"])
+    jobs = pbs.jobs.select(
+        criteria=[JobAttribute(name="euser", value="alice")], record_type="lazy"
+    )
+    assert len(jobs) == 2
+    assert all(isinstance(j.data, LazyJob) for j in jobs)
+    assert jobs[0].data.job_state == JobState.QUEUED
+
+    jobs[0].reload()
+    assert isinstance(jobs[0].data, Job)
+
+
+def test_lite_records(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(3)
+    jobs = pbs.jobs.stat(record_type="lite")
+    assert all(isinstance(j.data, LiteJob) for j in jobs)
+    assert jobs[0].data.to_model() == pbs.jobs.get(jobs[0].data.id).data
+    nodes = pbs.nodes.stat(record_type="lite")
+    assert nodes[0].data.resources_available["ncpus"] == 8
+
+
+def test_field_projection(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(3, ncpus=2)
+    jobs = pbs.jobs.stat(fields=["id", "job_state", "resource_list.ncpus"])
+    assert len(jobs) == 3
+    assert jobs[0].data.model_fields_set == {
+        "id",
+        "job_state",
+        "resource_list",
+        "resources_used",
+        "resources_released",
+        "resource_release_list",
+    }
+    assert jobs[0].data.resource_list == {"ncpus": 2}
+
+    projected = pbs.jobs.with_fields(["job_owner"])
+    assert {j.data.job_owner for j in projected.all} == {
+        f"{simulator.user}@{simulator.host}"
+    }
+    assert projected.all[0].data.job_name == Job().job_name
+
+
+def test_iter_select_chunks(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(25)
+    before = simulator.calls["pbs_statjob"]
+    jobs = pbs.jobs.iter_select(chunk_size=10)
+    first = next(jobs)
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert len([first, *jobs]) == 25
+    assert simulator.calls["pbs_statjob"] == before + 3
+    assert len(pbs.jobs.select(chunk_size=7)) == 25
+
+
+def test_get_without_full_scan(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(50)
+    jobs = pbs.jobs
+    before = simulator.calls["pbs_statjob"]
+
+    assert jobs.get("999") is None
+    assert jobs.get("999.other-server") is None
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert jobs.resolver.negative_hits == 1
+
+    job = jobs.get("7")
+    assert job.data.id == f"7.{simulator.server_name}"
+    assert jobs.resolver.target("job", " 7 ") == job.data.id
+    job.delete()
+    assert jobs.get(job.data.id) is None
+    assert jobs.get(job.data.id, historical=True).data.job_state == JobState.FINISHED
+    assert simulator.calls["pbs_statjob"] == before + 4
+
+
+def test_job_id_key():
+    assert job_id_key("123") == "123"
+    assert job_id_key(" 123.server.example.com ") == "123"
+    assert job_id_key("123[].server") == "123[]"
+    assert job_id_key("123[4]") == "123[4]"
+    assert job_id_key("123[1-4:2].server") == "123[1-4:2].server"
+
+
+def test_bulk_control(simulator: PBSSimulator):
+    simulator.generate_jobs(20, ncpus=1)
+    simulator.advance()
+    with PBS(pool_size=4) as pbs:
+        ids = [j.data.id for j in pbs.jobs.all]
+        running, queued = ids[:8], ids[8:]
+
+        assert set(pbs.jobs.bulk_hold(queued).values()) == {0}
+        assert set(pbs.jobs.bulk_signal(running, "suspend").values()) == {0}
+        results = pbs.jobs.bulk_release(queued + ["999"])
+        assert results["999"] == 15001 and list(results)[:-1] == queued
+        assert set(pbs.jobs.bulk_rerun(queued[:2]).values()) != {0}
+        assert set(pbs.jobs.bulk_delete(ids).values()) == {0}
+        assert pbs.jobs.all == []
+        assert simulator.calls["pbs_statjob"] == 2
+
+
+def test_submit_many(simulator: PBSSimulator):
+    simulator.add_queue("stopped", enabled=False)
+    specs = [
+        JobSpec(
+            executable="/bin/echo", args=[str(i)], attributes={"Resource_List.ncpus": 2}
+        )
+        for i in range(6)
+    ]
+    specs.append(JobSpec(executable="/bin/false", queue="stopped"))
+    with PBS(pool_size=3) as pbs:
+        results = pbs.submit_many(specs)
+        assert [r.successful for r in results] == [True] * 6 + [False]
+        assert results[-1].code == 15023 and results[0].job is None
+        assert simulator.calls["pbs_statjob"] == 0
+
+        results = pbs.submit_many(specs[:4], status=True)
+        assert simulator.calls["pbs_statjob"] == 1
+        assert [r.job.resource_list["ncpus"] for r in results] == [2] * 4
+        lite = pbs.submit_many(specs[:1], status=True, record_type="lite")
+        assert isinstance(lite[0].job, LiteJob)
+
+        typed = JobSpec(
+            executable="/bin/true",
+            attributes={"Resource_List.mem": 2 << 30, "Resource_List.walltime": 3600},
+        )
+        job = pbs.submit_many([typed], status=True)[0].job
+        assert job.resource_list["mem"] == 2 << 30
+        assert job.resource_list["walltime"] == 3600
+        raw = stat_job(
+            pbs.connection, id=job.id, attributes=[Attribute(name="Resource_List")]
+        )
+        assert raw[0]["Resource_List.mem"] == "2gb"
+
+        attributes = {"job_name": "sweep"}
+        pbs.submit_command("/bin/true", attributes=attributes)
+        assert attributes == {"job_name": "sweep"}
+        job = pbs.submit_command("/bin/true")
+        assert job.data.job_name != "sweep"
+
+
+def test_array_progress(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    farm = pbs.submit_task_farm([f"echo {i}" for i in range(20)], str(tmp_path))
+    simulator.advance()
+    seq = farm.id.split("[", 1)[0]
+    for index in range(3):
+        simulator.finish(f"{seq}[{index}]", 0)
+
+    job = pbs.jobs.get(farm.id)
+    before = simulator.calls["pbs_statjob"]
+    progress = job.array_progress(refresh=True)
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert len(progress.submitted) == 20
+    assert str(progress.queued) == "8-19"
+    assert str(progress.started) == "0-7"
+    assert progress.counts.running == 5 and progress.counts.expired == 3
+    assert progress.finished is None
+    progress = job.array_progress(indices=True)
+    assert simulator.calls["pbs_statjob"] == before + 2
+    assert str(progress.active) == "3-7" and str(progress.finished) == "0-2"
+
+
+def test_watch(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(2, owners=["alice"])
+    events = pbs.jobs.watch(
+        criteria=[JobAttribute(name="euser", value="alice")],
+        include_existing=True,
+        min_interval=0.001,
+        max_interval=0.01,
+    )
+    submitted = [next(events), next(events)]
+    assert all(isinstance(e, JobSubmitted) for e in submitted)
+    first, second = (e.id for e in submitted)
+
+    simulator.advance()
+    changed = [next(events) for _ in range(4)]
+    assert {
+        (e.id, e.previous, e.state) for e in changed if isinstance(e, JobStateChanged)
+    } == {
+        (first, JobState.QUEUED, JobState.RUNNING),
+        (second, JobState.QUEUED, JobState.RUNNING),
+    }
+    assert {type(e) for e in changed} == {JobStateChanged, JobResourcesUpdated}
+
+    simulator.finish(first, 2)
+    finished = next(e for e in events if isinstance(e, JobFinished))
+    assert finished.id == first and finished.exit_status == 2
+
+    # Without criteria each poll is a single stat of the unfinished jobs, and
+    # history is only fetched for the jobs that left it
+    watcher = JobWatcher(pbs.jobs)
+    assert watcher.poll() == [] and set(watcher.snapshot) == {second}
+    before = simulator.calls["pbs_statjob"]
+    simulator.finish(second, 0)
+    events = watcher.poll()
+    assert JobStateChanged in map(type, events)
+    assert events[-1] == JobFinished(id=second, job=events[-1].job, exit_status=0)
+    assert watcher.finished == {second}
+    assert watcher.poll() == [] and watcher.interval > watcher.min_interval
+    assert simulator.calls["pbs_statjob"] == before + 3
+
+
+def test_watch_missing_jobs(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(2)
+    first, second = (j.data.id for j in pbs.jobs.all)
+    simulator.advance()
+    watcher = JobWatcher(pbs.jobs)
+    assert watcher.poll() == []
+
+    simulator.server.attributes["job_history_enable"] = "False"
+    simulator.finish(first, 0)
+    events = watcher.poll()
+    assert events == [JobFinished(id=first, job=events[0].job)]
+
+    # A failed stat is not a finished job
+    simulator.restart()
+    assert watcher.poll() == [] and set(watcher.snapshot) == {second}
+
+
+def test_wait_for(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(3, runtime=10)
+    ids = [j.data.id for j in pbs.jobs.all]
+    simulator.advance()
+
+    result = pbs.jobs.wait_for(ids, timeout=0.01, interval=0.001)
+    assert result.done == {} and result.pending == ids
+
+    simulator.finish(ids[1], 1)
+    before = simulator.calls["pbs_statjob"]
+    result = pbs.jobs.wait_for(
+        ids, return_when=WaitCondition.ANY_FAILED, interval=0.001
+    )
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert list(result.failed) == [ids[1]] and result.done[ids[1]].exit_status == 1
+    assert result.pending == [ids[0], ids[2]]
+
+    simulator.advance(10)
+    result = pbs.jobs.wait_for(ids, interval=0.001)
+    assert result.pending == []
+    assert {id: job.exit_status for id, job in result.done.items()} == {
+        ids[0]: 0,
+        ids[1]: 1,
+        ids[2]: 0,
+    }
+
+    # Only an explicit unknown-job error finishes a job; a failed stat does not
+    missing = f"999.{simulator.server_name}"
+    result = pbs.jobs.wait_for([ids[0], missing], interval=0.001)
+    assert result.pending == [] and result.done[missing].exit_status is None
+    waiter = JobWaiter(ids)
+    assert not waiter.update([]) and list(waiter.pending.values()) == ids
+    simulator.restart()
+    with raises(PBSException):
+        pbs.jobs.wait_for(ids, timeout=0.01, interval=0.001)
+
+
+def test_wait_for_async(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(2)
+    ids = [j.data.id for j in pbs.jobs.all]
+    simulator.advance()
+
+    async def run():
+        waiting = asyncio.ensure_future(
+            pbs.jobs.wait_for_async(
+                ids, return_when=WaitCondition.FIRST, interval=0.001
+            )
+        )
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        simulator.finish(ids[0], 0)
+        return await asyncio.wait_for(waiting, 1)
+
+    result = asyncio.run(run())
+    assert list(result.done) == [ids[0]] and result.pending == [ids[1]]
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from python_pbs import PBS, AsyncLogTailer, JobOutputFile, LogBatch, LogTailer
+from python_pbs.util import PBSSimulator
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_log_tailer(tmp_path, use_inotify):
+    tailer = LogTailer(str(tmp_path), poll_interval=0.01, use_inotify=use_inotify)
+    assert tailer.inotify == use_inotify
+    output = tmp_path / "1.server.OU"
+    output.write_text("first\nsecond\npart")
+    tailer.follow("1.server")
+    tailer.follow("2.server", [JobOutputFile.OUTPUT])
+
+    assert tailer.poll(1) == [
+        LogBatch("1.server", JobOutputFile.OUTPUT, ["first", "second"])
+    ]
+    assert tailer.poll(0.05) == []
+
+    with output.open("a") as f:
+        f.write("ial\nthird\n")
+    (tmp_path / "2.server.OU").write_text("other\n")
+    batches = []
+    while len(batches) < 2:
+        batches += tailer.poll(1)
+    assert sorted(batches) == [
+        LogBatch("1.server", JobOutputFile.OUTPUT, ["partial", "third"]),
+        LogBatch("2.server", JobOutputFile.OUTPUT, ["other"]),
+    ]
+
+    output.write_text("new\n")
+    assert tailer.poll(1) == [LogBatch("1.server", JobOutputFile.OUTPUT, ["new"])]
+
+    with output.open("a") as f:
+        f.write("last")
+    output.unlink()
+    (tmp_path / "2.server.OU").unlink()
+    batches = tailer.poll(1)
+    assert LogBatch("1.server", JobOutputFile.OUTPUT, ["last"], True) in batches
+    while ("2.server", JobOutputFile.OUTPUT) in tailer.following:
+        tailer.poll(1)
+    assert tailer.following == [("1.server", JobOutputFile.ERROR)]
+    tailer.close()
+
+
+def test_job_logs(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    job = pbs.submit_command("/bin/true")
+    output = tmp_path / f"{job.data.id}.OU"
+    output.write_text("hello\npart")
+    lines = job.logs(spool_path=str(tmp_path), yield_waiting=True)
+    assert next(lines) == "hello\n"
+    assert next(lines) is None
+    with output.open("a") as f:
+        f.write("ial\nlast")
+    assert next(lines) == "partial\n"
+    output.unlink()
+    # The unterminated last line is not given a newline it never had
+    assert [line for line in lines if line is not None] == ["last"]
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_async_log_tailer(tmp_path, use_inotify):
+    async def run():
+        output = tmp_path / "1.server.OU"
+        output.write_text("".join(f"line {i}\n" for i in range(100)))
+        async with AsyncLogTailer(
+            str(tmp_path),
+            max_batches=2,
+            chunk_size=32,
+            batch_size=64,
+            poll_interval=0.01,
+            use_inotify=use_inotify,
+        ) as tailer:
+            await tailer.follow("1.server", [JobOutputFile.OUTPUT])
+            await asyncio.sleep(0.1)
+            # Reading pauses while the buffer is full instead of reading ahead
+            assert tailer._queue.full()
+            assert tailer.tailer.pending
+
+            lines = []
+            async for batch in tailer:
+                lines += batch.lines
+                if len(lines) == 100:
+                    output.unlink()
+            assert lines == [f"line {i}" for i in range(100)]
+
+    asyncio.run(run())
+
+
+def test_async_log_tailer_error(tmp_path):
+    batches = [
+        LogBatch("1.server", JobOutputFile.OUTPUT, [f"line {i}"]) for i in range(3)
+    ]
+
+    def poll(timeout):
+        if batches:
+            queued, batches[:] = list(batches), []
+            return queued
+        raise OSError("read failed")
+
+    async def run():
+        tailer = AsyncLogTailer(str(tmp_path), max_batches=4, use_inotify=False)
+        tailer.tailer.poll = poll
+        await tailer.follow("1.server", [JobOutputFile.OUTPUT])
+        await asyncio.sleep(0.05)
+        # The pump failed while its earlier batches were still queued
+        assert tailer._pump.done() and tailer._queue.qsize() == 3
+        lines = []
+        with pytest.raises(OSError, match="read failed"):
+            async for batch in tailer:
+                lines += batch.lines
+        assert lines == ["line 0", "line 1", "line 2"]
+        await tailer.close()
+
+        closed = AsyncLogTailer(str(tmp_path), use_inotify=False)
+        await closed.follow("2.server", [JobOutputFile.OUTPUT])
+        await closed.close()
+        assert [batch async for batch in closed] == []
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_job_logs_async(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    job = pbs.submit_command("/bin/true")
+    output = tmp_path / f"{job.data.id}.OU"
+    output.write_text("hello\n")
+
+    async def run():
+        lines = job.logs_async(spool_path=str(tmp_path), yield_waiting=True)
+        assert await anext(lines) == "hello\n"
+        assert await anext(lines) is None
+        with output.open("a") as f:
+            f.write("last")
+        output.unlink()
+        return [line async for line in lines if line is not None]
+
+    assert asyncio.run(run()) == ["last"]
@@ -0,0 +1,22 @@
+from python_pbs import PBS
+from python_pbs.pbs.models import NodeState
+from python_pbs.util import PBSSimulator
+
+
+def test_node_projection(simulator: PBSSimulator, pbs: PBS):
+    node = pbs.nodes.get("node1", fields=["state", "resources_available.ncpus"])
+    assert node.data.state == NodeState.FREE
+    assert node.data.resources_available == {"ncpus": 8}
+    assert node.data.pcpus is None
+
+    assert pbs.nodes.with_fields(["id"]).all[0].data.id == "node1"
+    assert pbs.queues.get("workq", fields=["enabled"]).data.enabled
+
+
+def test_node_iter_stat(simulator: PBSSimulator, pbs: PBS):
+    for i in range(4):
+        simulator.add_node(f"extra{i}")
+    before = simulator.calls["pbs_statnode"]
+    names = [n.data.id for n in pbs.nodes.iter_stat(chunk_size=2, fields=["state"])]
+    assert sorted(names) == ["extra0", "extra1", "extra2", "extra3", "node1"]
+    assert simulator.calls["pbs_statnode"] == before + 4
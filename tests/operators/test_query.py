@@ -0,0 +1,67 @@
+from pytest import raises
+from python_pbs import PBS, F, JobState
+from python_pbs.pbs.models import Job
+from python_pbs.util import BatchOperation, PBSSimulator
+
+
+def test_query_pushdown(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(4, owners=["alice", "bob"], ncpus=2, name="sim-a")
+    simulator.generate_jobs(4, owners=["alice"], ncpus=16, name="sim-b")
+    simulator.generate_jobs(2, owners=["alice"], ncpus=16, name="post", state="H")
+
+    query = pbs.jobs.where(
+        F.job_state.isin([JobState.QUEUED, JobState.HELD])
+        & (F["resource_list.ncpus"] >= 16)
+        & (F.job_owner != "carol")
+        & F.job_name.startswith("sim")
+    )
+    plan = query.plan
+    assert [(a.name, a.resource, a.value, a.operation) for a in plan.criteria] == [
+        ("job_state", None, "HQ", BatchOperation.EQ),
+        ("resource_list", "ncpus", "16", BatchOperation.GE),
+        ("job_owner", None, "carol", BatchOperation.NE),
+    ]
+    assert [str(p) for p in plan.residual] == ["job_name startswith 'sim'"]
+    memory = pbs.jobs.where(F["resource_list.mem"] >= 16 << 30).plan
+    assert [(a.resource, a.value) for a in memory.criteria] == [("mem", "16gb")]
+
+    jobs = query.all(fields=["job_state"], record_type="lazy")
+    assert simulator.calls["pbs_selectjob"] == 1
+    assert len(jobs) == 4
+    assert all(j.data.job_name == "sim-b" for j in jobs)
+    assert "client kept 4" in query.explain()
+    assert "server returned 6" in query.explain()
+
+
+def test_query_plans(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(3)
+    everything = pbs.jobs.where(F.job_name.contains("ST"))
+    assert len(everything.all()) == 3
+    assert simulator.calls["pbs_selectjob"] == 0
+    assert "every job" in everything.explain()
+
+    states = pbs.jobs.where((F.job_state == "Q") | (F.job_state == "R"))
+    assert states.plan.criteria[0].value == "QR" and not states.plan.residual
+
+    nothing = pbs.jobs.where((F.job_state == "Q") & ~F.job_state.isin(["Q"]))
+    assert nothing.plan.empty and nothing.all() == []
+    assert simulator.calls["pbs_selectjob"] == 0
+
+
+def test_resource_literals():
+    job = Job.from_pbs(
+        {
+            "id": "1.server",
+            "resources_used.mem": "8gb",
+            "resources_used.walltime": "00:30:00",
+            "job_name": "sim",
+        }
+    )
+    assert not (F["resources_used.mem"] > "10gb").evaluate(job)
+    assert (F["resources_used.mem"] == "8192mb").evaluate(job)
+    assert (F["resources_used.walltime"] <= "01:00:00").evaluate(job)
+    assert F["resources_used.mem"].isin(["8gb"]).evaluate(job)
+    with raises(TypeError):
+        (F["resources_used.mem"] > "lots").evaluate(job)
+    with raises(TypeError):
+        (F.job_name > 3).evaluate(job)
@@ -0,0 +1,45 @@
+from python_pbs import PBS, QuotaIndex
+from python_pbs.util import PBSSimulator
+
+
+def test_quota_index(simulator: PBSSimulator, pbs: PBS):
+    simulator.add_queue(
+        "batch",
+        resources_available__ncpus=16,
+        max_user_res__ncpus=6,
+        default_chunk__ncpus=2,
+    )
+    simulator.generate_jobs(2, queue="batch", owners=["alice"], ncpus=2)
+    simulator.generate_jobs(1, queue="batch", owners=["bob"], ncpus=3)
+    simulator.advance()
+
+    index = QuotaIndex(pbs.connection)
+    before = simulator.calls.copy()
+    expected = {"alice": 2, "bob": 2, "carol": 6}
+    for user, available in expected.items():
+        assert index.available(user, "batch") == available
+        assert pbs.queues["batch"].available(user) == available
+    assert index.available("alice", "workq") is None
+    assert index.used("alice", "batch") == 4
+
+    job = pbs.jobs.select()[0]
+    job.delete()
+    assert index.available("alice", "batch") == 2
+    index.update([job.data.id])
+    assert index.available("alice", "batch") == 4
+    assert simulator.calls["pbs_statque"] == before["pbs_statque"] + 4
+
+
+def test_quota_index_euser(simulator: PBSSimulator, pbs: PBS):
+    simulator.add_queue("batch", resources_available__ncpus=16, max_user_res__ncpus=6)
+    job = pbs.submit_command("/bin/true", queue="batch", alt_user="dave")
+    simulator.advance()
+    assert job.data.job_owner.split("@")[0] != "dave"
+
+    index = QuotaIndex(pbs.connection)
+    assert index.used("dave", "batch") == 0
+    assert index.available("dave", "batch") == 5
+    assert index.used("dave", "batch") == 1
+    assert index.used(simulator.user, "batch") == 0
+    for user in ("dave", simulator.user):
+        assert pbs.queues["batch"].available(user) == index.available(user, "batch")
@@ -0,0 +1,40 @@
+from python_pbs import PBS, CategoricalColumn, JobAttribute, NumericColumn
+from python_pbs.pbs.models import JobState
+from python_pbs.util import PBSSimulator
+
+
+def test_to_table(simulator: PBSSimulator, pbs: PBS):
+    simulator.generate_jobs(6, owners=["alice", "bob", "carol"], ncpus=2)
+    simulator.generate_jobs(2, owners=["alice"], ncpus=4, state="H")
+    table = pbs.jobs.to_table(
+        ["job_state", "job_owner", "qtime", "resource_list.ncpus", "resource_list"]
+    )
+    assert simulator.calls["pbs_statjob"] == 1
+    assert len(table) == 8
+    assert isinstance(table["job_state"], CategoricalColumn)
+    assert isinstance(table["qtime"], NumericColumn)
+    assert isinstance(table["resource_list.ncpus"], NumericColumn)
+    assert len(table["job_owner"].categories) == 3
+
+    queued = table.filter("job_state", "==", JobState.QUEUED)
+    assert len(queued) == len(table.filter("job_state", "==", "Q")) == 6
+    assert table.filter("job_state", "!=", "Q")["resource_list.ncpus"].sum() == 8
+
+    owner = lambda o: f"{o}@{simulator.host}"
+    by_owner = table.group_by("job_owner")
+    assert by_owner.count()[owner("alice")] == 4
+    assert by_owner.sum("resource_list.ncpus")[owner("alice")] == 12
+    assert by_owner.mean("resource_list.ncpus")[owner("bob")] == 2
+    assert table["resource_list.ncpus"].percentile(50) == 2
+    assert table["resource_list.ncpus"].percentile(100) == 4
+
+    pairs = table.group_by("job_state", "job_owner").count()
+    assert pairs[(JobState.HELD, owner("alice"))] == 2
+    assert table.rows()[0]["id"] == table.ids[0]
+
+    selected = pbs.jobs.to_table(
+        ["resource_list.ncpus"],
+        criteria=[JobAttribute(name="euser", value="bob")],
+        chunk_size=1,
+    )
+    assert len(selected) == 2 and list(selected.columns) == ["resource_list.ncpus"]
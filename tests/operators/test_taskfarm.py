@@ -0,0 +1,60 @@
+import os
+import subprocess
+
+from python_pbs import PBS, JobState
+from python_pbs.util import PBSSimulator
+
+
+def test_task_farm(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    commands = [f"echo {i}" for i in range(5)]
+    farm = pbs.submit_task_farm(commands, str(tmp_path), tasks_per_subjob=1)
+    assert simulator.calls["pbs_submit"] == 1
+    assert farm.subjobs == 5
+    assert farm.command(3) == "echo 3"
+    assert all(t.state == JobState.QUEUED for t in farm.status())
+
+    simulator.advance()
+    seq = farm.id.split("[", 1)[0]
+    simulator.finish(f"{seq}[2]", 3)
+    before = simulator.calls["pbs_statjob"]
+    tasks = farm.status()
+    assert simulator.calls["pbs_statjob"] == before + 1
+    assert [t.index for t in tasks] == list(range(5))
+    assert tasks[2].finished and tasks[2].exit_status == 3
+    assert tasks[0].state == JobState.RUNNING
+    assert farm.exit_codes()[2] == 3 and farm.exit_codes()[0] is None
+
+
+def test_task_farm_packing(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    simulator.server.attributes["max_array_size"] = "2"
+    farm = pbs.submit_task_farm(
+        ["true", "exit 4", "true", "true", "true"], str(tmp_path)
+    )
+    assert farm.tasks_per_subjob == 3 and farm.subjobs == 2
+
+    # Run the first subjob's slice with the generated runner
+    env = dict(os.environ, PBS_ARRAY_INDEX="0")
+    runner = subprocess.run([str(tmp_path / "run.sh")], env=env)
+    assert runner.returncode == 4
+    assert (tmp_path / "status.0").read_text() == "0 0\n1 4\n2 0\n"
+
+    simulator.advance()
+    seq = farm.id.split("[", 1)[0]
+    simulator.finish(f"{seq}[0]", 4)
+    codes = farm.exit_codes()
+    assert codes == {0: 0, 1: 4, 2: 0, 3: None, 4: None}
+
+
+def test_task_farm_unrecorded_tasks(simulator: PBSSimulator, pbs: PBS, tmp_path):
+    simulator.server.attributes["max_array_size"] = "1"
+    farm = pbs.submit_task_farm(["cat > /dev/null", "exit 2", "true"], str(tmp_path))
+    env = dict(os.environ, PBS_ARRAY_INDEX="0")
+    subprocess.run([str(tmp_path / "run.sh")], env=env, stdin=subprocess.DEVNULL)
+    assert (tmp_path / "status.0").read_text() == "0 0\n1 2\n2 0\n"
+
+    (tmp_path / "status.0").write_text("0 0\n")
+    simulator.advance()
+    simulator.finish(f"{farm.id.split('[', 1)[0]}[0]", 0)
+    tasks = farm.status()
+    assert [t.exit_status for t in tasks] == [0, None, None]
+    assert [t.successful for t in tasks] == [True, False, False]
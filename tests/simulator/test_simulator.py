@@ -0,0 +1,88 @@
+from python_pbs.util.typed_wrapper import *
+from python_pbs.util import PBSSimulator
+
+
+def test_connect(simulator: PBSSimulator):
+    con = connect(simulator.server_name)
+    assert con >= 0
+    assert connect("badserver") < 0
+    assert disconnect(con) == 0
+
+
+def test_submit_lifecycle(simulator: PBSSimulator, sim_con: int):
+    job_id = submit_job(
+        sim_con, [Attribute(name="Resource_List", resource="ncpus", value="2")], None
+    )
+    assert job_id == f"0.{simulator.server_name}"
+    assert stat_job(sim_con, id=job_id)[0]["job_state"] == "Q"
+
+    simulator.advance()
+    status = stat_job(sim_con, id=job_id)[0]
+    assert status["job_state"] == "R"
+    assert status["Resource_List.ncpus"] == "2"
+
+    simulator.advance(simulator.default_runtime)
+    assert stat_job(sim_con, id=job_id) == []
+    finished = stat_job(sim_con, id=job_id, historical=True)[0]
+    assert finished["job_state"] == "F"
+    assert finished["Exit_status"] == "0"
+
+
+def test_hold_release_delete(simulator: PBSSimulator, sim_con: int):
+    job_id = submit_job(sim_con, [], None)
+    assert hold_job(sim_con, job_id) == 0
+    simulator.advance()
+    assert stat_job(sim_con, id=job_id)[0]["job_state"] == "H"
+    assert release_job(sim_con, job_id) == 0
+    assert stat_job(sim_con, id=job_id)[0]["job_state"] == "Q"
+    assert delete_job(sim_con, job_id) == 0
+    assert delete_job(sim_con, job_id) != 0
+
+
+def test_select_and_projection(simulator: PBSSimulator, sim_con: int):
+    simulator.generate_jobs(10, owners=["alice", "bob"])
+    ids = select_jobs(sim_con, [Attribute(name="euser", value="alice")])
+    assert len(ids) == 5
+
+    result = stat_job(sim_con, id=ids[0], attributes=[Attribute(name="job_state")])
+    assert result == [{"id": ids[0], "job_state": "Q"}]
+
+
+def test_queue_and_node_state(simulator: PBSSimulator, sim_con: int):
+    simulator.generate_jobs(3, ncpus=4)
+    simulator.advance()
+    queue = stat_queue(sim_con, id="workq")[0]
+    assert queue["state_count"].startswith(
+        "Transit:0 Queued:1 Held:0 Waiting:0 Running:2"
+    )
+    node = stat_node(sim_con, id="node1")[0]
+    assert node["state"] == "job-busy"
+    assert node["resources_assigned.ncpus"] == "8"
+
+
+def test_restart_invalidates_connections(simulator: PBSSimulator, sim_con: int):
+    simulator.restart()
+    assert stat_server(sim_con) == []
+    assert stat_server(connect(simulator.server_name))[0]["id"] == simulator.server_name
+
+
+def test_attribute_lists(simulator: PBSSimulator, sim_con: int):
+    attributes = [Attribute(name="job_state"), Attribute(name="queue", value="workq")]
+    assert Attribute.make_attrl(attributes, with_op=True) == [
+        ("job_state", None, None, EQ),
+        ("queue", None, "workq", EQ),
+    ]
+    chain = Attribute.link_attrl(attributes)
+    assert [a.name for a in Attribute.from_attrl(chain)] == ["job_state", "queue"]
+
+    projection = AttributeList(attributes[:1])
+    built = Attribute.make_attrl(projection)
+    assert Attribute.make_attrl(projection) is built
+    assert Attribute.make_attrl(AttributeList()) is None
+
+    job_id = submit_job(sim_con, [], None)
+    assert stat_job(sim_con, id=job_id, attributes=projection)[0] == {
+        "id": job_id,
+        "job_state": "Q",
+    }
+    assert simulator.pbs_statjob(sim_con, job_id, chain, None)[0]["queue"] == "workq"
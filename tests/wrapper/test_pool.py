@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+from python_pbs import PBS
+from python_pbs.util import (
+    ConnectionPool,
+    PBSSimulator,
+    get_errno,
+    stat_job,
+    stat_server,
+)
+
+
+def test_pool_lease(simulator: PBSSimulator):
+    pool = ConnectionPool(max_size=2, timeout=0.05)
+    with pool.lease() as first, pool.lease() as second:
+        assert first != second
+        assert pool.metrics.in_use == 2
+        with raises(TimeoutError):
+            pool.acquire()
+    assert pool.metrics.idle == 2
+    assert stat_server(pool)[0]["id"] == simulator.server_name
+
+    pool.close()
+    assert pool.metrics.size == 0
+    assert len(simulator._connections) == 0
+
+
+def test_pool_reconnect(simulator: PBSSimulator):
+    pool = ConnectionPool(max_size=1, validate_after=0)
+    simulator.restart()
+    assert stat_server(pool)
+    assert pool.metrics.reconnects == 1
+
+    pool.validate_after = 60
+    simulator.restart()
+    assert stat_server(pool) == []
+    # The broken handle is only counted once a replacement opens
+    assert pool.metrics.reconnects == 1 and pool.metrics.size == 0
+    assert stat_server(pool)
+    assert pool.metrics.reconnects == 2
+
+
+def test_pool_probe_error(simulator: PBSSimulator):
+    pool = ConnectionPool(max_size=1, validate_after=0, timeout=0.05)
+
+    def probe(handle: int) -> bool:
+        raise OSError("probe failed")
+
+    pool._valid = probe
+    with raises(OSError):
+        pool.acquire()
+    assert pool.metrics.size == 0 and pool.metrics.reconnects == 0
+    assert len(simulator._connections) == 0
+    del pool._valid
+    assert stat_server(pool)
+    pool.close()
+
+
+def test_pool_threads(simulator: PBSSimulator):
+    simulator.generate_jobs(10)
+    simulator.latency = 0.01
+    with PBS(pool_size=3) as pbs:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda _: len(pbs.jobs.all), range(16)))
+        assert results == [10] * 16
+        metrics = pbs.connection.metrics
+        assert metrics.size <= 3 and metrics.waits > 0
+    with raises(RuntimeError):
+        stat_job(pbs.connection)
+
+
+def test_errno_per_thread(simulator: PBSSimulator, sim_con: int):
+    assert stat_job(sim_con, id="404.nowhere") == []
+    assert get_errno() == 15001
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(get_errno).result() == 0
+    stat_server(sim_con)
+    assert get_errno() == 0